@@ -0,0 +1,91 @@
+import random
+import threading
+import time
+from flask import current_app
+
+
+def free_mask(booked: int, total_tables: int) -> int:
+    """Bitmap of free tables: bit n-1 is set when table n is free."""
+    return ((1 << total_tables) - 1) & ~booked
+
+
+class TableAllocator:
+    """
+    Picks a free table from a booked-table bitmap (bit n-1 set when table n
+    is booked). Returns None when every table is taken.
+    """
+
+    def pick(self, booked: int, total_tables: int) -> int | None:
+        raise NotImplementedError
+
+    def record(self, table_number: int):
+        """Called once a booking on `table_number` has been committed."""
+
+
+class LowestFreeAllocator(TableAllocator):
+    def pick(self, booked: int, total_tables: int) -> int | None:
+        free = free_mask(booked, total_tables)
+        if not free:
+            return None
+        return (free & -free).bit_length()
+
+
+class RandomAllocator(TableAllocator):
+    """Uniform pick among free tables; spreads concurrent bookings to avoid RACE_LOST."""
+
+    def __init__(self, rng: random.Random | None = None):
+        self._rng = rng or random.Random()
+
+    def pick(self, booked: int, total_tables: int) -> int | None:
+        free = free_mask(booked, total_tables)
+        if not free:
+            return None
+        for _ in range(self._rng.randrange(free.bit_count())):
+            free &= free - 1
+        return (free & -free).bit_length()
+
+
+class LeastRecentlyUsedAllocator(TableAllocator):
+    """Prefers the free table this process handed out longest ago."""
+
+    def __init__(self):
+        self._last_used: dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def pick(self, booked: int, total_tables: int) -> int | None:
+        free = free_mask(booked, total_tables)
+        best, best_used = None, 0.0
+        while free:
+            low = free & -free
+            table_number = low.bit_length()
+            used = self._last_used.get(table_number, 0.0)
+            if best is None or used < best_used:
+                best, best_used = table_number, used
+            free ^= low
+        return best
+
+    def record(self, table_number: int):
+        with self._lock:
+            self._last_used[table_number] = time.monotonic()
+
+
+ALLOCATORS = {
+    "random": RandomAllocator,
+    "lowest": LowestFreeAllocator,
+    "lru": LeastRecentlyUsedAllocator,
+}
+
+
+def make_allocator(strategy: str) -> TableAllocator:
+    try:
+        return ALLOCATORS[strategy]()
+    except KeyError:
+        raise ValueError(f"Unknown table allocation strategy {strategy!r}; expected one of {sorted(ALLOCATORS)}.")
+
+
+def init_app(app):
+    app.extensions["table_allocator"] = make_allocator(app.config["TABLE_ALLOCATION_STRATEGY"])
+
+
+def current_allocator() -> TableAllocator:
+    return current_app.extensions["table_allocator"]
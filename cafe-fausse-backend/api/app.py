@@ -1,23 +1,38 @@
-import random
-from datetime import datetime, timedelta
-import click
 from flask import Flask, jsonify
-from flask.cli import with_appcontext
 from flask_cors import CORS
-from .extensions import db, migrate
+from .extensions import db
 from .config import Config
+from .occupancy import occupancy
+from .ledger import ledger
+from .replicas import replicas
+from .auth import admin_auth
+from . import allocation, cli, serialization
+from .utils import calendar
+from .ratelimit import limiter
+from .metrics import metrics
+from .events import events
 from .blueprints.reservations import bp as reservations_bp
 from .blueprints.newsletter import bp as newsletter_bp
-from .models import Customer, Reservation 
 
-def create_app():
+def create_app(config: dict | None = None):
     app = Flask(__name__)
     app.config.from_object(Config)
+    if config:
+        app.config.update(config)
 
+    serialization.init_app(app)
     CORS(app)
 
     db.init_app(app)
-    migrate.init_app(app, db)
+    replicas.init_app(app)
+    admin_auth.init_app(app)
+    calendar.init_app(app)
+    ledger.init_app(app)
+    occupancy.init_app(app)
+    allocation.init_app(app)
+    limiter.init_app(app)
+    metrics.init_app(app)
+    events.init_app(app)
 
     with app.app_context():
         from . import models 
@@ -29,53 +44,6 @@ def create_app():
     def health():
         return jsonify(status="ok")
 
-    @click.command("seed")
-    @with_appcontext
-    def seed_command():
-        """Creates sample data for the database."""
-        db.session.query(Reservation).delete()
-        db.session.query(Customer).delete()
-        db.session.commit()
-        print("Cleared existing data.")
+    cli.init_app(app)
 
-        customers = []
-        for i in range(10):
-            customer = Customer(
-                name=f"Customer {i+1}",
-                email=f"customer{i+1}@example.com",
-                phone=f"123-555-000{i}",
-                newsletter_opt_in=random.choice([True, False])
-            )
-            customers.append(customer)
-        db.session.add_all(customers)
-        db.session.commit()
-        print(f"Created {len(customers)} customers.")
-        
-        reservations = []
-        total_tables = app.config["TOTAL_TABLES"]
-        today = datetime.utcnow().date()
-        for _ in range(35): 
-            customer = random.choice(customers)
-            day_offset = random.randint(0, 2)
-            res_date = today + timedelta(days=day_offset)
-            hour = random.randint(17, 22)
-            minute = random.choice([0, 30])
-            time_slot = datetime(res_date.year, res_date.month, res_date.day, hour, minute)
-            
-            if not any(r for r in reservations if r.time_slot == time_slot and r.table_number == table_num):
-                 table_num = random.randint(1, total_tables)
-                 reservation = Reservation(
-                    customer_id=customer.id,
-                    time_slot=time_slot,
-                    table_number=table_num
-                )
-                 reservations.append(reservation)
-
-        db.session.add_all(reservations)
-        db.session.commit()
-        print(f"Created {len(reservations)} reservations.")
-        print("Database seeded!")
-
-    app.cli.add_command(seed_command)
-
-    return app
\ No newline at end of file
+    return app
@@ -0,0 +1,224 @@
+import io
+import sys
+from datetime import datetime, timedelta, timezone
+from flask import g, has_app_context
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from werkzeug.exceptions import HTTPException
+from .extensions import db
+from .events import events
+from .metrics import metrics
+from .replicas import REPLICA_BIND_PREFIX
+
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError:  # optional; only needed for the ASGI entry point
+    WsgiToAsgi = None
+
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+# Streamed responses and uploads would hold the event loop for their whole
+# duration, so they run on a thread against the regular engine instead.
+THREADED_ENDPOINTS = {
+    "reservations.availability_stream",
+    "reservations.export_reservations",
+    "newsletter.bulk_subscribe",
+}
+
+_PG_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def async_database_url(url: str) -> str:
+    """DATABASE_URL with its driver swapped for the asyncio one (asyncpg, aiosqlite)."""
+    u = make_url(url)
+    backend = u.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver known for {backend!r}; set ASYNC_DATABASE_URL.")
+    return u.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def _utc_timestamps(dbapi_connection, connection_record):
+    # asyncpg reads naive datetimes in the process' local zone; ours are UTC (db_utc_naive).
+    def encode(dt: datetime):
+        dt = dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+        return ((dt - _PG_EPOCH) // _MICROSECOND,)
+
+    def decode(value):
+        return _PG_EPOCH + timedelta(microseconds=value[0])
+
+    dbapi_connection.run_async(
+        lambda conn: conn.set_type_codec(
+            "timestamptz", schema="pg_catalog", encoder=encode, decoder=decode, format="tuple"
+        )
+    )
+
+
+class _BridgeSession(Session):
+    """
+    Sync ORM session over the async engines' connections; views see it as
+    db.session. Like RoutingSession, it runs the SELECTs of read-only views on
+    the replica they picked (g.db_replica).
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_app_context():
+            key = g.get("db_replica")
+            replica = self.info["replica_engines"].get(key) if key else None
+            if replica is not None and getattr(clause, "is_select", False):
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+class AsyncAPI:
+    """
+    ASGI front for the Flask app. Each request runs the same views on the
+    event loop, with db.session bridged onto an async engine (asyncpg) through
+    AsyncSession.run_sync, so a worker serves other requests while its queries
+    are in flight. Endpoints in THREADED_ENDPOINTS and non-HTTP traffic go
+    through asgiref's WSGI adapter on a thread pool.
+    """
+
+    def __init__(self, app):
+        if WsgiToAsgi is None:
+            raise RuntimeError("The ASGI entry point needs the asgiref package.")
+        self.flask_app = app
+        url = app.config["ASYNC_DATABASE_URL"] or async_database_url(app.config["SQLALCHEMY_DATABASE_URI"])
+        # One pool per worker process, shared by every request on its loop.
+        self.engine = self._create_engine(url, app.config["SQLALCHEMY_ENGINE_OPTIONS"])
+        self.replica_engines = {}
+        for key, bind in (app.config.get("SQLALCHEMY_BINDS") or {}).items():
+            if key and key.startswith(REPLICA_BIND_PREFIX):
+                options = dict(bind) if isinstance(bind, dict) else {"url": bind}
+                self.replica_engines[key] = self._create_engine(async_database_url(options.pop("url")), options)
+        events.listen(_BridgeSession)
+        self.sessions = async_sessionmaker(
+            self.engine,
+            sync_session_class=_BridgeSession,
+            info={"replica_engines": {k: e.sync_engine for k, e in self.replica_engines.items()}},
+        )
+        self.threaded = WsgiToAsgi(app)
+        self._urls = app.url_map.bind("localhost")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+        if scope["type"] != "http" or self._endpoint(scope) in THREADED_ENDPOINTS:
+            return await self.threaded(scope, receive, send)
+
+        environ = _environ(scope, await _read_body(receive))
+        async with self.sessions() as session:
+            status, headers, body = await session.run_sync(self._dispatch, environ)
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    def after_fork(self):
+        """Drops pooled connections inherited from a pre-fork master process."""
+        for engine in (self.engine, *self.replica_engines.values()):
+            engine.sync_engine.dispose(close=False)
+
+    def _create_engine(self, url: str, options: dict):
+        engine = create_async_engine(url, **options)
+        if engine.dialect.name == "postgresql":
+            event.listen(engine.sync_engine, "connect", _utc_timestamps)
+        if "metrics" in self.flask_app.extensions:
+            metrics.instrument(engine.sync_engine)
+        return engine
+
+    def _endpoint(self, scope) -> str | None:
+        try:
+            endpoint, _ = self._urls.match(scope["path"], scope["method"])
+        except HTTPException:
+            return None
+        return endpoint
+
+    def _dispatch(self, session, environ):
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started["status"] = int(status.split(" ", 1)[0])
+            started["headers"] = [(k.lower().encode("latin1"), v.encode("latin1")) for k, v in headers]
+
+        with self.flask_app.app_context():
+            # The request context reuses this app context, so the view's
+            # db.session is `session`; teardown closes it inside run_sync.
+            db.session.registry.set(session)
+            result = self.flask_app.wsgi_app(environ, start_response)
+            try:
+                body = b"".join(result)
+            finally:
+                if hasattr(result, "close"):
+                    result.close()
+        return started["status"], started["headers"], body
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.engine.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+async def _read_body(receive) -> io.BytesIO:
+    body = io.BytesIO()
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        body.write(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    body.seek(0)
+    return body
+
+
+def _environ(scope, body: io.BytesIO) -> dict:
+    script_name = scope.get("root_path", "").encode("utf8").decode("latin1")
+    path_info = scope["path"].encode("utf8").decode("latin1")
+    if path_info.startswith(script_name):
+        path_info = path_info[len(script_name):]
+    server = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": script_name,
+        "PATH_INFO": path_info,
+        "QUERY_STRING": scope["query_string"].decode("latin1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope['http_version']}",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": body,
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    if scope.get("client"):
+        environ["REMOTE_ADDR"] = scope["client"][0]
+    for name, value in scope.get("headers", []):
+        name = name.decode("latin1")
+        if name == "content-length":
+            key = "CONTENT_LENGTH"
+        elif name == "content-type":
+            key = "CONTENT_TYPE"
+        else:
+            key = "HTTP_" + name.upper().replace("-", "_")
+        value = value.decode("latin1")
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    # The body is already buffered, whether or not it came chunked.
+    environ["CONTENT_LENGTH"] = str(body.getbuffer().nbytes)
+    return environ
+
+
+def create_asgi_app(app=None) -> AsyncAPI:
+    """Wraps `app` (by default a new create_app()) for an ASGI server such as uvicorn."""
+    if app is None:
+        from .app import create_app
+        app = create_app()
+    return AsyncAPI(app)
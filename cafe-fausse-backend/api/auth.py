@@ -1,38 +1,202 @@
+import hashlib
+import hmac
 import os
-from flask import request
+import signal
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 from dotenv import dotenv_values
+from flask import current_app, request
 
-def _get_admin_token() -> str:
+# "admin" grants everything; "read" is the admin list, "export" the export.
+SCOPES = ("admin", "read", "export")
+DEFAULT_TOKEN = "dev-admin-token"
+ENV_PATH = Path(__file__).resolve().parents[1] / ".env"
 
-    token = os.getenv("ADMIN_TOKEN")
-    if token and token.strip():
-        return token.strip()
 
-    try:
-        root = Path(__file__).resolve().parents[1]
-        env_path = root / ".env"
-        if env_path.exists():
-            env_vars = dotenv_values(str(env_path))
-            token = env_vars.get("ADMIN_TOKEN")
-            if token and token.strip():
-                return token.strip()
-    except Exception:
-        pass
+def parse_tokens(raw: str) -> dict[str, frozenset[str]]:
+    """'tok1:read,tok2:read+export' -> {token: scopes}."""
+    tokens = {}
+    for part in raw.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        token, _, names = part.rpartition(":")
+        scopes = frozenset(s.strip() for s in names.split("+") if s.strip())
+        if not token or not scopes or not scopes <= set(SCOPES):
+            # The message must not echo the token.
+            raise ValueError(f"Bad ADMIN_TOKENS entry; expected <token>:<scope>[+<scope>] with scopes {', '.join(SCOPES)}.")
+        tokens[token] = scopes
+    return tokens
 
-    return "dev-admin-token"
 
-def check_admin() -> bool:
+class AdminAuth:
     """
-    Checks the Authorization header for a valid admin bearer token.
+    Admin bearer tokens, resolved at create_app time instead of per request.
+    ADMIN_TOKEN grants every scope and ADMIN_TOKENS adds scoped tokens; each
+    comes from the environment, else from .env. DEFAULT_TOKEN is accepted
+    only when neither is set. The file is re-read when its
+    mtime changes (looked at every AUTH_RELOAD_CHECK_SECONDS at most) or after
+    a SIGHUP. Recently verified tokens are kept in an LRU of AUTH_CACHE_SIZE.
     """
-    expected_token = _get_admin_token()
-    if not expected_token:
-        return False 
 
+    def __init__(self, env_path: Path = ENV_PATH):
+        self.env_path = Path(env_path)
+        self.check_interval = 5.0
+        self.cache_size = 256
+        self._tokens: list[tuple[bytes, frozenset[str]]] = []
+        self._verified: OrderedDict[str, frozenset[str]] = OrderedDict()
+        self._mtime: int | None = None
+        self._loaded = False
+        self._checked_at = 0.0
+        self._reload_requested = False
+        self._sighup_installed = False
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.check_interval = app.config["AUTH_RELOAD_CHECK_SECONDS"]
+        self.cache_size = app.config["AUTH_CACHE_SIZE"]
+        self.reload()
+        self._install_sighup()
+        app.extensions["admin_auth"] = self
+
+    def reload(self):
+        """Re-resolves the tokens and drops the verified-token cache."""
+        mtime = self._env_mtime()
+        try:
+            file_values = dotenv_values(str(self.env_path)) if mtime is not None else {}
+        except Exception:
+            file_values = {}
+
+        def lookup(key: str) -> str | None:
+            for value in (os.getenv(key), file_values.get(key)):
+                if value and value.strip():
+                    return value.strip()
+            return None
+
+        tokens = parse_tokens(lookup("ADMIN_TOKENS") or "")
+        admin_token = lookup("ADMIN_TOKEN")
+        if admin_token:
+            tokens[admin_token] = frozenset(SCOPES)
+        elif not tokens:
+            # The public dev token only stands in when nothing is configured.
+            tokens[DEFAULT_TOKEN] = frozenset(SCOPES)
+        with self._lock:
+            self._tokens = [(token.encode(), scopes) for token, scopes in tokens.items()]
+            self._verified.clear()
+            self._mtime = mtime
+            self._loaded = True
+
+    def scopes(self, token: str) -> frozenset[str]:
+        """Scopes `token` grants; empty when it matches no configured token."""
+        self._maybe_reload()
+        with self._lock:
+            granted = self._verified.get(token)
+            if granted is not None:
+                self._verified.move_to_end(token)
+                return granted
+            tokens = self._tokens
+
+        provided = token.encode()
+        granted = frozenset()
+        for expected, scopes in tokens:
+            # Every token is compared, so timing does not tell which one matched.
+            if hmac.compare_digest(provided, expected):
+                granted = scopes
+        if granted:
+            with self._lock:
+                self._verified[token] = granted
+                if len(self._verified) > self.cache_size:
+                    self._verified.popitem(last=False)
+        return granted
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if self._loaded and not self._reload_requested and now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        if self._loaded and not self._reload_requested and self._env_mtime() == self._mtime:
+            return
+        self._reload_requested = False
+        try:
+            self.reload()
+        except ValueError:
+            current_app.logger.exception("Could not reload admin tokens; keeping the previous ones.")
+
+    def _env_mtime(self) -> int | None:
+        try:
+            return self.env_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _install_sighup(self):
+        # Only the main thread may set handlers; gunicorn workers reset SIGHUP
+        # and rely on the mtime check instead.
+        if self._sighup_installed or not hasattr(signal, "SIGHUP"):
+            return
+        if threading.current_thread() is not threading.main_thread():
+            return
+        previous = signal.getsignal(signal.SIGHUP)
+
+        def handler(signum, frame):
+            # Reloading here could deadlock on the lock; the next check does it.
+            self._reload_requested = True
+            if callable(previous):
+                previous(signum, frame)
+
+        signal.signal(signal.SIGHUP, handler)
+        self._sighup_installed = True
+
+
+admin_auth = AdminAuth()
+
+
+def check_admin(scope: str = "admin") -> bool:
+    """
+    Checks the Authorization header for an admin bearer token granting
+    `scope`; tokens with the admin scope grant every scope.
+    """
     auth_header = request.headers.get("Authorization", "").strip()
     if not auth_header.lower().startswith("bearer "):
         return False
 
-    provided_token = auth_header[7:].strip()
-    return provided_token == expected_token
\ No newline at end of file
+    granted = admin_auth.scopes(auth_header[7:].strip())
+    return scope in granted or "admin" in granted
+
+
+# Shipped defaults (config.py, .env.example); tokens signed with them could be forged.
+INSECURE_SECRET_KEYS = frozenset({"", "dev-secret", "dev-secret-change-me"})
+LOOKUP_TOKEN_HEADER = "X-Lookup-Token"
+
+
+def _lookup_key() -> bytes | None:
+    secret = current_app.config.get("SECRET_KEY") or ""
+    if secret in INSECURE_SECRET_KEYS:
+        return None
+    return secret.encode()
+
+
+def _lookup_signature(key: bytes, email: str, expires: int) -> str:
+    return hmac.new(key, f"lookup:{email.lower()}:{expires}".encode(), hashlib.sha256).hexdigest()
+
+
+def lookup_token(email: str, now: float | None = None) -> str | None:
+    """
+    Token that lets a customer list their own bookings until it expires
+    (LOOKUP_TOKEN_TTL_SECONDS); None while SECRET_KEY is a shipped default.
+    """
+    key = _lookup_key()
+    if key is None:
+        return None
+    expires = int(time.time() if now is None else now) + current_app.config["LOOKUP_TOKEN_TTL_SECONDS"]
+    return f"{expires}.{_lookup_signature(key, email, expires)}"
+
+
+def check_lookup_token(email: str, now: float | None = None) -> bool:
+    """Checks the X-Lookup-Token header against `email`."""
+    key = _lookup_key()
+    expires, _, signature = request.headers.get(LOOKUP_TOKEN_HEADER, "").strip().partition(".")
+    if key is None or not expires.isdigit() or int(expires) < (time.time() if now is None else now):
+        return False
+    return hmac.compare_digest(signature.encode(), _lookup_signature(key, email, int(expires)).encode())
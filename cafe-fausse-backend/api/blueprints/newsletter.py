@@ -1,17 +1,17 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from pydantic import ValidationError
-from ..extensions import db
-from ..models import Customer
 from ..http import jerror
+from ..auth import check_admin
+from ..extensions import db
+from ..ratelimit import limiter
 from ..schemas import SubscribeRequest  
-import sqlalchemy as sa
-from sqlalchemy.dialects.postgresql import insert as pg_insert
-from pydantic import ValidationError
+from ..subscriptions import IMPORT_FORMATS, upsert_subscribers, read_records, import_subscribers
 
 
 bp = Blueprint("newsletter", __name__)
 
 @bp.post("")
+@limiter.limit("subscribe")
 def subscribe():
     payload = request.get_json(silent=True)
     if not payload:
@@ -22,27 +22,37 @@ def subscribe():
     except ValidationError as e:
         return jerror(422, "VALIDATION_ERROR", "Invalid input.", details=e.errors())
 
-    t = Customer.__table__
+    email = data.email.lower()
+    customer_id = upsert_subscribers([{"name": data.name, "email": email, "phone": data.phone}])[email]
+    db.session.commit()
 
-    ins = pg_insert(t).values(
-        name=data.name,
-        email=data.email.lower(), 
-        phone=data.phone or "",
-        newsletter_opt_in=True,
-    )
+    return jsonify(message="Email added to newsletter", customerId=customer_id), 200
 
-    update_set = {
-        t.c.newsletter_opt_in: sa.true(),
-        t.c.name: sa.func.coalesce(sa.func.nullif(ins.excluded.name, ""), t.c.name),
-        t.c.phone: sa.func.coalesce(sa.func.nullif(ins.excluded.phone, ""), t.c.phone),
-    }
 
-    stmt = ins.on_conflict_do_update(
-        index_elements=[t.c.email],
-        set_=update_set,
-    ).returning(t.c.id)
+_IMPORT_MIMETYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
 
-    customer_id = db.session.execute(stmt).scalar_one()
-    db.session.commit()
 
-    return jsonify(message="Email added to newsletter", customerId=customer_id), 200
\ No newline at end of file
+@bp.post("/bulk")
+def bulk_subscribe():
+    """
+    Admin import of signup lists. Body: CSV with a name,email,phone header
+    (Content-Type: text/csv) or NDJSON (application/x-ndjson); ?format=
+    overrides. The body is read and upserted in chunks as it streams in.
+    """
+    if not check_admin():
+        return jerror(401, "UNAUTHORIZED", "Missing or invalid bearer token.")
+
+    fmt = request.args.get("format") or _IMPORT_MIMETYPES.get(request.mimetype)
+    if fmt not in IMPORT_FORMATS:
+        return jerror(415, "UNSUPPORTED_FORMAT", "Send text/csv or application/x-ndjson, or pass ?format=csv|ndjson.")
+
+    report = import_subscribers(
+        read_records(request.stream, fmt),
+        current_app.config["NEWSLETTER_IMPORT_CHUNK_SIZE"],
+        current_app.config["NEWSLETTER_IMPORT_MAX_ERRORS"],
+    )
+    return jsonify(report.as_dict())
@@ -1,38 +1,35 @@
-from flask import Blueprint, request, jsonify, current_app
-from sqlalchemy import select, func, text
+import csv
+import io
+import queue
+import time
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timedelta, timezone
 from ..extensions import db
-from ..models import Reservation, Customer
+from ..models import Reservation, Customer, BookingTicket, SlotCapacity
 from ..http import jerror
-from ..auth import check_admin
-from ..utils.time import parse_iso, round_to_slot, db_utc_naive, api_iso_z 
-from ..schemas import CreateReservationRequest 
+from ..auth import check_admin, check_lookup_token, lookup_token
+from ..occupancy import occupancy
+from ..ledger import ledger
+from ..ratelimit import limiter
+from ..replicas import replicas
+from ..events import events
+from ..allocation import current_allocator, free_mask
+from ..booking import BOOKING_ERRORS, upsert_customers, book_tables, record_bookings
+from ..booking_queue import enqueue, ticket_body
+from ..utils.cursor import encode_cursor, decode_cursor
+from ..utils.time import parse_iso, to_utc, db_utc_naive, api_iso_z, utc_iso_z
+from ..queries import admin_day_count, admin_page, customer_by_email, customer_page, range_counts
+from ..schemas import SKIP_CALENDAR, CreateReservationRequest, ReservationRow, time_error
+from ..utils.calendar import current_calendar
 from pydantic import ValidationError
 
 bp = Blueprint("reservations", __name__)
 
-_rate_state: dict[str, tuple[int, int]] = {}
-_RATE_WINDOW = 60
-_RATE_MAX = 12
-
-def _allow(ip: str) -> bool:
-    now = int(datetime.now(tz=timezone.utc).timestamp())
-    window = now // _RATE_WINDOW
-    count, win = _rate_state.get(ip, (0, window))
-    if win != window:
-        count, win = 0, window
-    count += 1
-    _rate_state[ip] = (count, win)
-    return count <= _RATE_MAX
-
-
-def _client_ip() -> str:
-    fwd = request.headers.get("X-Forwarded-For")
-    return (fwd.split(",")[0].strip() if fwd else request.remote_addr or "0.0.0.0")
-
-
 @bp.get("/availability")
+@limiter.limit("availability")
+@replicas.read_only
 def availability():
     t = request.args.get("time") or request.args.get("time_slot")
     if not t:
@@ -42,29 +39,145 @@ def availability():
     except Exception as e:
         return jerror(422, "BAD_TIME", "Invalid time format, expected ISO 8601.", str(e))
     
-    slot_minutes = current_app.config["SLOT_MINUTES"]
-    ts_rounded = round_to_slot(ts, slot_minutes)
+    ts_rounded = current_calendar().round(ts)
     ts_db = db_utc_naive(ts_rounded)
+    max_age = current_app.config["AVAILABILITY_CACHE_MAX_AGE"]
+
+    # Answer conditional polls from the in-memory version alone.
+    version = occupancy.version(ts_db)
+    if version is not None and occupancy.etag(ts_db, version) in request.if_none_match:
+        response = current_app.response_class(status=304)
+        response.set_etag(occupancy.etag(ts_db, version))
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+        return response
+
+    bits, version = occupancy.snapshot(ts_db)
+    booked = bits.bit_count()
 
-    booked = db.session.execute(
-        select(func.count()).select_from(Reservation).where(Reservation.time_slot == ts_db)
-    ).scalar_one()
-    
     total_tables = current_app.config["TOTAL_TABLES"]
     
-    return jsonify(
+    response = jsonify(
         totalTables=total_tables,
         booked=int(booked),
         available=total_tables - int(booked),
         slot=api_iso_z(ts_rounded),
     )
+    if version is not None:
+        response.set_etag(occupancy.etag(ts_db, version))
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+    return response
+
+@bp.get("/availability/range")
+@limiter.limit("availability")
+@replicas.read_only
+def availability_range():
+    """
+    Booked/available counts for every bookable slot in a window.
+    Query: ?from=<ISO_8601>&to=<ISO_8601>
+    """
+    start_raw = request.args.get("from")
+    end_raw = request.args.get("to")
+    if not start_raw or not end_raw:
+        return jerror(400, "MISSING_RANGE", "Missing 'from' or 'to' query parameter.")
+    try:
+        start = parse_iso(start_raw)
+        end = parse_iso(end_raw)
+    except Exception as e:
+        return jerror(422, "BAD_TIME", "Invalid time format, expected ISO 8601.", str(e))
+
+    slot_minutes = current_app.config["SLOT_MINUTES"]
+    calendar = current_calendar()
+    start_slot = calendar.round(start)
+    end_utc = to_utc(end).astimezone(timezone.utc)
+    if end_utc <= start_slot:
+        return jerror(422, "BAD_RANGE", "'to' must be after 'from'.")
+
+    max_hours = current_app.config["AVAILABILITY_RANGE_MAX_HOURS"]
+    if end_utc - start_slot > timedelta(hours=max_hours):
+        return jerror(422, "RANGE_TOO_LARGE", f"Range may span at most {max_hours} hours.")
+
+    start_db = db_utc_naive(start_slot)
+    end_db = db_utc_naive(end_utc)
+
+    if ledger.enabled:
+        rows = db.session.execute(
+            select(SlotCapacity.time_slot, SlotCapacity.booked_count)
+            .where(SlotCapacity.time_slot >= start_db, SlotCapacity.time_slot < end_db)
+        ).all()
+    else:
+        rows = db.session.execute(range_counts(start_db, end_db)).all()
+
+    booked_by_slot: dict[datetime, int] = {}
+    for time_slot, count in rows:
+        key = db_utc_naive(calendar.round(time_slot))
+        booked_by_slot[key] = booked_by_slot.get(key, 0) + int(count)
+
+    total_tables = current_app.config["TOTAL_TABLES"]
+    slots = []
+    # Hours in the zone create_reservation checks them in: the offset of 'from'
+    # unless BUSINESS_TIMEZONE is set.
+    for slot in calendar.slots(start_slot, end_utc, calendar.local_zone(to_utc(start))):
+        booked = booked_by_slot.get(db_utc_naive(slot), 0)
+        slots.append({
+            "slot": utc_iso_z(slot),
+            "booked": booked,
+            "available": total_tables - booked,
+        })
+
+    return jsonify(totalTables=total_tables, slotMinutes=slot_minutes, slots=slots)
+
+@bp.get("/availability/stream")
+def availability_stream():
+    """
+    Server-Sent Events feed of slot occupancy changes as bookings commit.
+    Query (optional): ?from=<ISO_8601>&to=<ISO_8601> to only receive slots in that window.
+    """
+    try:
+        start = to_utc(parse_iso(request.args["from"])) if request.args.get("from") else None
+        end = to_utc(parse_iso(request.args["to"])) if request.args.get("to") else None
+    except Exception as e:
+        return jerror(422, "BAD_TIME", "Invalid time format, expected ISO 8601.", str(e))
+
+    keepalive = current_app.config["EVENTS_KEEPALIVE_SECONDS"]
+    max_seconds = current_app.config["EVENTS_STREAM_MAX_SECONDS"]
+    dumps = current_app.json.dumps
+    subscription = events.subscribe()
+    if subscription is None:
+        # Streams hold a worker thread each; past the limit, bookings would starve.
+        response, status = jerror(503, "STREAM_LIMIT", "Too many live availability streams. Try again shortly.")
+        response.headers["Retry-After"] = str(max(1, int(keepalive)))
+        return response, status
+
+    def generate():
+        # Bounded lifetime frees the worker thread; EventSource reconnects on its own.
+        deadline = time.monotonic() + max_seconds
+        try:
+            yield "retry: 3000\n\n"
+            while time.monotonic() < deadline:
+                try:
+                    payload = subscription.get(timeout=keepalive)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                if start or end:
+                    slot = parse_iso(payload["slot"])
+                    if (start and slot < start) or (end and slot >= end):
+                        continue
+                yield f"event: slot\ndata: {dumps(payload)}\n\n"
+        finally:
+            events.unsubscribe(subscription)
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @bp.post("")
+@limiter.limit("create_reservation")
 def create_reservation():
-    ip = _client_ip()
-    if not _allow(ip):
-        return jerror(429, "RATE_LIMITED", "Too many requests. Try again shortly.")
-
     payload = request.get_json(silent=True)
     if not payload:
         return jerror(400, "INVALID_PAYLOAD", "Missing or invalid JSON payload.")
@@ -72,58 +185,254 @@ def create_reservation():
     try:
         data = CreateReservationRequest.model_validate(payload)
     except ValidationError as e:
-        return jerror(422, "VALIDATION_ERROR", "Invalid input.", details=e.errors())
+        return jerror(422, "VALIDATION_ERROR", "Invalid input.", details=e.errors(include_context=False))
     
-    slot_minutes = current_app.config["SLOT_MINUTES"]
-    ts_rounded = round_to_slot(data.time, slot_minutes)
+    ts_rounded = current_calendar().round(data.time)
     ts_db = db_utc_naive(ts_rounded)
     
-    customer = Customer.query.filter_by(email=data.email.lower()).one_or_none()
+    customer = db.session.execute(customer_by_email(data.email.lower())).scalar_one_or_none()
     if not customer:
         customer = Customer(name=data.name, email=data.email.lower(), phone=data.phone or "")
         db.session.add(customer)
         db.session.flush()
 
-    # --- Efficient query to find an available table ---
     total_tables = current_app.config["TOTAL_TABLES"]
-    find_table_query = text("""
-        SELECT s.num
-        FROM generate_series(1, :total_tables) AS s(num)
-        WHERE NOT EXISTS (
-            SELECT 1 FROM reservations r
-            WHERE r.time_slot = :time_slot AND r.table_number = s.num
-        )
-        ORDER BY random()
-        LIMIT 1
-    """)
-    
-    available_table = db.session.execute(
-        find_table_query,
-        {"total_tables": total_tables, "time_slot": ts_db}
-    ).scalar_one_or_none()
+    allocator = current_allocator()
+    if ledger.enabled:
+        # One conditional upsert on the slot's ledger row claims the table.
+        available_table, booked_bits = ledger.claim(ts_db, lambda booked: allocator.pick(booked, total_tables))
+        if available_table is None:
+            code = "RACE_LOST" if free_mask(booked_bits, total_tables) else "FULLY_BOOKED"
+            return jerror(409, code, BOOKING_ERRORS[code])
+    else:
+        # Fresh bitmap for the slot; the unique constraint still guards races.
+        booked_bits = occupancy.refresh(ts_db)
+        available_table = allocator.pick(booked_bits, total_tables)
 
     if available_table is None:
         return jerror(409, "FULLY_BOOKED", "Time slot fully booked.")
 
     res = Reservation(customer_id=customer.id, time_slot=ts_db, table_number=available_table)
     db.session.add(res)
+    events.slot_changed(ts_db, (booked_bits | (1 << (available_table - 1))).bit_count())
 
     try:
         db.session.commit()
     except IntegrityError:
         db.session.rollback()
+        occupancy.invalidate(ts_db)
+        # The ledger serialises claims, so a taken table means it is out of sync.
+        if ledger.enabled and ledger.reconcile(ts_db):
+            db.session.commit()
         return jerror(409, "RACE_LOST", "Just booked out. Pick another time.")
 
-    return jsonify(reservationId=res.id, tableNumber=available_table, slot=api_iso_z(ts_rounded)), 201
+    occupancy.mark_booked(ts_db, available_table)
+    allocator.record(available_table)
+
+    return jsonify(
+        reservationId=res.id,
+        tableNumber=available_table,
+        slot=api_iso_z(ts_rounded),
+        lookupToken=lookup_token(customer.email),
+    ), 201
+
+
+@bp.post("/async")
+@limiter.limit("create_reservation")
+def create_reservation_async():
+    """
+    Queues a booking for the booking-worker instead of allocating inline.
+    Requires an Idempotency-Key header; retries with the same key return the
+    original ticket. Poll GET /api/reservations/tickets/<Idempotency-Key>.
+    """
+    key = (request.headers.get("Idempotency-Key") or "").strip()
+    if not key or len(key) > 128:
+        return jerror(400, "MISSING_IDEMPOTENCY_KEY", "An Idempotency-Key header of at most 128 characters is required.")
+
+    payload = request.get_json(silent=True)
+    if not payload:
+        return jerror(400, "INVALID_PAYLOAD", "Missing or invalid JSON payload.")
+
+    try:
+        data = CreateReservationRequest.model_validate(payload)
+    except ValidationError as e:
+        return jerror(422, "VALIDATION_ERROR", "Invalid input.", details=e.errors(include_context=False))
+
+    ts_rounded = current_calendar().round(data.time)
+    stored = {
+        "name": data.name,
+        "email": data.email.lower(),
+        "phone": data.phone,
+        "guests": data.guests,
+    }
+    ticket, created = enqueue(key, stored, db_utc_naive(ts_rounded))
+    if not created and (ticket.payload != stored or db_utc_naive(ticket.time_slot) != db_utc_naive(ts_rounded)):
+        return jerror(422, "IDEMPOTENCY_KEY_REUSED", "This Idempotency-Key was already used for a different booking.")
+
+    status = 202 if ticket.status == "pending" else 200
+    return jsonify(ticket_body(ticket)), status
+
+
+@bp.get("/tickets/<key>")
+def get_ticket(key):
+    ticket = BookingTicket.query.filter_by(idempotency_key=key).one_or_none()
+    if ticket is None:
+        return jerror(404, "TICKET_NOT_FOUND", "No booking ticket with this key.")
+    return jsonify(ticket_body(ticket))
+
+
+@bp.post("/batch")
+def create_reservations_batch():
+    """
+    Admin bulk booking for partner and call-centre imports.
+    Body: JSON array of CreateReservationRequest payloads. Returns one result per item.
+    """
+    if not check_admin():
+        return jerror(401, "UNAUTHORIZED", "Missing or invalid bearer token.")
+
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, list) or not payload:
+        return jerror(400, "INVALID_PAYLOAD", "Expected a non-empty JSON array of reservations.")
+
+    max_items = current_app.config["RESERVATION_BATCH_MAX"]
+    if len(payload) > max_items:
+        return jerror(422, "BATCH_TOO_LARGE", f"A batch may contain at most {max_items} reservations.")
+
+    results: list[dict | None] = [None] * len(payload)
+    parsed = []
+    for i, item in enumerate(payload):
+        try:
+            data = CreateReservationRequest.model_validate(item, context=SKIP_CALENDAR)
+        except ValidationError as e:
+            results[i] = _validation_result(i, e)
+            continue
+        parsed.append((i, item, data))
+
+    # Opening hours for the whole batch, against a single clock read.
+    calendar = current_calendar()
+    valid = []
+    for (i, item, data), error in zip(parsed, calendar.check_many(data.time for _, _, data in parsed)):
+        if error:
+            results[i] = _validation_result(i, time_error(item["time"], error))
+        else:
+            valid.append((i, data.email.lower(), data))
+
+    if valid:
+        rounded = calendar.round_many(data.time for _, _, data in valid)
+        valid = [(i, email, data, ts_rounded) for (i, email, data), ts_rounded in zip(valid, rounded)]
+        customer_ids = upsert_customers((data.name, email, data.phone) for _, email, data, _ in valid)
+        bookings = [(customer_ids[email], db_utc_naive(ts_rounded)) for _, email, _, ts_rounded in valid]
+        outcomes = book_tables(bookings)
+        db.session.commit()
+        record_bookings(bookings, outcomes)
+
+        for (i, _, _, ts_rounded), outcome in zip(valid, outcomes):
+            if outcome.code:
+                results[i] = {"index": i, "code": outcome.code, "message": BOOKING_ERRORS[outcome.code]}
+            else:
+                results[i] = {
+                    "index": i,
+                    "reservationId": outcome.reservation_id,
+                    "tableNumber": outcome.table_number,
+                    "slot": api_iso_z(ts_rounded),
+                }
+
+    created = sum(1 for r in results if "reservationId" in r)
+    return jsonify(created=created, failed=len(results) - created, results=results)
+
+
+def _validation_result(index: int, error: ValidationError) -> dict:
+    return {
+        "index": index,
+        "code": "VALIDATION_ERROR",
+        "message": "Invalid input.",
+        "details": error.errors(include_context=False),
+    }
+
+
+_EXPORT_CSV_HEADER = ["id", "time", "tableNumber", "customerId", "customerName", "customerEmail", "customerPhone"]
+
+def _csv_line(values) -> str:
+    buf = io.StringIO()
+    csv.writer(buf).writerow(values)
+    return buf.getvalue()
+
+
+@bp.get("/export")
+@replicas.read_only
+def export_reservations():
+    """
+    Admin export across a date range, streamed so memory stays flat.
+    Query: ?from=YYYY-MM-DD&to=YYYY-MM-DD&format=ndjson|csv (both dates inclusive)
+    """
+    if not check_admin("export"):
+        return jerror(401, "UNAUTHORIZED", "Missing or invalid bearer token.")
+
+    from_str = request.args.get("from")
+    to_str = request.args.get("to")
+    if not from_str or not to_str:
+        return jerror(400, "MISSING_RANGE", "Missing 'from' or 'to' query parameter (YYYY-MM-DD).")
+    try:
+        first_day = datetime.fromisoformat(from_str).date()
+        last_day = datetime.fromisoformat(to_str).date()
+    except Exception as e:
+        return jerror(422, "BAD_DATE", "Invalid date format. Use YYYY-MM-DD.", str(e))
+    if last_day < first_day:
+        return jerror(422, "BAD_RANGE", "'to' must not be before 'from'.")
+
+    max_days = current_app.config["EXPORT_MAX_DAYS"]
+    if (last_day - first_day).days + 1 > max_days:
+        return jerror(422, "RANGE_TOO_LARGE", f"Export may span at most {max_days} days.")
+
+    fmt = request.args.get("format", "ndjson").lower()
+    if fmt not in ("ndjson", "csv"):
+        return jerror(422, "BAD_FORMAT", "Format must be 'ndjson' or 'csv'.")
+
+    start_db = datetime(first_day.year, first_day.month, first_day.day)
+    end_db = datetime(last_day.year, last_day.month, last_day.day) + timedelta(days=1)
+    batch_size = current_app.config["EXPORT_BATCH_SIZE"]
+
+    stmt = (
+        select(Reservation, Customer)
+        .join(Customer, Reservation.customer_id == Customer.id)
+        .where(Reservation.time_slot >= start_db, Reservation.time_slot < end_db)
+        .order_by(Reservation.time_slot.asc(), Reservation.table_number.asc())
+        .execution_options(stream_results=True, yield_per=batch_size)
+    )
+
+    def generate():
+        if fmt == "csv":
+            yield _csv_line(_EXPORT_CSV_HEADER)
+        dumps = current_app.json.dumps
+        for partition in db.session.execute(stmt).partitions():
+            chunk = []
+            for reservation, customer in partition:
+                row = ReservationRow.from_models(reservation, customer)
+                if fmt == "csv":
+                    chunk.append(_csv_line(row.csv_values()))
+                else:
+                    chunk.append(dumps(row) + "\n")
+            yield "".join(chunk)
+
+    filename = f"reservations_{first_day.isoformat()}_{last_day.isoformat()}.{fmt}"
+    mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    return Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @bp.get("")
+@replicas.read_only
 def list_reservations():
     """
     Admin list for a single day with pagination.
     Query: ?date=YYYY-MM-DD&page=1&page_size=20&customer_email=...
+    Pass cursor=<nextCursor> instead of page for keyset pagination, and
+    include_total=false to skip the total.
     """
-    if not check_admin():
+    if not check_admin("read"):
         return jerror(401, "UNAUTHORIZED", "Missing or invalid bearer token.")
     
     date_str = request.args.get("date")
@@ -137,43 +446,90 @@ def list_reservations():
     customer_email = request.args.get("customer_email")
     page = max(int(request.args.get("page", 1)), 1)
     page_size = min(max(int(request.args.get("page_size", 20)), 1), 100)
+    include_total = request.args.get("include_total", "true").lower() not in ("0", "false", "no")
+
+    cursor = request.args.get("cursor")
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except Exception as e:
+            return jerror(422, "BAD_CURSOR", "Invalid pagination cursor.", str(e))
 
     start_utc = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
     end_utc = start_utc + timedelta(days=1)
     start_db = start_utc.replace(tzinfo=None)
     end_db = end_utc.replace(tzinfo=None)
 
-    # 1. Start with the base query
-    q = (
-        db.session.query(Reservation, Customer)
-        .join(Customer, Reservation.customer_id == Customer.id)
-        .filter(Reservation.time_slot >= start_db, Reservation.time_slot < end_db)
-    )
-
     if customer_email:
-        q = q.filter(Customer.email == customer_email)
+        customer_email = customer_email.strip().lower()
 
-    total = q.count()
+    # One extra row tells whether there is a next page.
+    rows = db.session.execute(admin_page(
+        start_db, end_db, customer_email,
+        after=after, page_size=page_size, offset=(page - 1) * page_size, include_total=include_total,
+    )).all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
 
-    rows = (
-        q.order_by(Reservation.time_slot.asc(), Reservation.table_number.asc())
-        .limit(page_size)
-        .offset((page - 1) * page_size)
-        .all()
-    )
+    total = None
+    if include_total:
+        if rows:
+            total = rows[0][2]
+        elif after or page > 1:
+            total = db.session.execute(admin_day_count(start_db, end_db, customer_email)).scalar_one()
+        else:
+            total = 0
 
-    data = []
-    for reservation, customer in rows:
-        data.append({
-            "id": reservation.id,
-            "time": api_iso_z(reservation.time_slot),
-            "tableNumber": reservation.table_number,
-            "customer": {
-                "id": customer.id,
-                "name": customer.name,
-                "email": customer.email,
-                "phone": customer.phone,
-            },
-        })
-        
-    return jsonify(page=page, pageSize=page_size, total=total, reservations=data)
\ No newline at end of file
+    data = [ReservationRow.from_models(reservation, customer) for reservation, customer, *_ in rows]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1][0]
+        next_cursor = encode_cursor(last.time_slot, last.table_number)
+
+    return jsonify(page=page, pageSize=page_size, total=total, nextCursor=next_cursor, reservations=data)
+
+
+@bp.get("/by-customer")
+@limiter.limit("customer_lookup")
+@replicas.read_only
+def reservations_by_customer():
+    """
+    One customer's reservations across all dates, oldest first.
+    Query: ?email=...&upcoming=true&page_size=20&cursor=<nextCursor>
+    Admins need the read scope; customers send the lookupToken from their
+    booking response in an X-Lookup-Token header instead.
+    """
+    email = (request.args.get("email") or "").strip().lower()
+    if not email:
+        return jerror(400, "MISSING_EMAIL", "Missing 'email' query parameter.")
+    if not (check_admin("read") or check_lookup_token(email)):
+        return jerror(401, "UNAUTHORIZED", "Missing or invalid bearer or lookup token.")
+
+    page_size = min(max(int(request.args.get("page_size", 20)), 1), 100)
+    upcoming = request.args.get("upcoming", "false").lower() in ("1", "true", "yes")
+
+    cursor = request.args.get("cursor")
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except Exception as e:
+            return jerror(422, "BAD_CURSOR", "Invalid pagination cursor.", str(e))
+
+    customer = db.session.execute(customer_by_email(email)).scalar_one_or_none()
+    if customer is None:
+        return jsonify(pageSize=page_size, nextCursor=None, reservations=[])
+
+    since = db_utc_naive(datetime.now(timezone.utc)) if upcoming else None
+    rows = db.session.execute(customer_page(customer.id, since, after, page_size)).scalars().all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor(rows[-1].time_slot, rows[-1].id)
+
+    data = [ReservationRow.from_models(reservation, customer) for reservation in rows]
+    return jsonify(pageSize=page_size, nextCursor=next_cursor, reservations=data)
@@ -0,0 +1,120 @@
+from dataclasses import dataclass
+from datetime import datetime
+from flask import current_app
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from .extensions import db
+from .models import Customer, Reservation
+from .occupancy import occupancy
+from .ledger import ledger
+from .allocation import current_allocator
+from .events import events
+from .utils.time import db_utc_naive
+
+
+BOOKING_ERRORS = {
+    "FULLY_BOOKED": "Time slot fully booked.",
+    "RACE_LOST": "Just booked out. Pick another time.",
+}
+
+
+@dataclass
+class BookingOutcome:
+    reservation_id: int | None = None
+    table_number: int | None = None
+    code: str | None = None
+
+
+def upsert_customers(customers) -> dict[str, int]:
+    """
+    Inserts missing customers in one statement and returns {email: id} for all
+    of them. `customers` is an iterable of (name, email, phone); emails must
+    already be lower-cased. Existing customers are left untouched, as in
+    create_reservation.
+    """
+    rows: dict[str, dict] = {}
+    for name, email, phone in customers:
+        rows[email] = {"name": name, "email": email, "phone": phone or ""}
+    if not rows:
+        return {}
+
+    t = Customer.__table__
+    ins = pg_insert(t).values(list(rows.values()))
+    # No-op update so RETURNING also yields rows that already existed.
+    stmt = ins.on_conflict_do_update(
+        index_elements=[t.c.email],
+        set_={t.c.email: ins.excluded.email},
+    ).returning(t.c.id, t.c.email)
+
+    return {email: customer_id for customer_id, email in db.session.execute(stmt)}
+
+
+def book_tables(bookings: list[tuple[int, datetime]]) -> list[BookingOutcome]:
+    """
+    Allocates and inserts one reservation per (customer_id, slot) pair using a
+    single bitmap load and a single INSERT ... ON CONFLICT DO NOTHING. Slots
+    are naive UTC values from db_utc_naive. Rows the unique constraint rejects
+    come back as RACE_LOST. With the slot ledger enabled the slots' ledger
+    rows are locked first, so allocation is exact. The caller commits.
+    """
+    total_tables = current_app.config["TOTAL_TABLES"]
+    allocator = current_allocator()
+    if ledger.enabled:
+        bitmaps = ledger.lock(slot for _, slot in bookings)
+    else:
+        bitmaps = occupancy.refresh_many(slot for _, slot in bookings)
+    committed = dict(bitmaps)
+
+    outcomes: list[BookingOutcome] = []
+    rows = []
+    for customer_id, slot in bookings:
+        table_number = allocator.pick(bitmaps[slot], total_tables)
+        if table_number is None:
+            outcomes.append(BookingOutcome(code="FULLY_BOOKED"))
+            continue
+        bitmaps[slot] |= 1 << (table_number - 1)
+        outcomes.append(BookingOutcome(table_number=table_number))
+        rows.append({"customer_id": customer_id, "time_slot": slot, "table_number": table_number})
+
+    inserted: dict[tuple[datetime, int], int] = {}
+    added: dict[datetime, int] = {}
+    if rows:
+        t = Reservation.__table__
+        stmt = (
+            pg_insert(t)
+            .values(rows)
+            .on_conflict_do_nothing(constraint="uq_reservation_slot_table")
+            .returning(t.c.id, t.c.time_slot, t.c.table_number)
+        )
+        for reservation_id, time_slot, table_number in db.session.execute(stmt):
+            slot = db_utc_naive(time_slot)
+            inserted[(slot, table_number)] = reservation_id
+            committed[slot] |= 1 << (table_number - 1)
+            added[slot] = added.get(slot, 0) | (1 << (table_number - 1))
+
+        for slot, bits in added.items():
+            if ledger.enabled:
+                ledger.add(slot, bits)
+            events.slot_changed(slot, committed[slot].bit_count())
+
+    row_iter = iter(rows)
+    for outcome in outcomes:
+        if outcome.code:
+            continue
+        row = next(row_iter)
+        outcome.reservation_id = inserted.get((row["time_slot"], row["table_number"]))
+        if outcome.reservation_id is None:
+            outcome.code = "RACE_LOST"
+            outcome.table_number = None
+            if ledger.enabled:
+                # The rows are locked, so a conflict means the ledger is out of sync.
+                ledger.reconcile(row["time_slot"])
+    return outcomes
+
+
+def record_bookings(bookings: list[tuple[int, datetime]], outcomes: list[BookingOutcome]):
+    """Feeds committed bookings back into the occupancy index and allocator."""
+    allocator = current_allocator()
+    for (_, slot), outcome in zip(bookings, outcomes):
+        if outcome.reservation_id is not None:
+            occupancy.mark_booked(slot, outcome.table_number)
+            allocator.record(outcome.table_number)
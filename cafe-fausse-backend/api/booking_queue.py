@@ -0,0 +1,116 @@
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from .extensions import db
+from .models import BookingTicket
+from .booking import BOOKING_ERRORS, upsert_customers, book_tables, record_bookings
+from .utils.time import db_utc_naive, utc_iso_z
+
+
+def enqueue(idempotency_key: str, payload: dict, slot: datetime) -> tuple[BookingTicket, bool]:
+    """
+    Stores a validated booking request as a pending ticket. Returns the
+    ticket and whether it was created; a repeated key returns the original.
+    """
+    t = BookingTicket.__table__
+    stmt = (
+        pg_insert(t)
+        .values(idempotency_key=idempotency_key, status="pending", time_slot=slot, payload=payload, attempts=0)
+        .on_conflict_do_nothing(index_elements=[t.c.idempotency_key])
+        .returning(t.c.id)
+    )
+    created = db.session.execute(stmt).scalar_one_or_none() is not None
+    db.session.commit()
+    ticket = BookingTicket.query.filter_by(idempotency_key=idempotency_key).one()
+    return ticket, created
+
+
+def ticket_body(ticket: BookingTicket) -> dict:
+    return {
+        "ticket": ticket.idempotency_key,
+        "status": ticket.status,
+        "slot": utc_iso_z(ticket.time_slot),
+        "result": ticket.result,
+    }
+
+
+def process_next_batch(batch_size: int, max_attempts: int) -> int:
+    """
+    Claims up to `batch_size` pending tickets for one slot and books them in a
+    single transaction. Returns how many tickets were claimed (0 when idle).
+    """
+    pending = BookingTicket.status == "pending"
+    slot = db.session.execute(
+        select(BookingTicket.time_slot).where(pending)
+        .order_by(BookingTicket.id).limit(1)
+        .with_for_update(skip_locked=True)
+    ).scalar_one_or_none()
+    if slot is None:
+        db.session.rollback()
+        return 0
+
+    if db.engine.dialect.name == "postgresql":
+        # One worker per slot at a time, so allocation never races itself.
+        db.session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": int(slot.timestamp())})
+
+    tickets = db.session.execute(
+        select(BookingTicket).where(pending, BookingTicket.time_slot == slot)
+        .order_by(BookingTicket.id).limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+    if not tickets:
+        db.session.rollback()
+        return 0
+
+    customer_ids = upsert_customers(
+        (t.payload["name"], t.payload["email"], t.payload.get("phone")) for t in tickets
+    )
+    bookings = [(customer_ids[t.payload["email"]], db_utc_naive(t.time_slot)) for t in tickets]
+    outcomes = book_tables(bookings)
+
+    for ticket, outcome in zip(tickets, outcomes):
+        ticket.attempts += 1
+        if outcome.code is None:
+            ticket.status = "done"
+            ticket.result = {
+                "reservationId": outcome.reservation_id,
+                "tableNumber": outcome.table_number,
+                "slot": utc_iso_z(ticket.time_slot),
+            }
+        elif outcome.code == "RACE_LOST" and ticket.attempts < max_attempts:
+            continue
+        else:
+            ticket.status = "failed"
+            ticket.result = {"code": outcome.code, "message": BOOKING_ERRORS[outcome.code]}
+
+    db.session.commit()
+    record_bookings(bookings, outcomes)
+    return len(tickets)
+
+
+def run_worker(app, threads: int, batch_size: int, poll_interval: float, once: bool):
+    """Claims and books ticket batches on `threads` threads until stopped (or drained, with `once`)."""
+    max_attempts = app.config["BOOKING_QUEUE_MAX_ATTEMPTS"]
+
+    def loop():
+        while True:
+            with app.app_context():
+                try:
+                    claimed = process_next_batch(batch_size, max_attempts)
+                except Exception:
+                    db.session.rollback()
+                    app.logger.exception("Booking batch failed; retrying.")
+                    claimed = 0
+            if not claimed:
+                if once:
+                    return
+                time.sleep(poll_interval)
+
+    workers = [threading.Thread(target=loop, name=f"booking-worker-{i}", daemon=True) for i in range(threads)]
+    for w in workers:
+        w.start()
+    print(f"Booking worker running with {threads} thread(s).")
+    for w in workers:
+        w.join()
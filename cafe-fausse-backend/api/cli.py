@@ -0,0 +1,159 @@
+from datetime import date, datetime, timezone
+import click
+from flask import current_app
+from flask.cli import AppGroup, with_appcontext
+from .subscriptions import IMPORT_FORMATS, import_subscribers, read_records
+
+# Commands import what they run when invoked, so building the app for a
+# request worker or for another command does not load the seed or
+# partitioning code.
+
+
+@click.command("seed")
+@click.option("--customers", default=10, show_default=True, help="Customers to create.")
+@click.option("--days", default=3, show_default=True, help="Days of reservations, starting at --start.")
+@click.option("--occupancy", default=0.1, show_default=True, type=click.FloatRange(0, 1),
+              help="Share of tables booked in each business-hours slot.")
+@click.option("--seed", "rng_seed", default=42, show_default=True, help="Random seed; same seed, same data.")
+@click.option("--start", default=None, help="First day (YYYY-MM-DD, UTC). Defaults to today.")
+@click.option("--batch-size", default=10000, show_default=True, help="Rows per COPY/INSERT batch.")
+@with_appcontext
+def seed_command(customers, days, occupancy, rng_seed, start, batch_size):
+    """Replaces the database contents with generated sample data."""
+    from .seed import seed
+
+    if customers < 1:
+        raise click.BadParameter("at least one customer is needed", param_hint="--customers")
+    start_day = date.fromisoformat(start) if start else datetime.now(timezone.utc).date()
+    n_customers, n_reservations = seed(customers, days, occupancy, rng_seed, start_day, batch_size)
+    print(f"Created {n_customers} customers and {n_reservations} reservations from {start_day} for {days} day(s).")
+    print("Database seeded!")
+
+
+partitions_cli = AppGroup("partitions", help="Manages the monthly partitions of reservations.")
+
+
+def _require_postgres():
+    from .extensions import db
+
+    if db.engine.dialect.name != "postgresql":
+        raise click.ClickException("Partition management needs the Postgres database.")
+
+
+@partitions_cli.command("create")
+@click.option("--months-ahead", type=int, default=None, help="Months to pre-create (PARTITION_MONTHS_AHEAD).")
+def create_partitions_command(months_ahead):
+    """Pre-creates partitions for the coming months."""
+    from .partitions import create_partitions
+
+    _require_postgres()
+    if months_ahead is None:
+        months_ahead = current_app.config["PARTITION_MONTHS_AHEAD"]
+    created = create_partitions(months_ahead)
+    print(f"Created {len(created)} partition(s): {', '.join(created) or 'none needed'}.")
+
+
+@partitions_cli.command("archive")
+@click.option("--retention-months", type=int, default=None, help="Months kept online (PARTITION_RETENTION_MONTHS).")
+@click.option("--archive-dir", default=None, help="Where .csv.gz archives go (PARTITION_ARCHIVE_DIR).")
+@click.option("--keep-table", is_flag=True, help="Detach and archive, but do not drop the table.")
+def archive_partitions_command(retention_months, archive_dir, keep_table):
+    """Detaches old partitions and archives them as compressed CSV."""
+    from .partitions import archive_partitions
+
+    _require_postgres()
+    if retention_months is None:
+        retention_months = current_app.config["PARTITION_RETENTION_MONTHS"]
+    archive_dir = archive_dir or current_app.config["PARTITION_ARCHIVE_DIR"]
+    archived = archive_partitions(retention_months, archive_dir, keep_table=keep_table)
+    for name, path, rows in archived:
+        print(f"Archived {name}: {rows} row(s) -> {path}")
+    print(f"Archived {len(archived)} partition(s).")
+
+
+@click.command("booking-worker")
+@click.option("--threads", default=2, show_default=True, help="Worker threads claiming batches.")
+@click.option("--batch-size", default=None, type=int, help="Tickets per batch (BOOKING_QUEUE_BATCH_SIZE).")
+@click.option("--poll-interval", default=0.5, show_default=True, help="Seconds to sleep when the queue is empty.")
+@click.option("--once", is_flag=True, help="Drain the queue and exit.")
+@with_appcontext
+def booking_worker_command(threads, batch_size, poll_interval, once):
+    """Processes queued bookings from POST /api/reservations/async."""
+    from .booking_queue import run_worker
+
+    app = current_app._get_current_object()
+    if app.config["EVENTS_BACKEND"] != "postgres":
+        # The memory backend only reaches streams served by this process, and
+        # the worker serves none; queued bookings would never show up live.
+        raise click.ClickException(
+            "The booking worker needs EVENTS_BACKEND=postgres so its slot events reach the API's streams."
+        )
+    run_worker(app, threads, batch_size or app.config["BOOKING_QUEUE_BATCH_SIZE"], poll_interval, once)
+
+
+@click.command("ledger-backfill")
+@click.option("--from", "start", default=None, help="Only rebuild slots at or after this ISO 8601 time.")
+@click.option("--to", "end", default=None, help="Only rebuild slots before this ISO 8601 time.")
+@with_appcontext
+def ledger_backfill_command(start, end):
+    """Rebuilds the slot_capacity ledger from reservations."""
+    from .extensions import db
+    from .ledger import ledger
+    from .utils.time import db_utc_naive, parse_iso
+
+    start_db = db_utc_naive(parse_iso(start)) if start else None
+    end_db = db_utc_naive(parse_iso(end)) if end else None
+    written = ledger.backfill(start_db, end_db)
+    db.session.commit()
+    print(f"Rebuilt {written} slot(s) in slot_capacity.")
+
+
+@click.command("newsletter-import")
+@click.argument("source", type=click.File("rb"))
+@click.option("--format", "fmt", type=click.Choice(IMPORT_FORMATS), default=None,
+              help="Input format; defaults to the file extension (.csv, otherwise NDJSON).")
+@click.option("--chunk-size", type=int, default=None, help="Rows per upsert (NEWSLETTER_IMPORT_CHUNK_SIZE).")
+@with_appcontext
+def newsletter_import_command(source, fmt, chunk_size):
+    """Bulk-subscribes a CSV or NDJSON file (use - for stdin)."""
+    fmt = fmt or ("csv" if source.name.lower().endswith(".csv") else "ndjson")
+    report = import_subscribers(
+        read_records(source, fmt),
+        chunk_size or current_app.config["NEWSLETTER_IMPORT_CHUNK_SIZE"],
+        current_app.config["NEWSLETTER_IMPORT_MAX_ERRORS"],
+    )
+    for error in report.errors:
+        print(f"line {error['line']}: {error['code']} {error.get('details') or error['message']}")
+    print(f"Received {report.received}, subscribed {report.subscribed}, failed {report.failed}.")
+
+
+class _MigrateGroup(click.Group):
+    """`flask db`, whose Flask-Migrate (and alembic) import waits until it runs."""
+
+    def _load(self, ctx):
+        from flask_migrate import Migrate
+        from flask_migrate.cli import db as migrate_cli
+        from .extensions import db
+
+        app = current_app._get_current_object()
+        if "migrate" not in app.extensions:
+            Migrate(app, db)
+        return migrate_cli
+
+    def list_commands(self, ctx):
+        return self._load(ctx).list_commands(ctx)
+
+    def get_command(self, ctx, name):
+        return self._load(ctx).get_command(ctx, name)
+
+
+def init_app(app):
+    for command in (
+        _MigrateGroup("db", help="Perform database migrations."),
+        seed_command,
+        partitions_cli,
+        booking_worker_command,
+        ledger_backfill_command,
+        newsletter_import_command,
+    ):
+        app.cli.add_command(command)
@@ -1,8 +1,65 @@
 import os
+from .utils.pool import engine_options
+
+def _replica_binds(urls: str) -> dict:
+    # Each read replica becomes a Flask-SQLAlchemy bind: replica_0, replica_1, ...
+    urls = [u.strip() for u in urls.split(",") if u.strip()]
+    return {f"replica_{i}": {"url": url, **engine_options(url)} for i, url in enumerate(urls)}
 
 class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret")
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///local.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    SQLALCHEMY_BINDS = _replica_binds(os.getenv("DATABASE_REPLICA_URLS", ""))
+    REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+    REPLICA_LAG_CHECK_SECONDS = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "1"))
+    REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", "10"))
+    AUTH_RELOAD_CHECK_SECONDS = float(os.getenv("AUTH_RELOAD_CHECK_SECONDS", "5"))
+    AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "256"))
+    LOOKUP_TOKEN_TTL_SECONDS = int(os.getenv("LOOKUP_TOKEN_TTL_SECONDS", str(30 * 86400)))
+    # The ASGI entry point's engine; derived from DATABASE_URL when unset.
+    ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
     SLOT_MINUTES = int(os.getenv("SLOT_MINUTES", "30"))
-    TOTAL_TABLES = int(os.getenv("TOTAL_TABLES", "30"))
\ No newline at end of file
+    TOTAL_TABLES = int(os.getenv("TOTAL_TABLES", "30"))
+    OCCUPANCY_MAX_AGE_SECONDS = float(os.getenv("OCCUPANCY_MAX_AGE_SECONDS", "5"))
+    OCCUPANCY_HORIZON_HOURS = int(os.getenv("OCCUPANCY_HORIZON_HOURS", "72"))
+    AVAILABILITY_RANGE_MAX_HOURS = int(os.getenv("AVAILABILITY_RANGE_MAX_HOURS", "168"))
+    TABLE_ALLOCATION_STRATEGY = os.getenv("TABLE_ALLOCATION_STRATEGY", "random")
+    RESERVATION_BATCH_MAX = int(os.getenv("RESERVATION_BATCH_MAX", "2000"))
+    EXPORT_MAX_DAYS = int(os.getenv("EXPORT_MAX_DAYS", "366"))
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+    RATELIMIT_ENABLED = os.getenv("RATELIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+    RATELIMIT_BACKEND = os.getenv("RATELIMIT_BACKEND", "memory")
+    RATELIMIT_STORAGE_URL = os.getenv("RATELIMIT_STORAGE_URL")
+    RATELIMIT_ALGORITHM = os.getenv("RATELIMIT_ALGORITHM", "sliding_window")
+    RATELIMIT_RULES = {
+        "create_reservation": os.getenv("RATELIMIT_CREATE_RESERVATION", "12/minute"),
+        "availability": os.getenv("RATELIMIT_AVAILABILITY", "300/minute"),
+        "subscribe": os.getenv("RATELIMIT_SUBSCRIBE", "10/minute"),
+        "customer_lookup": os.getenv("RATELIMIT_CUSTOMER_LOOKUP", "30/minute"),
+    }
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() in ("1", "true", "yes")
+    METRICS_SLOW_QUERY_MS = float(os.getenv("METRICS_SLOW_QUERY_MS", "250"))
+    METRICS_N_PLUS_ONE_THRESHOLD = int(os.getenv("METRICS_N_PLUS_ONE_THRESHOLD", "10"))
+    AVAILABILITY_CACHE_MAX_AGE = int(os.getenv("AVAILABILITY_CACHE_MAX_AGE", "5"))
+    EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "memory")
+    EVENTS_CHANNEL = os.getenv("EVENTS_CHANNEL", "slot_updates")
+    EVENTS_KEEPALIVE_SECONDS = float(os.getenv("EVENTS_KEEPALIVE_SECONDS", "15"))
+    EVENTS_STREAM_MAX_SECONDS = float(os.getenv("EVENTS_STREAM_MAX_SECONDS", "300"))
+    # Each stream holds a worker thread; keep this below GUNICORN_THREADS.
+    EVENTS_MAX_SUBSCRIBERS = int(os.getenv("EVENTS_MAX_SUBSCRIBERS", "2"))
+    BOOKING_QUEUE_BATCH_SIZE = int(os.getenv("BOOKING_QUEUE_BATCH_SIZE", "100"))
+    BOOKING_QUEUE_MAX_ATTEMPTS = int(os.getenv("BOOKING_QUEUE_MAX_ATTEMPTS", "5"))
+    SLOT_LEDGER_ENABLED = os.getenv("SLOT_LEDGER_ENABLED", "false").lower() in ("1", "true", "yes")
+    PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+    PARTITION_RETENTION_MONTHS = int(os.getenv("PARTITION_RETENTION_MONTHS", "24"))
+    PARTITION_ARCHIVE_DIR = os.getenv("PARTITION_ARCHIVE_DIR", "archive")
+    NEWSLETTER_IMPORT_CHUNK_SIZE = int(os.getenv("NEWSLETTER_IMPORT_CHUNK_SIZE", "1000"))
+    NEWSLETTER_IMPORT_MAX_ERRORS = int(os.getenv("NEWSLETTER_IMPORT_MAX_ERRORS", "1000"))
+    JSON_BACKEND = os.getenv("JSON_BACKEND", "auto")
+    # Unset: opening hours apply in the offset each booking is submitted with.
+    BUSINESS_TIMEZONE = os.getenv("BUSINESS_TIMEZONE", "")
+    CALENDAR_CLOSURES = os.getenv("CALENDAR_CLOSURES", "")
+    CALENDAR_OVERRIDES = os.getenv("CALENDAR_OVERRIDES", "")
+    CALENDAR_HORIZON_DAYS = int(os.getenv("CALENDAR_HORIZON_DAYS", "90"))
@@ -0,0 +1,179 @@
+import json
+import logging
+import queue
+import select
+import threading
+import time
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from .extensions import db
+from .utils.time import utc_iso_z
+
+log = logging.getLogger(__name__)
+
+
+class Broadcaster:
+    """
+    In-process fan-out of slot events to one bounded queue per subscriber,
+    with at most `max_subscribers` subscribers (0: no limit).
+    """
+
+    def __init__(self, max_queue: int = 256, max_subscribers: int = 0):
+        self.max_queue = max_queue
+        self.max_subscribers = max_subscribers
+        self._subscribers: set[queue.Queue] = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> queue.Queue | None:
+        """A new subscriber queue, or None when the subscriber limit is reached."""
+        q = queue.Queue(maxsize=self.max_queue)
+        with self._lock:
+            if self.max_subscribers and len(self._subscribers) >= self.max_subscribers:
+                return None
+            self._subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q: queue.Queue):
+        with self._lock:
+            self._subscribers.discard(q)
+
+    def publish(self, payload: dict):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            try:
+                q.put_nowait(payload)
+            except queue.Full:
+                # A stalled client misses updates rather than blocking bookings.
+                pass
+
+    def __len__(self):
+        return len(self._subscribers)
+
+
+class PostgresListener:
+    """
+    Background thread that LISTENs on a Postgres channel and republishes
+    every NOTIFY payload to the local broadcaster, so all workers see every
+    booking. Reconnects with backoff if the connection drops.
+    """
+
+    def __init__(self, dsn: str, channel: str, broadcaster: Broadcaster):
+        self.dsn = dsn
+        self.channel = channel
+        self.broadcaster = broadcaster
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        # Set while LISTEN is active; NOTIFYs sent before it are not seen.
+        self.ready = threading.Event()
+
+    def ensure_started(self):
+        # Started lazily so a preforking server never runs it in the master.
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="slot-events-listener", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        import psycopg2
+        backoff = 1.0
+        while True:
+            try:
+                conn = psycopg2.connect(self.dsn)
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cur:
+                    cur.execute(f'LISTEN "{self.channel}"')
+                self.ready.set()
+                backoff = 1.0
+                while True:
+                    if select.select([conn], [], [], 30) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        note = conn.notifies.pop(0)
+                        self.broadcaster.publish(json.loads(note.payload))
+            except Exception:
+                self.ready.clear()
+                log.exception("Slot event listener lost its connection; retrying in %.0fs", backoff)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+
+class SlotEvents:
+    """
+    Publishes slot occupancy changes to SSE subscribers. Views call
+    slot_changed() before committing; the events go out only if the
+    transaction commits. With EVENTS_BACKEND=postgres they are sent as
+    pg_notify inside the transaction and fanned out by each worker's listener.
+    """
+
+    def __init__(self):
+        self.broadcaster = Broadcaster()
+        self.listener: PostgresListener | None = None
+        self.channel = "slot_updates"
+        self._hooked = False
+
+    def init_app(self, app):
+        self.channel = app.config["EVENTS_CHANNEL"]
+        self.broadcaster.max_subscribers = app.config["EVENTS_MAX_SUBSCRIBERS"]
+        self.listener = None
+        if app.config["EVENTS_BACKEND"] == "postgres":
+            url = make_url(app.config["SQLALCHEMY_DATABASE_URI"]).set(drivername="postgresql")
+            self.listener = PostgresListener(url.render_as_string(hide_password=False), self.channel, self.broadcaster)
+
+        if not self._hooked:
+            self.listen(db.session)
+            self._hooked = True
+        app.extensions["slot_events"] = self
+
+    def listen(self, target):
+        """Sends queued updates on commits of `target`, a session or Session class."""
+        for name, fn in (
+            ("before_commit", self._before_commit),
+            ("after_commit", self._after_commit),
+            ("after_rollback", self._after_rollback),
+        ):
+            if not event.contains(target, name, fn):
+                event.listen(target, name, fn)
+
+    def subscribe(self) -> queue.Queue | None:
+        """A subscriber queue, or None when this process serves EVENTS_MAX_SUBSCRIBERS streams already."""
+        if self.listener:
+            self.listener.ensure_started()
+        return self.broadcaster.subscribe()
+
+    def unsubscribe(self, q: queue.Queue):
+        self.broadcaster.unsubscribe(q)
+
+    def slot_changed(self, slot: datetime, booked: int):
+        """Queues an update for `slot` (naive UTC) on the current session's transaction."""
+        total_tables = current_app.config["TOTAL_TABLES"]
+        pending = db.session.info.setdefault("slot_events", {})
+        pending[slot] = {
+            "slot": utc_iso_z(slot),
+            "booked": booked,
+            "available": total_tables - booked,
+        }
+
+    def _before_commit(self, session):
+        pending = session.info.get("slot_events")
+        if pending and self.listener:
+            for payload in pending.values():
+                session.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": self.channel, "payload": json.dumps(payload)},
+                )
+
+    def _after_commit(self, session):
+        pending = session.info.pop("slot_events", None)
+        if pending and not self.listener:
+            for payload in pending.values():
+                self.broadcaster.publish(payload)
+
+    def _after_rollback(self, session):
+        session.info.pop("slot_events", None)
+
+
+events = SlotEvents()
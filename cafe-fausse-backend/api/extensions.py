@@ -1,6 +1,17 @@
+from flask import g, has_app_context
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
+from flask_sqlalchemy.session import Session
 
-db = SQLAlchemy()
-migrate = Migrate()
 
+class RoutingSession(Session):
+    """Runs SELECTs on the replica bind a read-only view picked (g.db_replica); everything else on the primary."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_app_context():
+            key = g.get("db_replica")
+            if key and getattr(clause, "is_select", False):
+                return self._db.engines[key]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
@@ -0,0 +1,183 @@
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import BigInteger, cast, delete, func, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from .extensions import db
+from .models import Reservation, SlotCapacity
+from .utils.time import db_utc_naive
+
+# Table bitmaps live in a signed BIGINT.
+MAX_LEDGER_TABLES = 63
+
+
+class SlotLedger:
+    """
+    Denormalised per-slot capacity: one slot_capacity row per slot holding the
+    booked count and the booked-table bitmap (bit n-1 set when table n is
+    booked). With SLOT_LEDGER_ENABLED, availability reads it by primary key
+    and bookings claim a table with one conditional upsert on it, in the same
+    transaction as the reservation insert.
+    """
+
+    def __init__(self, retries: int = 3):
+        self.enabled = False
+        self.retries = retries
+
+    def init_app(self, app):
+        self.enabled = app.config["SLOT_LEDGER_ENABLED"]
+        if self.enabled and app.config["TOTAL_TABLES"] > MAX_LEDGER_TABLES:
+            raise ValueError(f"SLOT_LEDGER_ENABLED supports at most {MAX_LEDGER_TABLES} tables.")
+        app.extensions["slot_ledger"] = self
+
+    def mask(self, slot: datetime) -> int:
+        t = SlotCapacity.__table__
+        bits = db.session.execute(select(t.c.table_mask).where(t.c.time_slot == slot)).scalar()
+        return int(bits or 0)
+
+    def masks(self, slots) -> dict[datetime, int]:
+        slots = set(slots)
+        loaded = dict.fromkeys(slots, 0)
+        if slots:
+            t = SlotCapacity.__table__
+            for time_slot, bits in db.session.execute(
+                select(t.c.time_slot, t.c.table_mask).where(t.c.time_slot.in_(slots))
+            ):
+                loaded[db_utc_naive(time_slot)] = int(bits)
+        return loaded
+
+    def range(self, start: datetime, end: datetime) -> dict[datetime, int]:
+        """Bitmaps of every ledger row in [start, end); slots without a row are free."""
+        t = SlotCapacity.__table__
+        return {
+            db_utc_naive(time_slot): int(bits)
+            for time_slot, bits in db.session.execute(
+                select(t.c.time_slot, t.c.table_mask)
+                .where(t.c.time_slot >= start, t.c.time_slot < end, t.c.booked_count > 0)
+            )
+        }
+
+    def claim(self, slot: datetime, choose) -> tuple[int | None, int]:
+        """
+        Books one table on `slot`. `choose` maps the booked bitmap to a table
+        number, or None when nothing is free. The claim is a single
+        INSERT ... ON CONFLICT DO UPDATE ... WHERE the table bit is still clear,
+        so a concurrent booking of the same table makes it match no row and we
+        pick again from the fresh bitmap. Returns (table_number, bitmap before
+        the claim); table_number is None when the slot is full or every retry
+        lost.
+        """
+        t = SlotCapacity.__table__
+        booked = self.mask(slot)
+        for _ in range(self.retries):
+            table_number = choose(booked)
+            if table_number is None:
+                return None, booked
+            bit = 1 << (table_number - 1)
+            ins = pg_insert(t).values(time_slot=slot, booked_count=1, table_mask=bit)
+            stmt = ins.on_conflict_do_update(
+                index_elements=[t.c.time_slot],
+                set_={
+                    t.c.table_mask: t.c.table_mask.bitwise_or(bit),
+                    t.c.booked_count: t.c.booked_count + 1,
+                    t.c.updated_at: func.now(),
+                },
+                where=t.c.table_mask.bitwise_and(bit) == 0,
+            ).returning(t.c.table_mask)
+            after = db.session.execute(stmt).scalar_one_or_none()
+            if after is not None:
+                return table_number, int(after) & ~bit
+            booked = self.mask(slot)
+        return None, booked
+
+    def lock(self, slots) -> dict[datetime, int]:
+        """
+        Creates any missing rows and locks the ledger rows of `slots` (in slot
+        order, so concurrent batches cannot deadlock). Used by set-based
+        booking paths, which then call add() before committing.
+        """
+        slots = sorted(set(slots))
+        if not slots:
+            return {}
+        t = SlotCapacity.__table__
+        db.session.execute(
+            pg_insert(t)
+            .values([{"time_slot": s, "booked_count": 0, "table_mask": 0} for s in slots])
+            .on_conflict_do_nothing(index_elements=[t.c.time_slot])
+        )
+        loaded = dict.fromkeys(slots, 0)
+        for time_slot, bits in db.session.execute(
+            select(t.c.time_slot, t.c.table_mask)
+            .where(t.c.time_slot.in_(slots))
+            .order_by(t.c.time_slot)
+            .with_for_update()
+        ):
+            loaded[db_utc_naive(time_slot)] = int(bits)
+        return loaded
+
+    def add(self, slot: datetime, bits: int):
+        """Marks newly inserted tables (bitmap `bits`) as booked on a row locked by lock()."""
+        t = SlotCapacity.__table__
+        db.session.execute(
+            t.update()
+            .where(t.c.time_slot == slot)
+            .values(
+                table_mask=t.c.table_mask.bitwise_or(bits),
+                booked_count=t.c.booked_count + bits.bit_count(),
+                updated_at=func.now(),
+            )
+        )
+
+    def reconcile(self, slot: datetime) -> bool:
+        """
+        Rebuilds the ledger row of `slot` if it disagrees with reservations;
+        returns whether it did. With the row out of sync, claims keep picking
+        a table that is already taken. The caller commits.
+        """
+        actual = 0
+        for table_number in db.session.execute(
+            select(Reservation.table_number).where(Reservation.time_slot == slot)
+        ).scalars():
+            actual |= 1 << (table_number - 1)
+        recorded = self.mask(slot)
+        if actual == recorded:
+            return False
+        current_app.logger.warning(
+            "slot_capacity for %s has tables %s but reservations have %s; rebuilding the row.",
+            slot, bin(recorded), bin(actual),
+        )
+        self.backfill(slot, slot + timedelta(microseconds=1))
+        return True
+
+    def backfill(self, start: datetime | None = None, end: datetime | None = None) -> int:
+        """
+        Rebuilds ledger rows from reservations, optionally only for slots in
+        [start, end). Returns the number of slots written. The caller commits.
+        """
+        t = SlotCapacity.__table__
+        # (time_slot, table_number) is unique, so summing the bits is an OR.
+        bit = cast(literal(1), BigInteger).op("<<")(Reservation.table_number - 1)
+        source = select(
+            Reservation.time_slot,
+            func.count().label("booked_count"),
+            cast(func.sum(bit), BigInteger).label("table_mask"),
+        ).group_by(Reservation.time_slot)
+        clear = delete(t)
+        if start is not None:
+            source = source.where(Reservation.time_slot >= start)
+            clear = clear.where(t.c.time_slot >= start)
+        if end is not None:
+            source = source.where(Reservation.time_slot < end)
+            clear = clear.where(t.c.time_slot < end)
+
+        db.session.execute(clear)
+        ins = pg_insert(t).from_select(["time_slot", "booked_count", "table_mask"], source)
+        result = db.session.execute(
+            ins.on_conflict_do_update(
+                index_elements=[t.c.time_slot],
+                set_={t.c.booked_count: ins.excluded.booked_count, t.c.table_mask: ins.excluded.table_mask},
+            )
+        )
+        return result.rowcount
+
+
+ledger = SlotLedger()
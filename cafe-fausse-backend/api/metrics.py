@@ -0,0 +1,169 @@
+import threading
+import time
+from collections import Counter, defaultdict
+from flask import Response, current_app, g, has_request_context, request
+from sqlalchemy import event
+from .extensions import db
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.total += value
+        self.count += 1
+
+
+def _endpoint_name() -> str:
+    """Blueprint view function behind the current request, e.g. 'create_reservation'."""
+    return (request.endpoint or "unmatched").rsplit(".", 1)[-1]
+
+
+def _labels(**labels) -> str:
+    inner = ",".join(f'{k}="{str(v).replace(chr(34), chr(39))}"' for k, v in labels.items())
+    return "{" + inner + "}"
+
+
+class Metrics:
+    """
+    Opt-in (METRICS_ENABLED) per-process request and query instrumentation.
+    Records latency histograms per endpoint, counts and times every query a
+    request issues, adds a Server-Timing header and serves /metrics in the
+    Prometheus text format.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latency: dict[tuple, _Histogram] = defaultdict(_Histogram)
+        self._queries: Counter = Counter()
+        self._query_seconds: Counter = Counter()
+        self.slow_query_seconds = 0.25
+        self.n_plus_one_threshold = 10
+
+    def init_app(self, app):
+        if not app.config["METRICS_ENABLED"]:
+            return
+        self.slow_query_seconds = app.config["METRICS_SLOW_QUERY_MS"] / 1000
+        self.n_plus_one_threshold = app.config["METRICS_N_PLUS_ONE_THRESHOLD"]
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.add_url_rule("/metrics", "metrics", self._metrics_view)
+
+        with app.app_context():
+            for engine in db.engines.values():
+                self.instrument(engine)
+        app.extensions["metrics"] = self
+
+    def instrument(self, engine):
+        """Counts and times the queries `engine` runs for the current request."""
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    # --- request hooks ------------------------------------------------------
+
+    def _before_request(self):
+        g.metrics_started = time.perf_counter()
+        g.metrics_queries = 0
+        g.metrics_query_seconds = 0.0
+        g.metrics_statements = Counter()
+
+    def _after_request(self, response):
+        started = g.get("metrics_started")
+        if started is None or request.endpoint == "metrics":
+            return response
+        elapsed = time.perf_counter() - started
+        endpoint = _endpoint_name()
+        queries = g.metrics_queries
+        query_seconds = g.metrics_query_seconds
+
+        with self._lock:
+            self._latency[(endpoint, request.method, response.status_code)].observe(elapsed)
+            self._queries[endpoint] += queries
+            self._query_seconds[endpoint] += query_seconds
+
+        for statement, count in g.metrics_statements.items():
+            if count >= self.n_plus_one_threshold:
+                current_app.logger.warning(
+                    "Possible N+1 in %s: statement ran %d times in one request: %s",
+                    endpoint, count, statement[:200],
+                )
+
+        response.headers.add(
+            "Server-Timing",
+            f'app;dur={elapsed * 1000:.1f}, db;dur={query_seconds * 1000:.1f};desc="{queries} queries"',
+        )
+        return response
+
+    # --- SQLAlchemy listeners -----------------------------------------------
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # Kept on the statement's own context: a failing statement never reaches
+        # after_cursor_execute and must not leave state on the pooled connection.
+        if context is not None:
+            context.metrics_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "metrics_started", None)
+        if started is None or not has_request_context() or "metrics_queries" not in g:
+            return
+        elapsed = time.perf_counter() - started
+        g.metrics_queries += 1
+        g.metrics_query_seconds += elapsed
+        g.metrics_statements[statement] += 1
+        if elapsed >= self.slow_query_seconds:
+            current_app.logger.warning(
+                "Slow query in %s (%.1f ms): %s", _endpoint_name(), elapsed * 1000, statement[:200]
+            )
+
+    # --- exposition ---------------------------------------------------------
+
+    def render(self) -> str:
+        lines = [
+            "# HELP http_request_duration_seconds Request latency by endpoint.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        with self._lock:
+            for (endpoint, method, status), hist in sorted(self._latency.items()):
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, hist.counts):
+                    cumulative += count
+                    lines.append(
+                        f"http_request_duration_seconds_bucket"
+                        f"{_labels(endpoint=endpoint, method=method, status=status, le=bound)} {cumulative}"
+                    )
+                base = _labels(endpoint=endpoint, method=method, status=status)
+                lines.append(
+                    f"http_request_duration_seconds_bucket"
+                    f"{_labels(endpoint=endpoint, method=method, status=status, le='+Inf')} {hist.count}"
+                )
+                lines.append(f"http_request_duration_seconds_sum{base} {hist.total:.6f}")
+                lines.append(f"http_request_duration_seconds_count{base} {hist.count}")
+
+            lines.append("# HELP db_queries_total Database queries issued, by endpoint.")
+            lines.append("# TYPE db_queries_total counter")
+            for endpoint, count in sorted(self._queries.items()):
+                lines.append(f"db_queries_total{_labels(endpoint=endpoint)} {count}")
+
+            lines.append("# HELP db_query_duration_seconds_total Time spent in database queries, by endpoint.")
+            lines.append("# TYPE db_query_duration_seconds_total counter")
+            for endpoint, seconds in sorted(self._query_seconds.items()):
+                lines.append(f"db_query_duration_seconds_total{_labels(endpoint=endpoint)} {seconds:.6f}")
+        return "\n".join(lines) + "\n"
+
+    def _metrics_view(self):
+        return Response(self.render(), mimetype="text/plain; version=0.0.4")
+
+
+metrics = Metrics()
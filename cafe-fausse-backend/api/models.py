@@ -1,4 +1,4 @@
-from sqlalchemy import UniqueConstraint, func
+from sqlalchemy import UniqueConstraint, func, text
 from .extensions import db
 
 class Customer(db.Model):
@@ -12,12 +12,45 @@ class Customer(db.Model):
     reservations = db.relationship("Reservation", back_populates="customer", cascade="all, delete-orphan")
 
 class Reservation(db.Model):
+    # Range-partitioned by month on time_slot (migration 005), so the database
+    # key is (id, time_slot); id alone is still unique and is the ORM identity.
     __tablename__ = "reservations"
     id = db.Column(db.Integer, primary_key=True)
-    customer_id = db.Column(db.Integer, db.ForeignKey("customers.id", ondelete="CASCADE"), nullable=False, index=True)
-    time_slot = db.Column(db.DateTime(timezone=True), nullable=False, index=True)
+    customer_id = db.Column(db.Integer, db.ForeignKey("customers.id", ondelete="CASCADE"), nullable=False)
+    time_slot = db.Column(db.DateTime(timezone=True), nullable=False)
     table_number = db.Column(db.Integer, nullable=False)
     created_at = db.Column(db.DateTime(timezone=True), nullable=False, server_default=func.now())
     customer = db.relationship("Customer", back_populates="reservations")
 
-    __table_args__ = (UniqueConstraint("time_slot", "table_number", name="uq_reservation_slot_table"),)
+    __table_args__ = (
+        # Also the slot-range index: covers availability and the admin list order.
+        UniqueConstraint("time_slot", "table_number", name="uq_reservation_slot_table", postgresql_include=["customer_id"]),
+        db.Index("ix_reservations_customer_slot", "customer_id", "time_slot", "id"),
+    )
+
+class BookingTicket(db.Model):
+    __tablename__ = "booking_tickets"
+    id = db.Column(db.Integer, primary_key=True)
+    idempotency_key = db.Column(db.String(128), nullable=False)
+    status = db.Column(db.String(16), nullable=False, default="pending")
+    time_slot = db.Column(db.DateTime(timezone=True), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    result = db.Column(db.JSON)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = db.Column(db.DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("idempotency_key", name="uq_booking_tickets_idempotency_key"),
+        db.Index(
+            "ix_booking_tickets_pending", "time_slot", "id",
+            postgresql_where=text("status = 'pending'"), sqlite_where=text("status = 'pending'"),
+        ),
+    )
+
+class SlotCapacity(db.Model):
+    __tablename__ = "slot_capacity"
+    time_slot = db.Column(db.DateTime(timezone=True), primary_key=True)
+    booked_count = db.Column(db.Integer, nullable=False, default=0)
+    table_mask = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
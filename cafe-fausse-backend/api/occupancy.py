@@ -0,0 +1,222 @@
+import asyncio
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+from .extensions import db
+from .models import Reservation
+from .ledger import ledger
+from .queries import slot_tables, slots_tables
+from .utils.time import round_to_slot, db_utc_naive, iter_slots
+
+
+class SlotOccupancyIndex:
+    """
+    Per-process index of booked tables, keyed by the naive UTC slot from
+    round_to_slot/db_utc_naive. Each entry is a bitmap where bit n-1 is set
+    when table n is booked, plus the monotonic time it was loaded.
+
+    Every slot also carries a version that is bumped whenever its bitmap
+    changes; availability() turns it into an ETag. With SLOT_LEDGER_ENABLED,
+    bitmaps are loaded from the slot_capacity ledger instead of reservations.
+
+    Reloads are single-flight: when an entry goes stale, one request runs the
+    warm() or per-slot query and concurrent ones wait for its result.
+    Under the ASGI bridge (api/asgi.py) requests are greenlets on the event
+    loop's thread, so waiters yield to the loop instead of blocking on the
+    lock while its holder's queries are in flight.
+    """
+
+    def __init__(self, max_age: float = 5.0, horizon_hours: int = 72, slot_minutes: int = 30):
+        self.max_age = max_age
+        self.horizon = timedelta(hours=horizon_hours)
+        self.slot_minutes = slot_minutes
+        self._slots: dict[datetime, tuple[int, float]] = {}
+        self._versions: dict[datetime, int] = {}
+        self._warmed_at = 0.0
+        self._lock = threading.Lock()
+        self._warm_lock = threading.Lock()
+        self._slot_locks: dict[datetime, threading.Lock] = {}
+        # Keeps this process' versions apart from other workers' and earlier runs'.
+        self.epoch = uuid.uuid4().hex[:8]
+
+    def init_app(self, app):
+        self.max_age = float(app.config["OCCUPANCY_MAX_AGE_SECONDS"])
+        self.horizon = timedelta(hours=int(app.config["OCCUPANCY_HORIZON_HOURS"]))
+        self.slot_minutes = app.config["SLOT_MINUTES"]
+        self.invalidate()
+        app.extensions["occupancy"] = self
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_age > 0
+
+    def bitmap(self, slot: datetime) -> int:
+        """Returns the booked-table bitmap for a slot, loading it if the entry is stale."""
+        if not self.enabled:
+            return self._load_slot(slot)
+
+        bits = self._fresh(slot)
+        if bits is not None:
+            return bits
+
+        if self._in_horizon(slot) and time.monotonic() - self._warmed_at > self.max_age:
+            with _single_flight(self._warm_lock):
+                # Another request may have warmed while this one waited.
+                if time.monotonic() - self._warmed_at > self.max_age:
+                    self.warm()
+            bits = self._fresh(slot)
+            if bits is not None:
+                return bits
+
+        with _single_flight(self._slot_lock(slot)):
+            bits = self._fresh(slot)
+            if bits is not None:
+                return bits
+            return self.refresh(slot)
+
+    def booked(self, slot: datetime) -> int:
+        return self.bitmap(slot).bit_count()
+
+    def snapshot(self, slot: datetime) -> tuple[int, int | None]:
+        """Bitmap and matching version, read together; version is None when the index is off."""
+        bits = self.bitmap(slot)
+        with self._lock:
+            entry = self._slots.get(slot)
+            if entry is None:
+                return bits, None
+            return entry[0], self._versions.get(slot)
+
+    def version(self, slot: datetime) -> int | None:
+        """Current version of a slot, or None when the entry is missing or stale. Never touches the DB."""
+        entry = self._slots.get(slot)
+        if entry and time.monotonic() - entry[1] <= self.max_age:
+            return self._versions.get(slot)
+        return None
+
+    def etag(self, slot: datetime, version: int) -> str:
+        return f"{self.epoch}-{int(slot.replace(tzinfo=timezone.utc).timestamp())}-{version}"
+
+    def refresh(self, slot: datetime) -> int:
+        """Reloads a single slot from the database, bypassing the freshness bound."""
+        bits = self._load_slot(slot)
+        if self.enabled:
+            with self._lock:
+                self._store(slot, bits, time.monotonic(), self._slots.get(slot))
+        return bits
+
+    def refresh_many(self, slots) -> dict[datetime, int]:
+        """Reloads several slots in one query; used by set-based booking paths."""
+        slots = set(slots)
+        if ledger.enabled:
+            loaded = ledger.masks(slots)
+        else:
+            loaded = self._load_many(slots)
+        if self.enabled:
+            now = time.monotonic()
+            with self._lock:
+                for key, bits in loaded.items():
+                    self._store(key, bits, now, self._slots.get(key))
+        return loaded
+
+    def _load_many(self, slots: set[datetime]) -> dict[datetime, int]:
+        loaded = dict.fromkeys(slots, 0)
+        if slots:
+            for time_slot, table_number in db.session.execute(slots_tables(slots)):
+                key = db_utc_naive(time_slot)
+                loaded[key] = loaded.get(key, 0) | (1 << (table_number - 1))
+        return loaded
+
+    def warm(self):
+        """Loads every slot in the rolling horizon [now, now + horizon) in one query."""
+        start = db_utc_naive(round_to_slot(datetime.now(timezone.utc), self.slot_minutes))
+        end = start + self.horizon
+        if ledger.enabled:
+            loaded = ledger.range(start, end)
+        else:
+            loaded: dict[datetime, int] = {}
+            for time_slot, table_number in db.session.execute(
+                select(Reservation.time_slot, Reservation.table_number)
+                .where(Reservation.time_slot >= start, Reservation.time_slot < end)
+            ):
+                key = db_utc_naive(time_slot)
+                loaded[key] = loaded.get(key, 0) | (1 << (table_number - 1))
+
+        now = time.monotonic()
+        with self._lock:
+            previous = self._slots
+            # Past slots and stale entries beyond the horizon are dropped.
+            self._slots = {
+                k: v for k, v in previous.items()
+                if k >= end and now - v[1] <= self.max_age
+            }
+            self._versions = {k: v for k, v in self._versions.items() if k >= start}
+            self._slot_locks = {k: v for k, v in self._slot_locks.items() if k >= start}
+            for k in iter_slots(start, end, self.slot_minutes):
+                self._store(k, loaded.get(k, 0), now, previous.get(k))
+            self._warmed_at = now
+
+    def mark_booked(self, slot: datetime, table_number: int):
+        """Records a committed booking so the entry stays exact without a reload."""
+        with self._lock:
+            entry = self._slots.get(slot)
+            if entry:
+                self._store(slot, entry[0] | (1 << (table_number - 1)), entry[1], entry)
+            else:
+                self._versions[slot] = self._versions.get(slot, 0) + 1
+
+    def invalidate(self, slot: datetime | None = None):
+        with self._lock:
+            if slot is None:
+                self._slots = {}
+                self._warmed_at = 0.0
+            else:
+                self._slots.pop(slot, None)
+
+    def _fresh(self, slot: datetime) -> int | None:
+        entry = self._slots.get(slot)
+        if entry and time.monotonic() - entry[1] <= self.max_age:
+            return entry[0]
+        return None
+
+    def _slot_lock(self, slot: datetime) -> threading.Lock:
+        with self._lock:
+            return self._slot_locks.setdefault(slot, threading.Lock())
+
+    def _store(self, slot: datetime, bits: int, loaded_at: float, previous: tuple[int, float] | None):
+        # Caller holds the lock. An unknown previous bitmap counts as a change.
+        if previous is None or previous[0] != bits:
+            self._versions[slot] = self._versions.get(slot, 0) + 1
+        self._slots[slot] = (bits, loaded_at)
+
+    def _in_horizon(self, slot: datetime) -> bool:
+        start = db_utc_naive(round_to_slot(datetime.now(timezone.utc), self.slot_minutes))
+        return start <= slot < start + self.horizon
+
+    def _load_slot(self, slot: datetime) -> int:
+        if ledger.enabled:
+            return ledger.mask(slot)
+        bits = 0
+        for table_number in db.session.execute(slot_tables(slot)).scalars():
+            bits |= 1 << (table_number - 1)
+        return bits
+
+
+@contextmanager
+def _single_flight(lock: threading.Lock, poll: float = 0.005):
+    if in_greenlet():
+        # Blocking here would stop the loop, and with it the holder's queries.
+        while not lock.acquire(blocking=False):
+            await_only(asyncio.sleep(poll))
+    else:
+        lock.acquire()
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+occupancy = SlotOccupancyIndex()
@@ -0,0 +1,142 @@
+import gzip
+import os
+import re
+from datetime import datetime, timezone
+from sqlalchemy import text
+from .extensions import db
+from .models import SlotCapacity
+
+PARENT = "reservations"
+DEFAULT_PARTITION = "reservations_default"
+_MONTHLY = re.compile(r"^reservations_(\d{4})_(\d{2})$")
+
+
+def month_start(dt: datetime) -> datetime:
+    dt = dt.astimezone(timezone.utc) if dt.tzinfo else dt
+    return datetime(dt.year, dt.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(month: datetime, n: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + n
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARENT}_{month:%Y_%m}"
+
+
+def monthly_partitions() -> dict[str, datetime]:
+    """Attached monthly partitions of reservations, {name: first day of month}."""
+    rows = db.session.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = CAST(:parent AS regclass)"
+    ), {"parent": PARENT}).scalars()
+    found = {}
+    for name in rows:
+        m = _MONTHLY.match(name)
+        if m:
+            found[name] = datetime(int(m.group(1)), int(m.group(2)), 1, tzinfo=timezone.utc)
+    return found
+
+
+def create_partitions(months_ahead: int, now: datetime | None = None) -> list[str]:
+    """
+    Makes sure a partition exists for the current month and the next
+    `months_ahead` months. Rows that already landed in the default partition
+    for a new month are moved into it. Returns the names created.
+    """
+    current = month_start(now or datetime.now(timezone.utc))
+    existing = monthly_partitions()
+    created = []
+    for n in range(months_ahead + 1):
+        month = add_months(current, n)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        _create_partition(name, month, add_months(month, 1))
+        db.session.commit()
+        created.append(name)
+    return created
+
+
+def _create_partition(name: str, lower: datetime, upper: datetime):
+    bounds = {"lower": lower, "upper": upper}
+    in_range = "time_slot >= :lower AND time_slot < :upper"
+    stray = db.session.execute(
+        text(f"SELECT count(*) FROM {DEFAULT_PARTITION} WHERE {in_range}"), bounds
+    ).scalar()
+    ddl = (
+        f"CREATE TABLE {name} PARTITION OF {PARENT} "
+        f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+    )
+    if not stray:
+        db.session.execute(text(ddl))
+        return
+
+    # Postgres refuses a new partition while the default one holds matching
+    # rows, so the default is detached for the move (all in one transaction).
+    db.session.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {DEFAULT_PARTITION}"))
+    db.session.execute(text(ddl))
+    db.session.execute(text(
+        f"INSERT INTO {PARENT} (id, customer_id, time_slot, table_number, created_at) "
+        f"SELECT id, customer_id, time_slot, table_number, created_at FROM {DEFAULT_PARTITION} WHERE {in_range}"
+    ), bounds)
+    db.session.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}"), bounds)
+    db.session.execute(text(f"ALTER TABLE {PARENT} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+
+
+def archive_partitions(
+    retention_months: int,
+    archive_dir: str,
+    keep_table: bool = False,
+    now: datetime | None = None,
+) -> list[tuple[str, str, int]]:
+    """
+    Archives every monthly partition that ended more than `retention_months`
+    months ago to <archive_dir>/<partition>.csv.gz, then detaches it and,
+    unless `keep_table` is set, drops it; detached tables stay queryable by
+    name. Each partition is handled in one transaction that also holds a lock
+    on it, so a failed write leaves it attached and unchanged. Returns
+    (partition, path, rows) per archive.
+    """
+    cutoff = add_months(month_start(now or datetime.now(timezone.utc)), -retention_months)
+    os.makedirs(archive_dir, exist_ok=True)
+    archived = []
+    for name, month in sorted(monthly_partitions().items(), key=lambda item: item[1]):
+        upper = add_months(month, 1)
+        if upper > cutoff:
+            break
+        path = os.path.join(archive_dir, f"{name}.csv.gz")
+        try:
+            # Late writes would miss the archive; the lock holds them off.
+            db.session.execute(text(f"LOCK TABLE {name} IN SHARE MODE"))
+            rows = _copy_to_gzip(name, path)
+            db.session.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+            # Ledger rows for archived slots would otherwise outlive their bookings.
+            db.session.query(SlotCapacity).filter(
+                SlotCapacity.time_slot >= month, SlotCapacity.time_slot < upper
+            ).delete(synchronize_session=False)
+            if not keep_table:
+                db.session.execute(text(f"DROP TABLE {name}"))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        archived.append((name, path, rows))
+    return archived
+
+
+def _copy_to_gzip(table: str, path: str) -> int:
+    """COPYs `table` to a gzipped CSV on the session's connection, inside its transaction."""
+    tmp = path + ".tmp"
+    try:
+        with db.session.connection().connection.cursor() as cur, gzip.open(tmp, "wb") as out:
+            cur.copy_expert(f"COPY {table} TO STDOUT WITH (FORMAT csv, HEADER)", out)
+            rows = cur.rowcount
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    # Only a complete archive takes the final name.
+    os.replace(tmp, path)
+    return rows
@@ -0,0 +1,102 @@
+"""
+Statements behind the availability, booking and admin views. They are built
+here so tests/test_query_plans.py EXPLAINs exactly what the views run. All
+times are naive UTC values from db_utc_naive.
+"""
+from datetime import datetime
+from sqlalchemy import Select, func, select, tuple_
+from .models import Customer, Reservation
+
+
+def slot_tables(slot: datetime) -> Select:
+    """Booked table numbers of one slot (availability, single booking)."""
+    return select(Reservation.table_number).where(Reservation.time_slot == slot)
+
+
+def slots_tables(slots) -> Select:
+    """(time_slot, table_number) for several slots (batch and queued bookings)."""
+    return select(Reservation.time_slot, Reservation.table_number).where(Reservation.time_slot.in_(slots))
+
+
+def range_counts(start: datetime, end: datetime) -> Select:
+    """Bookings per slot in [start, end) (availability range without the ledger)."""
+    return (
+        select(Reservation.time_slot, func.count())
+        .where(Reservation.time_slot >= start, Reservation.time_slot < end)
+        .group_by(Reservation.time_slot)
+    )
+
+
+def customer_by_email(email: str) -> Select:
+    """The customer with a lower-cased `email`, by the unique email index."""
+    return select(Customer).where(Customer.email == email)
+
+
+def admin_day(start: datetime, end: datetime, customer_email: str | None = None, columns=(Reservation, Customer)) -> Select:
+    """`columns` (by default (Reservation, Customer) rows) of the admin list for [start, end)."""
+    q = (
+        select(*columns)
+        .select_from(Reservation)
+        .join(Customer, Reservation.customer_id == Customer.id)
+        .where(Reservation.time_slot >= start, Reservation.time_slot < end)
+    )
+    if customer_email:
+        # Emails are stored lower-cased, so equality keeps the unique index usable.
+        q = q.where(Customer.email == customer_email)
+    return q
+
+
+def admin_day_count(start: datetime, end: datetime, customer_email: str | None = None) -> Select:
+    return admin_day(start, end, customer_email, columns=(func.count(),))
+
+
+def admin_page(
+    start: datetime,
+    end: datetime,
+    customer_email: str | None = None,
+    after: tuple[datetime, int] | None = None,
+    page_size: int = 20,
+    offset: int = 0,
+    include_total: bool = True,
+) -> Select:
+    """
+    One page of admin_day plus one extra row, ordered by (time_slot,
+    table_number). `after` is a keyset cursor; without one the page starts at
+    `offset`. With include_total, a third column carries the day's total.
+    """
+    q = admin_day(start, end, customer_email)
+    # The total rides along in the page query: a window count in offset
+    # mode, a scalar subquery over the whole filtered day in cursor mode.
+    if include_total and after:
+        total = admin_day_count(start, end, customer_email).scalar_subquery().correlate(None)
+        q = q.add_columns(total.label("total"))
+    elif include_total:
+        q = q.add_columns(func.count().over().label("total"))
+
+    if after:
+        # Row comparison, so the (time_slot, table_number) index bounds the scan.
+        q = q.where(tuple_(Reservation.time_slot, Reservation.table_number) > tuple_(*after))
+
+    q = q.order_by(Reservation.time_slot.asc(), Reservation.table_number.asc()).limit(page_size + 1)
+    if not after:
+        q = q.offset(offset)
+    return q
+
+
+def customer_page(
+    customer_id: int,
+    since: datetime | None = None,
+    after: tuple[datetime, int] | None = None,
+    page_size: int = 20,
+) -> Select:
+    """
+    One page of a customer's reservations plus one extra row, oldest first.
+    (customer_id, time_slot, id) serves the range, the keyset bound and the
+    order without a sort.
+    """
+    q = select(Reservation).where(Reservation.customer_id == customer_id)
+    if since is not None:
+        q = q.where(Reservation.time_slot >= since)
+    if after:
+        q = q.where(tuple_(Reservation.time_slot, Reservation.id) > tuple_(*after))
+    return q.order_by(Reservation.time_slot.asc(), Reservation.id.asc()).limit(page_size + 1)
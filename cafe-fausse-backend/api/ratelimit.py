@@ -0,0 +1,269 @@
+import math
+import sqlite3
+import threading
+import time
+from functools import wraps
+from flask import current_app, request
+from .http import jerror
+
+try:
+    from redis.exceptions import WatchError
+except ImportError:  # redis is optional; only needed for the redis backend
+    class WatchError(Exception):
+        pass
+
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_rate(spec: str) -> tuple[int, int]:
+    """Parses '12/minute' or '12/60' into (limit, window_seconds)."""
+    limit, _, period = spec.partition("/")
+    period = period.strip().lower().rstrip("s") or "minute"
+    window = _PERIODS[period] if period in _PERIODS else int(period)
+    return int(limit), window
+
+
+# --- Algorithms -------------------------------------------------------------
+# Each algorithm turns the stored state string (or None) into a new state and
+# an (allowed, retry_after_seconds) result. Backends apply it atomically.
+
+class SlidingWindow:
+    """Sliding-window counter: weights the previous fixed window by its overlap."""
+
+    def __init__(self, limit: int, window: int):
+        self.limit = limit
+        self.window = window
+        self.ttl = 2 * window
+
+    def __call__(self, state: str | None, now: float):
+        idx = int(now // self.window)
+        cur = prev = 0
+        if state:
+            w, c, p = (int(x) for x in state.split(":"))
+            if w == idx:
+                cur, prev = c, p
+            elif w == idx - 1:
+                prev = c
+
+        elapsed = (now % self.window) / self.window
+        allowed = prev * (1 - elapsed) + cur + 1 <= self.limit
+        if allowed:
+            cur += 1
+        retry_after = 0.0 if allowed else self.window - (now % self.window)
+        return f"{idx}:{cur}:{prev}", (allowed, retry_after)
+
+
+class TokenBucket:
+    """Bucket of `limit` tokens refilled evenly over `window` seconds."""
+
+    def __init__(self, limit: int, window: int):
+        self.limit = limit
+        self.rate = limit / window
+        self.ttl = window
+
+    def __call__(self, state: str | None, now: float):
+        tokens = float(self.limit)
+        if state:
+            t, ts = state.split(":")
+            tokens = min(self.limit, float(t) + (now - float(ts)) * self.rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        retry_after = 0.0 if allowed else (1 - tokens) / self.rate
+        return f"{tokens:.6f}:{now:.6f}", (allowed, retry_after)
+
+
+ALGORITHMS = {"sliding_window": SlidingWindow, "token_bucket": TokenBucket}
+
+
+# --- Backends ---------------------------------------------------------------
+# A backend exposes update(key, fn, ttl): atomically read the state for `key`,
+# store fn(state)[0] for `ttl` seconds and return fn(state)[1].
+
+class MemoryBackend:
+    """Per-process store guarded by a lock; expired keys are swept periodically."""
+
+    def __init__(self, sweep_interval: float = 60.0):
+        self._data: dict[str, tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        self._sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+
+    def update(self, key: str, fn, ttl: float):
+        now = time.time()
+        with self._lock:
+            if now >= self._next_sweep:
+                self._data = {k: v for k, v in self._data.items() if v[1] > now}
+                self._next_sweep = now + self._sweep_interval
+            entry = self._data.get(key)
+            state = entry[0] if entry and entry[1] > now else None
+            new_state, result = fn(state)
+            self._data[key] = (new_state, now + ttl)
+            return result
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteBackend:
+    """
+    Shares counters between worker processes on one host through a SQLite
+    file. Each update runs in a BEGIN IMMEDIATE transaction, which serialises
+    writers across processes.
+    """
+
+    def __init__(self, path: str, sweep_interval: float = 60.0):
+        self.path = path
+        self._local = threading.local()
+        self._sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def after_fork(self):
+        self._local = threading.local()
+
+    def update(self, key: str, fn, ttl: float):
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if now >= self._next_sweep:
+                conn.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (now,))
+                self._next_sweep = now + self._sweep_interval
+            row = conn.execute(
+                "SELECT value FROM rate_limits WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            new_state, result = fn(row[0] if row else None)
+            conn.execute(
+                "INSERT INTO rate_limits (key, value, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at",
+                (key, new_state, now + ttl),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+
+
+class RedisBackend:
+    """
+    Redis (or any client with the redis-py pipeline/WATCH API) backend.
+    Updates use optimistic WATCH/MULTI/EXEC and retry on conflicts.
+    """
+
+    def __init__(self, client, prefix: str = "ratelimit:", max_retries: int = 10):
+        self.client = client
+        self.prefix = prefix
+        self.max_retries = max_retries
+
+    @classmethod
+    def from_url(cls, url: str):
+        import redis
+        return cls(redis.Redis.from_url(url))
+
+    def update(self, key: str, fn, ttl: float):
+        key = self.prefix + key
+        for _ in range(self.max_retries):
+            with self.client.pipeline() as pipe:
+                try:
+                    pipe.watch(key)
+                    raw = pipe.get(key)
+                    state = raw.decode() if isinstance(raw, bytes) else raw
+                    new_state, result = fn(state)
+                    pipe.multi()
+                    pipe.set(key, new_state, ex=max(1, math.ceil(ttl)))
+                    pipe.execute()
+                    return result
+                except WatchError:
+                    continue
+        raise RuntimeError(f"Rate limit update for {key!r} kept conflicting.")
+
+
+def make_backend(name: str, url: str | None):
+    if name == "memory":
+        return MemoryBackend()
+    if name == "sqlite":
+        return SQLiteBackend(url or "ratelimit.sqlite3")
+    if name == "redis":
+        if not url:
+            raise ValueError("RATELIMIT_STORAGE_URL is required for the redis rate limit backend.")
+        return RedisBackend.from_url(url)
+    raise ValueError(f"Unknown rate limit backend {name!r}; expected memory, sqlite or redis.")
+
+
+# --- Flask integration ------------------------------------------------------
+
+def client_ip() -> str:
+    fwd = request.headers.get("X-Forwarded-For")
+    return (fwd.split(",")[0].strip() if fwd else request.remote_addr or "0.0.0.0")
+
+
+class RateLimiter:
+    """Applies the per-route rules from RATELIMIT_RULES, keyed by client IP."""
+
+    def __init__(self):
+        self.enabled = True
+        self.backend = None
+        self.rules = {}
+
+    def init_app(self, app, backend=None):
+        self.enabled = app.config["RATELIMIT_ENABLED"]
+        self.backend = backend or make_backend(
+            app.config["RATELIMIT_BACKEND"], app.config["RATELIMIT_STORAGE_URL"]
+        )
+        algorithm = ALGORITHMS[app.config["RATELIMIT_ALGORITHM"]]
+        self.rules = {
+            name: algorithm(*parse_rate(spec))
+            for name, spec in app.config["RATELIMIT_RULES"].items()
+            if spec
+        }
+        app.extensions["ratelimiter"] = self
+
+    def after_fork(self):
+        """Drops backend handles inherited from a pre-fork master process."""
+        reset = getattr(self.backend, "after_fork", None)
+        if reset:
+            reset()
+
+    def hit(self, rule: str, identity: str) -> tuple[bool, float]:
+        """Counts one request against `rule` for `identity`; returns (allowed, retry_after)."""
+        algorithm = self.rules.get(rule)
+        if not self.enabled or algorithm is None:
+            return True, 0.0
+        now = time.time()
+        return self.backend.update(f"{rule}:{identity}", lambda state: algorithm(state, now), algorithm.ttl)
+
+    def limit(self, rule: str):
+        def decorator(view):
+            @wraps(view)
+            def wrapped(*args, **kwargs):
+                try:
+                    allowed, retry_after = self.hit(rule, client_ip())
+                except Exception:
+                    # A broken shared store must not take bookings down with it.
+                    current_app.logger.exception("Rate limit backend failed; allowing request.")
+                    allowed, retry_after = True, 0.0
+                if not allowed:
+                    response, status = jerror(429, "RATE_LIMITED", "Too many requests. Try again shortly.")
+                    response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+                    return response, status
+                return view(*args, **kwargs)
+            return wrapped
+        return decorator
+
+
+limiter = RateLimiter()
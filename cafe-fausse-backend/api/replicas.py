@@ -0,0 +1,105 @@
+import itertools
+import time
+from functools import wraps
+from flask import current_app, g, request
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from .extensions import db
+
+REPLICA_BIND_PREFIX = "replica_"
+PIN_COOKIE = "cf_primary_until"
+_SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Seconds the replica's replay trails the primary; 0 when it has replayed all it received.
+_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class ReplicaRouter:
+    """
+    Sends the SELECTs of read-only views to a replica bind (replica_0,
+    replica_1, ... from DATABASE_REPLICA_URLS), round-robin over the replicas
+    whose replication lag is within REPLICA_MAX_LAG_SECONDS. A successful
+    write sets a cookie that keeps the client on the primary for
+    REPLICA_PIN_SECONDS, so it reads its own booking back. Without replicas
+    every read goes to the primary.
+    """
+
+    def __init__(self):
+        self.binds: list[str] = []
+        self.max_lag = 5.0
+        self.check_interval = 1.0
+        self.pin_seconds = 10
+        self._lag: dict[str, tuple[float | None, float]] = {}
+        self._turn = itertools.count()
+
+    def init_app(self, app):
+        binds = app.config.get("SQLALCHEMY_BINDS") or {}
+        self.binds = sorted(k for k in binds if k and k.startswith(REPLICA_BIND_PREFIX))
+        self.max_lag = app.config["REPLICA_MAX_LAG_SECONDS"]
+        self.check_interval = app.config["REPLICA_LAG_CHECK_SECONDS"]
+        self.pin_seconds = app.config["REPLICA_PIN_SECONDS"]
+        self._lag = {}
+        app.after_request(self._after_request)
+        app.extensions["replicas"] = self
+
+    def read_only(self, view):
+        """Marks a view whose queries may run on a replica."""
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            g.db_replica = self.choose()
+            return view(*args, **kwargs)
+        return wrapped
+
+    def choose(self) -> str | None:
+        """Bind key of the replica to read from, or None for the primary."""
+        if not self.binds or self.pinned():
+            return None
+        fresh = [key for key in self.binds if self._fresh(key)]
+        if not fresh:
+            return None
+        return fresh[next(self._turn) % len(fresh)]
+
+    def pinned(self) -> bool:
+        try:
+            return float(request.cookies.get(PIN_COOKIE, "")) > time.time()
+        except ValueError:
+            return False
+
+    def lag(self, key: str) -> float | None:
+        """Replication lag of a replica in seconds, or None when it cannot be reached."""
+        engine = db.engines[key]
+        if engine.dialect.name != "postgresql":
+            return 0.0
+        try:
+            with engine.connect() as conn:
+                return float(conn.execute(_LAG_SQL).scalar() or 0)
+        except SQLAlchemyError:
+            current_app.logger.warning("Replica %s is unreachable; reading from the primary.", key)
+            return None
+
+    def _fresh(self, key: str) -> bool:
+        # Lag is sampled at most once per check interval per replica.
+        now = time.monotonic()
+        lag, checked_at = self._lag.get(key, (None, float("-inf")))
+        if now - checked_at >= self.check_interval:
+            lag = self.lag(key)
+            self._lag[key] = (lag, now)
+        return lag is not None and lag <= self.max_lag
+
+    def _after_request(self, response):
+        if self.binds and request.method not in _SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                PIN_COOKIE,
+                f"{time.time() + self.pin_seconds:.0f}",
+                max_age=self.pin_seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+replicas = ReplicaRouter()
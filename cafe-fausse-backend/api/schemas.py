@@ -1,23 +1,22 @@
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from dataclasses import dataclass
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, ValidationError, ValidationInfo, field_validator
 from datetime import datetime
+from .utils.time import utc_iso_z
+from .utils.calendar import BUSINESS_HOURS, current_calendar
 
 
-BUSINESS_HOURS = {
-    0: (17, 22), 
-    1: (17, 22),
-    2: (17, 22),
-    3: (17, 22),
-    4: (17, 22),
-    5: (17, 22),
-    6: (17, 20), 
-}
+class _Request(BaseModel):
+    # Validators (and email_validator) are built on first use or by
+    # build_validators(), not at import, so CLI commands skip the cost.
+    model_config = ConfigDict(defer_build=True)
 
-class SubscribeRequest(BaseModel):
+
+class SubscribeRequest(_Request):
     name: str = Field(..., min_length=1, max_length=120, strip_whitespace=True)
     email: EmailStr
     phone: str | None = Field(None, max_length=32, strip_whitespace=True)
 
-class CreateReservationRequest(BaseModel):
+class CreateReservationRequest(_Request):
     time: datetime
     guests: int = Field(..., gt=0, le=10)
     name: str = Field(..., min_length=1, max_length=120, strip_whitespace=True)
@@ -26,19 +25,61 @@ class CreateReservationRequest(BaseModel):
 
     @field_validator('time')
     @classmethod
-    def validate_reservation_time(cls, v: datetime):
-
-        if v.astimezone() <= datetime.now().astimezone():
-            raise ValueError('Reservation time must be in the future.')
-        
-        weekday = v.weekday()
-        request_hour = v.hour
-        
-        if weekday not in BUSINESS_HOURS:
-            raise ValueError('Reservations are not available on this day.')
-            
-        open_hour, last_booking_hour = BUSINESS_HOURS[weekday]
-        if not (open_hour <= request_hour <= last_booking_hour):
-            raise ValueError(f'Reservations are only accepted between {open_hour}:00 and {last_booking_hour}:59 on this day.')
-            
-        return v
\ No newline at end of file
+    def validate_reservation_time(cls, v: datetime, info: ValidationInfo):
+        # Batches pass SKIP_CALENDAR and check every time at once (check_many).
+        if info.context and info.context.get("skip_calendar"):
+            return v
+        error = current_calendar().check(v)
+        if error:
+            raise ValueError(error)
+        return v
+
+
+SKIP_CALENDAR = {"skip_calendar": True}
+
+
+def time_error(value, message: str) -> ValidationError:
+    """The ValidationError CreateReservationRequest raises for a calendar `message` on `value`."""
+    return ValidationError.from_exception_data(CreateReservationRequest.__name__, [
+        {"type": "value_error", "loc": ("time",), "input": value, "ctx": {"error": ValueError(message)}},
+    ])
+
+
+def build_validators():
+    """Builds the request validators now rather than on the first request; safe to call again."""
+    for model in (SubscribeRequest, CreateReservationRequest):
+        model.model_rebuild()
+
+
+# Response rows. Field names are the JSON keys; the JSON provider serialises
+# these directly, without building a dict per row. They are plain rather
+# than slots dataclasses because orjson encodes those from __dict__, its
+# fastest path; slots rows serialise too, just more slowly.
+
+@dataclass
+class CustomerRow:
+    id: int
+    name: str
+    email: str
+    phone: str | None
+
+
+@dataclass
+class ReservationRow:
+    id: int
+    time: str
+    tableNumber: int
+    customer: CustomerRow
+
+    @classmethod
+    def from_models(cls, reservation, customer) -> "ReservationRow":
+        return cls(
+            reservation.id,
+            utc_iso_z(reservation.time_slot),
+            reservation.table_number,
+            CustomerRow(customer.id, customer.name, customer.email, customer.phone),
+        )
+
+    def csv_values(self) -> list:
+        c = self.customer
+        return [self.id, self.time, self.tableNumber, c.id, c.name, c.email, c.phone]
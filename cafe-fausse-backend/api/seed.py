@@ -0,0 +1,116 @@
+import csv
+import io
+import random
+from datetime import date, datetime, timedelta, timezone
+from flask import current_app
+from sqlalchemy import select, text
+from .extensions import db
+from .ledger import ledger
+from .models import Customer, Reservation, SlotCapacity
+from .utils.calendar import current_calendar
+from .utils.time import db_utc_naive
+
+
+def customer_rows(count: int, rng: random.Random):
+    for i in range(1, count + 1):
+        yield {
+            "name": f"Customer {i}",
+            "email": f"customer{i}@example.com",
+            "phone": f"123-555-{i:04d}",
+            "newsletter_opt_in": rng.random() < 0.3,
+        }
+
+
+def reservation_rows(customer_ids: list[int], start: date, days: int, occupancy: float, rng: random.Random):
+    """
+    Books each table of each bookable calendar slot with probability `occupancy`.
+    Tables are sampled without replacement per slot, so (time_slot,
+    table_number) stays unique.
+    """
+    calendar = current_calendar()
+    tables = range(1, current_app.config["TOTAL_TABLES"] + 1)
+    for offset in range(days):
+        for slot_utc in calendar.day_slots(start + timedelta(days=offset)):
+            slot = db_utc_naive(slot_utc)
+            booked = sum(rng.random() < occupancy for _ in tables)
+            for table_number in sorted(rng.sample(tables, booked)):
+                yield {
+                    "customer_id": customer_ids[rng.randrange(len(customer_ids))],
+                    "time_slot": slot,
+                    "table_number": table_number,
+                }
+
+
+def bulk_insert(table, rows, batch_size: int) -> int:
+    """Loads `rows` (dicts) in batches: COPY on Postgres, multi-row INSERTs elsewhere."""
+    copy = db.engine.dialect.name == "postgresql"
+    total = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            total += _flush(table, batch, copy)
+            batch = []
+    if batch:
+        total += _flush(table, batch, copy)
+    return total
+
+
+def _flush(table, batch: list[dict], copy: bool) -> int:
+    if not copy:
+        db.session.execute(table.insert(), batch)
+        return len(batch)
+
+    columns = list(batch[0])
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in batch:
+        # Naive datetimes are UTC; say so, or timestamptz reads them in the session zone.
+        writer.writerow(
+            v.replace(tzinfo=timezone.utc).isoformat() if isinstance(v, datetime) else v
+            for v in (row[c] for c in columns)
+        )
+    buf.seek(0)
+    cursor = db.session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buf)
+    finally:
+        cursor.close()
+    return len(batch)
+
+
+def clear_data():
+    if db.engine.dialect.name == "postgresql":
+        # Restarting the sequences keeps ids identical between runs with the same seed.
+        db.session.execute(text("TRUNCATE reservations, customers, slot_capacity RESTART IDENTITY CASCADE"))
+    else:
+        db.session.query(Reservation).delete()
+        db.session.query(Customer).delete()
+        db.session.query(SlotCapacity).delete()
+
+
+def seed(customers: int, days: int, occupancy: float, rng_seed: int, start: date, batch_size: int) -> tuple[int, int]:
+    """Replaces all customers and reservations with generated data. Returns (customers, reservations)."""
+    rng = random.Random(rng_seed)
+    clear_data()
+
+    if db.engine.dialect.name == "postgresql":
+        from .partitions import create_partitions, month_start
+        first = month_start(datetime(start.year, start.month, start.day))
+        last = month_start(datetime.combine(start + timedelta(days=days), datetime.min.time()))
+        months = (last.year - first.year) * 12 + last.month - first.month
+        create_partitions(months, now=first)
+
+    n_customers = bulk_insert(Customer.__table__, customer_rows(customers, rng), batch_size)
+    customer_ids = db.session.execute(select(Customer.id).order_by(Customer.id)).scalars().all()
+    n_reservations = bulk_insert(
+        Reservation.__table__, reservation_rows(customer_ids, start, days, occupancy, rng), batch_size
+    )
+    ledger.backfill()
+    db.session.commit()
+
+    if db.engine.dialect.name == "postgresql":
+        db.session.execute(text("ANALYZE customers"))
+        db.session.execute(text("ANALYZE reservations"))
+        db.session.commit()
+    return n_customers, n_reservations
@@ -0,0 +1,73 @@
+import dataclasses
+from datetime import datetime
+from flask.json.provider import DefaultJSONProvider
+from .utils.time import utc_iso_z
+
+try:
+    import orjson
+except ImportError:  # optional; StdlibJSONProvider is used instead
+    orjson = None
+
+JSON_BACKENDS = ("auto", "orjson", "stdlib")
+
+
+def _default(o):
+    if isinstance(o, datetime):
+        return utc_iso_z(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        # Shallow, unlike dataclasses.asdict; nested rows come back through here.
+        if hasattr(o, "__dict__"):
+            return o.__dict__
+        return {f.name: getattr(o, f.name) for f in dataclasses.fields(o)}
+    return DefaultJSONProvider.default(o)
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """Flask's json encoder, with datetimes written as ISO 8601 UTC like api_iso_z."""
+
+    default = staticmethod(_default)
+
+
+class OrjsonProvider(StdlibJSONProvider):
+    """
+    Encodes with orjson, which serialises dicts, lists and dataclass rows
+    (slots included) natively. Responses are built from its bytes directly.
+    Calls passing json.dumps/json.loads keyword arguments fall back to the
+    stdlib encoder.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._dumpb(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(self._dumpb(obj, pretty) + b"\n", mimetype=self.mimetype)
+
+    def _dumpb(self, obj, pretty: bool = False) -> bytes:
+        # Datetimes go through _default so both providers format them alike.
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+
+
+def init_app(app):
+    """Installs the JSON provider chosen by JSON_BACKEND: auto (orjson when installed), orjson or stdlib."""
+    backend = app.config["JSON_BACKEND"]
+    if backend not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON_BACKEND {backend!r}; expected one of {', '.join(JSON_BACKENDS)}.")
+    if backend == "orjson" and orjson is None:
+        raise ValueError("JSON_BACKEND=orjson needs the orjson package.")
+
+    use_orjson = orjson is not None and backend != "stdlib"
+    app.json = (OrjsonProvider if use_orjson else StdlibJSONProvider)(app)
@@ -0,0 +1,131 @@
+import csv
+import io
+import json
+from pydantic import ValidationError
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from .extensions import db
+from .models import Customer
+from .schemas import SubscribeRequest
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+
+def upsert_subscribers(rows: list[dict]) -> dict[str, int]:
+    """
+    Opts every row ({name, email, phone}) into the newsletter in one statement
+    and returns {email: customer_id}. Emails must be lower-cased and unique
+    within `rows`. Non-empty names and phones overwrite stored ones; empty
+    values keep what is there.
+    """
+    if not rows:
+        return {}
+    t = Customer.__table__
+    ins = pg_insert(t).values([
+        {"name": r["name"], "email": r["email"], "phone": r["phone"] or "", "newsletter_opt_in": True}
+        for r in rows
+    ])
+    stmt = ins.on_conflict_do_update(
+        index_elements=[t.c.email],
+        set_={
+            t.c.newsletter_opt_in: sa.true(),
+            t.c.name: sa.func.coalesce(sa.func.nullif(ins.excluded.name, ""), t.c.name),
+            t.c.phone: sa.func.coalesce(sa.func.nullif(ins.excluded.phone, ""), t.c.phone),
+        },
+    ).returning(t.c.id, t.c.email)
+    return {email: customer_id for customer_id, email in db.session.execute(stmt)}
+
+
+def read_records(stream, fmt: str):
+    """
+    Yields (line, record) from a binary stream of CSV (with a header row) or
+    NDJSON, one row at a time. `record` is a dict, or None when the line could
+    not be parsed. Blank lines are skipped.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for record in reader:
+            if not any(v for v in record.values() if isinstance(v, str)):
+                continue
+            record.pop(None, None)
+            yield reader.line_num, record
+        return
+
+    for line, raw in enumerate(text, start=1):
+        if not raw.strip():
+            continue
+        try:
+            record = json.loads(raw)
+        except ValueError:
+            record = None
+        yield line, record if isinstance(record, dict) else None
+
+
+class ImportReport:
+    """Running totals for a bulk import; keeps at most `max_errors` error rows."""
+
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+        self.received = 0
+        self.subscribed = 0
+        self.failed = 0
+        self.errors: list[dict] = []
+
+    def error(self, line: int, code: str, message: str, details=None):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            entry = {"line": line, "code": code, "message": message}
+            if details:
+                entry["details"] = details
+            self.errors.append(entry)
+
+    def as_dict(self) -> dict:
+        return {
+            "received": self.received,
+            "subscribed": self.subscribed,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errorsTruncated": self.failed > len(self.errors),
+        }
+
+
+def import_subscribers(records, chunk_size: int, max_errors: int) -> ImportReport:
+    """
+    Validates `records` (from read_records) with SubscribeRequest and upserts
+    them chunk by chunk, committing after each chunk. Rows repeating an email
+    within a chunk are merged, later non-empty values winning.
+    """
+    report = ImportReport(max_errors)
+    chunk: dict[str, dict] = {}
+
+    def flush():
+        if chunk:
+            upsert_subscribers(list(chunk.values()))
+            db.session.commit()
+            chunk.clear()
+
+    for line, record in records:
+        report.received += 1
+        if record is None:
+            report.error(line, "INVALID_ROW", "Row could not be parsed.")
+            continue
+        try:
+            data = SubscribeRequest.model_validate(record)
+        except ValidationError as e:
+            report.error(line, "VALIDATION_ERROR", "Invalid input.", e.errors(include_context=False))
+            continue
+
+        email = data.email.lower()
+        previous = chunk.get(email)
+        if previous is None:
+            report.subscribed += 1
+        chunk[email] = {
+            "name": data.name or (previous or {}).get("name", ""),
+            "email": email,
+            "phone": data.phone or (previous or {}).get("phone", ""),
+        }
+        if len(chunk) >= chunk_size:
+            flush()
+    flush()
+    return report
@@ -0,0 +1,174 @@
+import time
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from zoneinfo import ZoneInfo
+from flask import current_app, has_app_context
+
+# Weekday -> (opening hour, last hour a booking may start in), local time.
+BUSINESS_HOURS = {
+    0: (17, 22),
+    1: (17, 22),
+    2: (17, 22),
+    3: (17, 22),
+    4: (17, 22),
+    5: (17, 22),
+    6: (17, 20),
+}
+
+PAST_TIME = "Reservation time must be in the future."
+CLOSED_DAY = "Reservations are not available on this day."
+
+
+def _hours_message(hours: tuple[int, int]) -> str:
+    return f"Reservations are only accepted between {hours[0]}:00 and {hours[1]}:59 on this day."
+
+
+class SlotCalendar:
+    """
+    Bookable slots per day from BUSINESS_HOURS, with closures (whole days
+    off) and overrides (different hours on a given date). Hours are read in
+    `tz`; without one, in the offset each time was submitted with (UTC for
+    naive times), for check() and slots() alike (see local_zone). Slots are
+    returned as aware UTC datetimes on the round_to_slot grid.
+    Each day is computed once and cached; the first `horizon_days` are built
+    up front.
+    """
+
+    def __init__(
+        self,
+        slot_minutes: int = 30,
+        business_hours: dict[int, tuple[int, int]] | None = None,
+        closures=(),
+        overrides: dict[date, tuple[int, int]] | None = None,
+        tz: str | None = None,
+        horizon_days: int = 0,
+    ):
+        self.slot_seconds = slot_minutes * 60
+        self.business_hours = BUSINESS_HOURS if business_hours is None else business_hours
+        self.closures = frozenset(closures)
+        self.overrides = dict(overrides or {})
+        self.zone = tz or None
+        self.tz = timezone.utc if self.zone in (None, "UTC") else ZoneInfo(self.zone)
+        self._days: dict[tuple[date, tzinfo], tuple[datetime, ...]] = {}
+        today = datetime.now(self.tz).date()
+        for offset in range(horizon_days):
+            self.day_slots(today + timedelta(days=offset))
+
+    @classmethod
+    def from_config(cls, config) -> "SlotCalendar":
+        return cls(
+            slot_minutes=config["SLOT_MINUTES"],
+            closures=parse_closures(config["CALENDAR_CLOSURES"]),
+            overrides=parse_overrides(config["CALENDAR_OVERRIDES"]),
+            tz=config["BUSINESS_TIMEZONE"] or None,
+            horizon_days=config["CALENDAR_HORIZON_DAYS"],
+        )
+
+    def hours(self, day: date) -> tuple[int, int] | None:
+        if day in self.closures:
+            return None
+        if day in self.overrides:
+            return self.overrides[day]
+        return self.business_hours.get(day.weekday())
+
+    def local_zone(self, dt: datetime) -> tzinfo:
+        """Zone business hours apply in for `dt`: `tz` if set, else dt's own offset."""
+        if self.zone:
+            return self.tz
+        return dt.tzinfo or timezone.utc
+
+    def day_slots(self, day: date, tz: tzinfo | None = None) -> tuple[datetime, ...]:
+        """Bookable slot starts on `day` in `tz` (default: this calendar's), in order."""
+        tz = tz or self.tz
+        slots = self._days.get((day, tz))
+        if slots is None:
+            hours = self.hours(day)
+            slots = ()
+            if hours:
+                first = datetime(day.year, day.month, day.day, hours[0], tzinfo=tz)
+                end = datetime(day.year, day.month, day.day, tzinfo=tz) + timedelta(hours=hours[1] + 1)
+                step = self.slot_seconds
+                start_ts = int(first.timestamp())
+                slots = tuple(
+                    datetime.fromtimestamp(ts, timezone.utc)
+                    for ts in range(start_ts, int(end.timestamp()), step)
+                    if ts % step == 0
+                )
+            if len(self._days) >= 4096:
+                self._days.clear()
+            self._days[(day, tz)] = slots
+        return slots
+
+    def slots(self, start: datetime, end: datetime, tz: tzinfo | None = None) -> list[datetime]:
+        """Bookable slot starts in [start, end), with hours in `tz` (default: local_zone(start))."""
+        start, end = _utc(start), _utc(end)
+        tz = tz or self.local_zone(start)
+        day = start.astimezone(tz).date()
+        last = end.astimezone(tz).date()
+        found = []
+        while day <= last:
+            found.extend(s for s in self.day_slots(day, tz) if start <= s < end)
+            day += timedelta(days=1)
+        return found
+
+    def round(self, dt: datetime) -> datetime:
+        """round_to_slot with this calendar's slot length, as epoch arithmetic."""
+        ts = int(_utc(dt).timestamp())
+        day_start = ts - ts % 86400
+        return datetime.fromtimestamp(day_start + (ts - day_start) // self.slot_seconds * self.slot_seconds, timezone.utc)
+
+    def round_many(self, values) -> list[datetime]:
+        return [self.round(v) for v in values]
+
+    def check(self, dt: datetime, now: float | None = None) -> str | None:
+        """Why `dt` cannot be booked, or None if it can."""
+        dt = _utc(dt)
+        if dt.timestamp() <= (time.time() if now is None else now):
+            return PAST_TIME
+        local = dt.astimezone(self.local_zone(dt))
+        hours = self.hours(local.date())
+        if not hours:
+            return CLOSED_DAY
+        if not hours[0] <= local.hour <= hours[1]:
+            return _hours_message(hours)
+        return None
+
+    def check_many(self, values, now: float | None = None) -> list[str | None]:
+        """check() over many timestamps with one clock read."""
+        now = time.time() if now is None else now
+        return [self.check(v, now) for v in values]
+
+
+def _utc(dt: datetime) -> datetime:
+    # Naive values are UTC, as in round_to_slot.
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+
+def parse_closures(raw: str) -> set[date]:
+    """'2025-12-25,2026-01-01' -> dates."""
+    return {date.fromisoformat(part.strip()) for part in raw.split(",") if part.strip()}
+
+
+def parse_overrides(raw: str) -> dict[date, tuple[int, int]]:
+    """'2025-12-24=17-20,...' -> {date: (open hour, last hour)}."""
+    overrides = {}
+    for part in raw.split(","):
+        if not part.strip():
+            continue
+        day, hours = part.split("=")
+        open_hour, last_hour = hours.split("-")
+        overrides[date.fromisoformat(day.strip())] = (int(open_hour), int(last_hour))
+    return overrides
+
+
+_fallback = SlotCalendar()
+
+
+def init_app(app):
+    app.extensions["slot_calendar"] = SlotCalendar.from_config(app.config)
+
+
+def current_calendar() -> SlotCalendar:
+    """The app's calendar, or plain BUSINESS_HOURS outside an app context."""
+    if has_app_context():
+        return current_app.extensions.get("slot_calendar", _fallback)
+    return _fallback
@@ -0,0 +1,14 @@
+import base64
+from datetime import datetime
+from .time import db_utc_naive
+
+def encode_cursor(ts: datetime, key: int) -> str:
+    """Encodes a (timestamp, integer tiebreaker) keyset position as an opaque URL-safe token."""
+    raw = f"{db_utc_naive(ts).isoformat()}|{key}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(token: str) -> tuple[datetime, int]:
+    """Inverse of encode_cursor; raises ValueError on malformed input."""
+    padded = token + "=" * (-len(token) % 4)
+    ts_str, key = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+    return datetime.fromisoformat(ts_str), int(key)
@@ -0,0 +1,23 @@
+import os
+
+# Kept apart from api.config so gunicorn.conf.py can size workers without
+# evaluating Config before it has set the environment Config reads.
+
+
+def engine_options(uri: str) -> dict:
+    # SQLite keeps SQLAlchemy's own pool defaults; the knobs below are for Postgres.
+    if uri.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "5")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "10")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+    }
+
+
+def pool_connections(uri: str) -> int:
+    """Most connections one engine on `uri` holds (pool_size + max_overflow); 0 for SQLite."""
+    options = engine_options(uri)
+    return options.get("pool_size", 0) + options.get("max_overflow", 0)
@@ -1,4 +1,5 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 
 def parse_iso(s: str) -> datetime:
     """Parses an ISO 8601 string, handling 'Z' for UTC."""
@@ -29,4 +30,25 @@ def db_utc_naive(dt: datetime) -> datetime:
 
 def api_iso_z(dt: datetime) -> str:
     """Formats a datetime into an ISO 8601 string ending in 'Z' for API responses."""
-    return to_utc(dt).astimezone(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
\ No newline at end of file
+    return to_utc(dt).astimezone(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+@lru_cache(maxsize=4096)
+def utc_iso_z(dt: datetime) -> str:
+    """
+    api_iso_z for values already in UTC, such as naive datetimes read back from
+    the DB: a single isoformat call with no timezone conversions. Memoised,
+    since every booking in a slot shares its timestamp.
+    """
+    if dt.tzinfo is None:
+        return dt.isoformat(timespec="seconds") + "Z"
+    if dt.utcoffset():
+        return api_iso_z(dt)
+    return dt.replace(tzinfo=None).isoformat(timespec="seconds") + "Z"
+
+def iter_slots(start: datetime, end: datetime, minutes: int):
+    """Yields slot starts from `start` (inclusive) to `end` (exclusive) in steps of `minutes`."""
+    step = timedelta(minutes=minutes)
+    cur = start
+    while cur < end:
+        yield cur
+        cur += step
@@ -0,0 +1,5 @@
+from api.asgi import create_asgi_app
+from api.schemas import build_validators
+
+app = create_asgi_app()
+build_validators()
@@ -0,0 +1,311 @@
+"""
+Load-testing harness for the reservation and newsletter endpoints.
+
+Runs a weighted mix of availability polling, bookings (concentrated on a few
+hot slots so RACE_LOST/FULLY_BOOKED paths get exercised), newsletter upserts
+and admin listing, then reports latency percentiles, throughput and error
+code breakdowns per scenario.
+
+In-process against create_app() (uses DATABASE_URL, rate limiting off):
+    python -m benchmarks.loadtest --duration 30 --concurrency 16
+
+Against a running server:
+    python -m benchmarks.loadtest --url http://localhost:8000
+
+Baselines:
+    python -m benchmarks.loadtest --save-baseline benchmarks/baseline.json
+    python -m benchmarks.loadtest --compare benchmarks/baseline.json --tolerance 0.25
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+
+DEFAULT_MIX = "availability=60,availability_range=10,booking=15,newsletter=10,admin_list=5"
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of `samples` (pct in 0..100)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, min(len(ordered), math.ceil(pct / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def parse_mix(spec: str) -> dict[str, int]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = int(weight or 1)
+    unknown = set(mix) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Unknown scenarios in mix: {', '.join(sorted(unknown))}")
+    return mix
+
+
+# --- Clients ----------------------------------------------------------------
+
+class InProcessClient:
+    """Drives create_app() through Flask's test client; one instance per thread."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, params=None, json_body=None, headers=None):
+        r = self.client.open(path, method=method, query_string=params, json=json_body, headers=headers)
+        return r.status_code, r.get_json(silent=True)
+
+
+class HttpClient:
+    def __init__(self, base_url):
+        import requests
+        self.base_url = base_url.rstrip("/")
+        self.session = requests.Session()
+
+    def request(self, method, path, params=None, json_body=None, headers=None):
+        r = self.session.request(method, self.base_url + path, params=params, json=json_body, headers=headers, timeout=30)
+        try:
+            body = r.json()
+        except ValueError:
+            body = None
+        return r.status_code, body
+
+
+# --- Scenarios --------------------------------------------------------------
+# Each scenario issues one request and returns (status, body).
+
+def _iso(dt: datetime) -> str:
+    return dt.replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+class Workload:
+    def __init__(self, hot_slots: int, admin_token: str, rng: random.Random):
+        base = (datetime.now(timezone.utc) + timedelta(days=1)).replace(hour=19, minute=0, second=0, microsecond=0)
+        self.hot_slots = [base + timedelta(days=i // 2, minutes=30 * (i % 2)) for i in range(hot_slots)]
+        self.poll_slots = [base + timedelta(days=d, minutes=30 * m) for d in range(3) for m in range(-4, 4)]
+        self.admin_headers = {"Authorization": f"Bearer {admin_token}"}
+        self.rng = rng
+
+    def headers(self, extra=None):
+        # Spread virtual users over many client IPs so per-IP limits on a
+        # target server measure the service, not the limiter.
+        h = {"X-Forwarded-For": f"10.{self.rng.randrange(256)}.{self.rng.randrange(256)}.{self.rng.randrange(1, 255)}"}
+        if extra:
+            h.update(extra)
+        return h
+
+
+def scenario_availability(client, w: Workload):
+    slot = w.rng.choice(w.poll_slots)
+    return client.request("GET", "/api/reservations/availability", params={"time": _iso(slot)}, headers=w.headers())
+
+
+def scenario_availability_range(client, w: Workload):
+    start = w.rng.choice(w.poll_slots).replace(hour=17, minute=0)
+    params = {"from": _iso(start), "to": _iso(start + timedelta(hours=6))}
+    return client.request("GET", "/api/reservations/availability/range", params=params, headers=w.headers())
+
+
+def scenario_booking(client, w: Workload):
+    slot = w.rng.choice(w.hot_slots)
+    body = {
+        "time": _iso(slot),
+        "guests": w.rng.randint(1, 6),
+        "name": "Load Tester",
+        "email": f"load_{uuid.uuid4().hex[:12]}@example.com",
+    }
+    return client.request("POST", "/api/reservations", json_body=body, headers=w.headers())
+
+
+def scenario_newsletter(client, w: Workload):
+    # Half new subscribers, half repeat upserts of a small pool.
+    email = (
+        f"news_{uuid.uuid4().hex[:12]}@example.com"
+        if w.rng.random() < 0.5
+        else f"news_repeat_{w.rng.randrange(50)}@example.com"
+    )
+    return client.request("POST", "/api/newsletter", json_body={"name": "Load Tester", "email": email}, headers=w.headers())
+
+
+def scenario_admin_list(client, w: Workload):
+    day = w.rng.choice(w.hot_slots).date().isoformat()
+    params = {"date": day, "page": 1, "page_size": 50}
+    return client.request("GET", "/api/reservations", params=params, headers=w.headers(w.admin_headers))
+
+
+SCENARIOS = {
+    "availability": scenario_availability,
+    "availability_range": scenario_availability_range,
+    "booking": scenario_booking,
+    "newsletter": scenario_newsletter,
+    "admin_list": scenario_admin_list,
+}
+
+
+# --- Runner -----------------------------------------------------------------
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.outcomes: dict[str, Counter] = defaultdict(Counter)
+        self._lock = threading.Lock()
+
+    def record(self, scenario: str, elapsed_ms: float, status: int, body):
+        outcome = str(status)
+        if isinstance(body, dict) and body.get("code"):
+            outcome = f"{status} {body['code']}"
+        with self._lock:
+            self.latencies[scenario].append(elapsed_ms)
+            self.outcomes[scenario][outcome] += 1
+
+
+def run(make_client, mix: dict[str, int], concurrency: int, duration: float, max_requests: int | None,
+        hot_slots: int, admin_token: str, seed: int) -> dict:
+    recorder = Recorder()
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    deadline = time.perf_counter() + duration
+    issued = Counter()
+    issued_lock = threading.Lock()
+
+    def worker(idx: int):
+        rng = random.Random(seed + idx)
+        client = make_client()
+        workload = Workload(hot_slots, admin_token, rng)
+        while time.perf_counter() < deadline:
+            if max_requests is not None:
+                with issued_lock:
+                    if issued["total"] >= max_requests:
+                        return
+                    issued["total"] += 1
+            name = rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                status, body = SCENARIOS[name](client, workload)
+            except Exception as e:
+                status, body = 0, {"code": type(e).__name__}
+            recorder.record(name, (time.perf_counter() - start) * 1000, status, body)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+
+    scenarios = {}
+    for name, samples in recorder.latencies.items():
+        scenarios[name] = {
+            "count": len(samples),
+            "throughput_rps": round(len(samples) / wall, 2),
+            "p50_ms": round(percentile(samples, 50), 2),
+            "p95_ms": round(percentile(samples, 95), 2),
+            "p99_ms": round(percentile(samples, 99), 2),
+            "outcomes": dict(recorder.outcomes[name]),
+        }
+    total = sum(s["count"] for s in scenarios.values())
+    return {
+        "meta": {
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "concurrency": concurrency,
+            "wall_seconds": round(wall, 2),
+            "total_requests": total,
+            "throughput_rps": round(total / wall, 2) if wall else 0.0,
+            "mix": mix,
+        },
+        "scenarios": scenarios,
+    }
+
+
+def compare_to_baseline(report: dict, baseline: dict, tolerance: float, min_delta_ms: float = 1.0) -> list[str]:
+    """
+    Returns human-readable regressions: p95/p99 grown by more than `tolerance`
+    (a fraction) and by at least `min_delta_ms`, or throughput dropped by more
+    than `tolerance`.
+    """
+    regressions = []
+    for name, current in report["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        for key in ("p95_ms", "p99_ms"):
+            grew = current[key] - previous[key]
+            if previous[key] and grew >= min_delta_ms and current[key] > previous[key] * (1 + tolerance):
+                regressions.append(f"{name} {key}: {previous[key]} -> {current[key]}")
+        if previous["throughput_rps"] and current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name} throughput_rps: {previous['throughput_rps']} -> {current['throughput_rps']}")
+    return regressions
+
+
+def format_report(report: dict) -> str:
+    meta = report["meta"]
+    lines = [
+        f"{meta['total_requests']} requests in {meta['wall_seconds']}s "
+        f"({meta['throughput_rps']} req/s, concurrency {meta['concurrency']})",
+        f"{'scenario':<20}{'count':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}  outcomes",
+    ]
+    for name, s in sorted(report["scenarios"].items()):
+        outcomes = ", ".join(f"{k}: {v}" for k, v in sorted(s["outcomes"].items()))
+        lines.append(
+            f"{name:<20}{s['count']:>8}{s['throughput_rps']:>9}{s['p50_ms']:>9}{s['p95_ms']:>9}{s['p99_ms']:>9}  {outcomes}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Target a running server instead of an in-process app.")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Scenario weights (default: {DEFAULT_MIX}).")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds to run.")
+    parser.add_argument("--requests", type=int, help="Stop after this many requests.")
+    parser.add_argument("--hot-slots", type=int, default=2, help="Number of slots bookings contend for.")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save-baseline", help="Write the JSON report to this path.")
+    parser.add_argument("--compare", help="Baseline JSON to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed regression as a fraction.")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Ignore latency changes smaller than this.")
+    args = parser.parse_args(argv)
+
+    admin_token = os.getenv("ADMIN_TOKEN", "dev-admin-token")
+    if args.url:
+        make_client = lambda: HttpClient(args.url)
+    else:
+        os.environ.setdefault("RATELIMIT_ENABLED", "false")
+        from api.app import create_app
+        app = create_app()
+        make_client = lambda: InProcessClient(app)
+
+    report = run(make_client, parse_mix(args.mix), args.concurrency, args.duration, args.requests,
+                 args.hot_slots, admin_token, args.seed)
+    print(format_report(report))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print("Regressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Startup benchmark: how long a cold worker takes to import and build the app.
+
+Runs `python -X importtime` in a fresh interpreter, then reports the total
+import time, the modules with the most self time and the create_app() time.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 5 --budget-ms 1500
+
+With --budget-ms it exits 1 when the median total (imports plus create_app)
+exceeds the budget; tests/test_startup.py runs the same check.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET_MS = 1500.0
+
+# The marker line carries the create_app() time; importtime writes to stderr.
+_SCRIPT = (
+    "import time\n"
+    "from api.app import create_app\n"
+    "t = time.perf_counter()\n"
+    "create_app()\n"
+    "print('create_app_us', int((time.perf_counter() - t) * 1e6))\n"
+)
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$")
+
+
+def parse_importtime(output: str) -> list[tuple[str, int, int, int]]:
+    """`-X importtime` stderr -> [(module, self_us, cumulative_us, depth)]."""
+    rows = []
+    for line in output.splitlines():
+        m = _LINE.match(line)
+        if m:
+            rows.append((m.group(4), int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2))
+    return rows
+
+
+def measure(env: dict | None = None) -> dict:
+    """One cold start in a subprocess; times in milliseconds."""
+    env = {**os.environ, "RATELIMIT_ENABLED": "false", **(env or {})}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _SCRIPT],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    rows = parse_importtime(proc.stderr)
+    create_app_us = int(proc.stdout.split("create_app_us", 1)[1].split()[0])
+    slowest = sorted(rows, key=lambda r: r[1], reverse=True)
+    import_ms = sum(r[2] for r in rows if r[3] == 0) / 1000
+    return {
+        "import_ms": import_ms,
+        "create_app_ms": create_app_us / 1000,
+        "total_ms": import_ms + create_app_us / 1000,
+        "modules": [r[0] for r in rows],
+        "slowest": [(r[0], r[1] / 1000) for r in slowest[:10]],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="Cold starts to measure; the median is reported.")
+    parser.add_argument("--budget-ms", type=float, help=f"Fail above this median total (suggested: {DEFAULT_BUDGET_MS:.0f}).")
+    args = parser.parse_args(argv)
+
+    results = [measure() for _ in range(args.runs)]
+    total = statistics.median(r["total_ms"] for r in results)
+    last = results[-1]
+    print(f"imports      {statistics.median(r['import_ms'] for r in results):8.1f} ms")
+    print(f"create_app   {statistics.median(r['create_app_ms'] for r in results):8.1f} ms")
+    print(f"total        {total:8.1f} ms (median of {args.runs})")
+    print("Most self time:")
+    for name, ms in last["slowest"]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    if args.budget_ms is not None and total > args.budget_ms:
+        print(f"Startup {total:.1f} ms is over the {args.budget_ms:.0f} ms budget.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
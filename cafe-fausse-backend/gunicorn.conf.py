@@ -0,0 +1,67 @@
+"""
+Production serving config: gunicorn -c gunicorn.conf.py wsgi:app
+(or asgi:app with GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker)
+
+Every worker holds up to DB_POOL_SIZE + DB_MAX_OVERFLOW Postgres connections,
+so the default worker count (2 * CPUs + 1) is capped to fit
+DB_MAX_CONNECTIONS - DB_RESERVED_CONNECTIONS; an explicit WEB_CONCURRENCY
+beyond that is logged at startup. Threads share their worker's pool, so
+DB_POOL_SIZE close to GUNICORN_THREADS avoids waiting on checkouts.
+"""
+import multiprocessing
+import os
+from api.utils.pool import pool_connections
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+# uvicorn.workers.UvicornWorker serves asgi:app (see api/asgi.py).
+worker_class = os.getenv("GUNICORN_WORKER_CLASS") or ("gthread" if threads > 1 else "sync")
+
+connections_per_worker = pool_connections(os.getenv("DATABASE_URL", "sqlite:///local.db"))
+if "uvicorn" in worker_class:
+    # asgi:app keeps the regular engine for threaded endpoints next to its async one.
+    connections_per_worker *= 2
+connection_budget = int(os.getenv("DB_MAX_CONNECTIONS", "100")) - int(os.getenv("DB_RESERVED_CONNECTIONS", "10"))
+default_workers = multiprocessing.cpu_count() * 2 + 1
+if connections_per_worker:
+    default_workers = max(1, min(default_workers, connection_budget // connections_per_worker))
+workers = int(os.getenv("WEB_CONCURRENCY", default_workers))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "0"))
+preload_app = True
+
+# Slot events from the in-process broadcaster reach only the worker that took
+# the booking; with several workers, fan them out through Postgres instead.
+if workers > 1 and os.getenv("DATABASE_URL", "").startswith("postgresql"):
+    os.environ.setdefault("EVENTS_BACKEND", "postgres")
+accesslog = "-"
+errorlog = "-"
+
+
+def on_starting(server):
+    if connections_per_worker and workers * connections_per_worker > connection_budget:
+        server.log.warning(
+            "%d workers x %d pooled connections exceeds the budget of %d "
+            "(DB_MAX_CONNECTIONS - DB_RESERVED_CONNECTIONS); lower WEB_CONCURRENCY or DB_POOL_SIZE.",
+            workers, connections_per_worker, connection_budget,
+        )
+
+
+def post_fork(server, worker):
+    # The app is preloaded in the master; connections and file handles it
+    # opened must not be shared with the forked workers.
+    from api.extensions import db
+    from api.ratelimit import limiter
+
+    app = server.app.wsgi()
+    # asgi:app wraps the Flask app and has an async engine of its own.
+    flask_app = getattr(app, "flask_app", app)
+    with flask_app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    if hasattr(app, "after_fork"):
+        app.after_fork()
+    limiter.after_fork()
@@ -12,10 +12,26 @@ if config.config_file_name is not None:
 
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from api.extensions import db
-import api.models
 
-target_metadata = db.metadata
+
+def load_target_metadata():
+    """
+    Model metadata, loaded only for commands that compare it with the database
+    (revision --autogenerate, check, or programmatic use); upgrade, downgrade
+    and history run the migration scripts without importing Flask or the models.
+    """
+    opts = config.cmd_opts
+    if opts is not None:
+        cmd = getattr(opts, "cmd", None)
+        name = getattr(cmd[0], "__name__", "") if cmd else ""
+        if not getattr(opts, "autogenerate", False) and name != "check":
+            return None
+    from api.extensions import db
+    import api.models
+    return db.metadata
+
+
+target_metadata = load_target_metadata()
 
 def get_database_url():
     """Gets the database URL from the environment, raising an error if not found."""
@@ -0,0 +1,30 @@
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002_booking_tickets'
+down_revision = '001_initial'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'booking_tickets',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('idempotency_key', sa.String(length=128), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False, server_default='pending'),
+        sa.Column('time_slot', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_unique_constraint('uq_booking_tickets_idempotency_key', 'booking_tickets', ['idempotency_key'])
+    op.create_index('ix_booking_tickets_status_slot', 'booking_tickets', ['status', 'time_slot', 'id'])
+
+def downgrade():
+    op.drop_index('ix_booking_tickets_status_slot', table_name='booking_tickets')
+    op.drop_constraint('uq_booking_tickets_idempotency_key', 'booking_tickets', type_='unique')
+    op.drop_table('booking_tickets')
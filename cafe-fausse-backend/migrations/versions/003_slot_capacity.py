@@ -0,0 +1,20 @@
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003_slot_capacity'
+down_revision = '002_booking_tickets'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'slot_capacity',
+        sa.Column('time_slot', sa.DateTime(timezone=True), primary_key=True),
+        sa.Column('booked_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('table_mask', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+
+def downgrade():
+    op.drop_table('slot_capacity')
@@ -0,0 +1,41 @@
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004_reservation_indexes'
+down_revision = '003_slot_capacity'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # The unique constraint leads with time_slot, so it already serves slot
+    # lookups and range scans; INCLUDE lets the admin join read customer_id
+    # from the index alone.
+    op.drop_index('ix_reservations_time_slot', table_name='reservations')
+    op.drop_constraint('uq_reservation_slot_table', 'reservations', type_='unique')
+    op.create_unique_constraint(
+        'uq_reservation_slot_table', 'reservations', ['time_slot', 'table_number'],
+        postgresql_include=['customer_id'],
+    )
+
+    # Per-customer lookups (email filter) read that customer's rows in slot order.
+    op.drop_index('ix_reservations_customer_id', table_name='reservations')
+    op.create_index('ix_reservations_customer_slot', 'reservations', ['customer_id', 'time_slot', 'id'])
+
+    # The booking worker only ever looks for pending tickets.
+    op.drop_index('ix_booking_tickets_status_slot', table_name='booking_tickets')
+    op.create_index(
+        'ix_booking_tickets_pending', 'booking_tickets', ['time_slot', 'id'],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+def downgrade():
+    op.drop_index('ix_booking_tickets_pending', table_name='booking_tickets')
+    op.create_index('ix_booking_tickets_status_slot', 'booking_tickets', ['status', 'time_slot', 'id'])
+
+    op.drop_index('ix_reservations_customer_slot', table_name='reservations')
+    op.create_index('ix_reservations_customer_id', 'reservations', ['customer_id'])
+
+    op.drop_constraint('uq_reservation_slot_table', 'reservations', type_='unique')
+    op.create_unique_constraint('uq_reservation_slot_table', 'reservations', ['time_slot', 'table_number'])
+    op.create_index('ix_reservations_time_slot', 'reservations', ['time_slot'])
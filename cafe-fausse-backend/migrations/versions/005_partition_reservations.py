@@ -0,0 +1,102 @@
+from datetime import datetime, timezone
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005_partition_reservations'
+down_revision = '004_reservation_indexes'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+
+def _month(dt):
+    dt = dt.astimezone(timezone.utc) if dt.tzinfo else dt
+    return datetime(dt.year, dt.month, 1, tzinfo=timezone.utc)
+
+
+def _next_month(month):
+    return month.replace(year=month.year + month.month // 12, month=month.month % 12 + 1)
+
+
+def upgrade():
+    # Postgres cannot turn a table into a partitioned one in place, so the rows
+    # are copied into a new partitioned table, which then takes the old name.
+    # Keys are added after the copy; partitioned keys must include time_slot.
+    bind = op.get_bind()
+    lo, hi = bind.execute(sa.text("SELECT min(time_slot), max(time_slot) FROM reservations")).one()
+    now = _month(datetime.now(timezone.utc))
+    month = min(_month(lo), now) if lo else now
+    last = max(_month(hi), now) if hi else now
+    for _ in range(MONTHS_AHEAD):
+        last = _next_month(last)
+
+    op.execute("""
+        CREATE TABLE reservations_new (
+            id integer NOT NULL DEFAULT nextval('reservations_id_seq'::regclass),
+            customer_id integer NOT NULL,
+            time_slot timestamp with time zone NOT NULL,
+            table_number integer NOT NULL,
+            created_at timestamp with time zone NOT NULL DEFAULT now()
+        ) PARTITION BY RANGE (time_slot)
+    """)
+    while month <= last:
+        upper = _next_month(month)
+        op.execute(
+            f"CREATE TABLE reservations_{month:%Y_%m} PARTITION OF reservations_new "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+    # Catches bookings beyond the pre-created months until `flask partitions create` runs.
+    op.execute("CREATE TABLE reservations_default PARTITION OF reservations_new DEFAULT")
+
+    op.execute("""
+        INSERT INTO reservations_new (id, customer_id, time_slot, table_number, created_at)
+        SELECT id, customer_id, time_slot, table_number, created_at FROM reservations
+    """)
+    op.execute("ALTER SEQUENCE reservations_id_seq OWNED BY reservations_new.id")
+    op.drop_table('reservations')
+    op.rename_table('reservations_new', 'reservations')
+
+    op.create_primary_key('reservations_pkey', 'reservations', ['id', 'time_slot'])
+    op.create_foreign_key(
+        'reservations_customer_id_fkey', 'reservations', 'customers',
+        ['customer_id'], ['id'], ondelete='CASCADE',
+    )
+    op.create_unique_constraint(
+        'uq_reservation_slot_table', 'reservations', ['time_slot', 'table_number'],
+        postgresql_include=['customer_id'],
+    )
+    op.create_index('ix_reservations_customer_slot', 'reservations', ['customer_id', 'time_slot', 'id'])
+
+
+def downgrade():
+    op.execute("""
+        CREATE TABLE reservations_flat (
+            id integer NOT NULL DEFAULT nextval('reservations_id_seq'::regclass),
+            customer_id integer NOT NULL,
+            time_slot timestamp with time zone NOT NULL,
+            table_number integer NOT NULL,
+            created_at timestamp with time zone NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute("""
+        INSERT INTO reservations_flat (id, customer_id, time_slot, table_number, created_at)
+        SELECT id, customer_id, time_slot, table_number, created_at FROM reservations
+    """)
+    op.execute("ALTER SEQUENCE reservations_id_seq OWNED BY reservations_flat.id")
+    # Drops every attached partition too; detached archives are left alone.
+    op.drop_table('reservations')
+    op.rename_table('reservations_flat', 'reservations')
+
+    op.create_primary_key('reservations_pkey', 'reservations', ['id'])
+    op.create_foreign_key(
+        'reservations_customer_id_fkey', 'reservations', 'customers',
+        ['customer_id'], ['id'], ondelete='CASCADE',
+    )
+    op.create_unique_constraint(
+        'uq_reservation_slot_table', 'reservations', ['time_slot', 'table_number'],
+        postgresql_include=['customer_id'],
+    )
+    op.create_index('ix_reservations_customer_slot', 'reservations', ['customer_id', 'time_slot', 'id'])
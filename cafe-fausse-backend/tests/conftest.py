@@ -0,0 +1,65 @@
+from datetime import datetime
+
+import pytest
+
+from api.app import create_app
+from api.extensions import db
+from api.models import Customer, Reservation
+
+# App tests run on SQLite files under tmp_path; the Postgres-only checks
+# (query plans, partitions, ASGI on asyncpg) build their own apps.
+TEST_CONFIG = {
+    "SQLALCHEMY_ENGINE_OPTIONS": {},
+    "SQLALCHEMY_BINDS": {},
+    "ASYNC_DATABASE_URL": None,
+    "SECRET_KEY": "test-secret",
+    "RATELIMIT_ENABLED": False,
+    "SLOT_LEDGER_ENABLED": False,
+}
+
+
+@pytest.fixture
+def config():
+    """create_app() overrides for `app`; redefine it in a module, or parametrize it for one test."""
+    return {}
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Builds an app on tmp_path/app.db with its tables created on every engine it has."""
+
+    def make(**config):
+        app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'app.db'}", **TEST_CONFIG, **config})
+        with app.app_context():
+            # Not db.create_all(): binds are registered on `db`, so once any app
+            # has had a replica it would look for one in every later app too.
+            for engine in db.engines.values():
+                db.metadata.create_all(engine)
+        return app
+
+    return make
+
+
+@pytest.fixture
+def app(make_app, config):
+    return make_app(**config)
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def replica_app(make_app, tmp_path):
+    """An app with one replica; only the replica holds a booking (table 1, 2098-01-06 18:00Z)."""
+    app = make_app(
+        SQLALCHEMY_BINDS={"replica_0": f"sqlite:///{tmp_path / 'replica.db'}"},
+        OCCUPANCY_MAX_AGE_SECONDS=0,
+    )
+    with app.app_context(), db.engines["replica_0"].begin() as conn:
+        conn.execute(Customer.__table__.insert(), {"id": 1, "name": "R", "email": "r@example.com", "phone": ""})
+        conn.execute(Reservation.__table__.insert(), {
+            "customer_id": 1, "time_slot": datetime(2098, 1, 6, 18), "table_number": 1,
+        })
+    return app
@@ -0,0 +1,34 @@
+import random
+
+import pytest
+
+from api.allocation import (
+    LeastRecentlyUsedAllocator,
+    LowestFreeAllocator,
+    RandomAllocator,
+    make_allocator,
+)
+
+
+def test_lowest_free_picks_first_unbooked_table():
+    assert LowestFreeAllocator().pick(0b0111, 5) == 4
+    assert LowestFreeAllocator().pick(0b11111, 5) is None
+
+
+def test_random_only_picks_free_tables():
+    allocator = RandomAllocator(random.Random(7))
+    picks = {allocator.pick(0b1011, 5) for _ in range(200)}
+    assert picks == {3, 5}
+
+
+def test_lru_prefers_table_used_longest_ago():
+    allocator = LeastRecentlyUsedAllocator()
+    for table_number in (2, 1, 3):
+        allocator.record(table_number)
+    assert allocator.pick(0, 3) == 2
+    assert allocator.pick(0b010, 3) == 1
+
+
+def test_unknown_strategy_raises():
+    with pytest.raises(ValueError):
+        make_allocator("fastest")
@@ -1,3 +1,4 @@
+import json
 import os
 import uuid
 from datetime import datetime, timedelta, timezone
@@ -60,6 +61,24 @@ def test_newsletter_subscribe_200_returns_customer_id():
     assert "customerId" in body and isinstance(body["customerId"], int)
 
 
+def test_newsletter_bulk_csv_reports_bad_rows():
+    good = _unique_email("bulk")
+    body = f"name,email,phone\nBulk Tester,{good},\nNo Email,not-an-email,\n"
+    r = requests.post(
+        f"{BASE_URL}/api/newsletter/bulk",
+        data=body.encode(),
+        headers={"Authorization": f"Bearer {ADMIN_TOKEN}", "Content-Type": "text/csv"},
+        timeout=30,
+    )
+    assert r.status_code == 200
+    report = r.json()
+    assert report["received"] == 2
+    assert report["subscribed"] == 1
+    assert report["failed"] == 1
+    assert report["errors"][0]["line"] == 3
+    assert report["errors"][0]["code"] == "VALIDATION_ERROR"
+
+
 def test_availability_returns_counts_and_slot():
     slot = _iso_utc_in_future(180)
     r = requests.get(
@@ -77,6 +96,53 @@ def test_availability_returns_counts_and_slot():
     assert isinstance(body["slot"], str)
 
 
+def test_availability_conditional_get_304():
+    slot = _iso_utc_in_future(200)
+    r = requests.get(f"{BASE_URL}/api/reservations/availability", params={"time": slot}, timeout=10)
+    assert r.status_code == 200
+    etag = r.headers.get("ETag")
+    assert etag
+    assert "max-age" in r.headers.get("Cache-Control", "")
+
+    again = requests.get(
+        f"{BASE_URL}/api/reservations/availability",
+        params={"time": slot},
+        headers={"If-None-Match": etag},
+        timeout=10,
+    )
+    # Another worker may answer with its own ETag; both outcomes are valid.
+    assert again.status_code in (200, 304)
+    if again.status_code == 304:
+        assert again.headers.get("ETag") == etag
+
+
+def test_availability_range_returns_slot_grid():
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    end = start + timedelta(days=1)
+    r = requests.get(
+        f"{BASE_URL}/api/reservations/availability/range",
+        params={"from": start.isoformat(), "to": end.isoformat()},
+        timeout=10,
+    )
+    assert r.status_code == 200
+    body = r.json()
+    assert isinstance(body["totalTables"], int)
+    assert isinstance(body["slots"], list) and len(body["slots"]) > 0
+    for slot in body["slots"]:
+        assert slot["booked"] + slot["available"] == body["totalTables"]
+
+
+def test_availability_range_rejects_unbounded_span_422():
+    start = datetime.now(timezone.utc)
+    r = requests.get(
+        f"{BASE_URL}/api/reservations/availability/range",
+        params={"from": start.isoformat(), "to": (start + timedelta(days=365)).isoformat()},
+        timeout=10,
+    )
+    assert r.status_code == 422
+    assert r.json().get("code") == "RANGE_TOO_LARGE"
+
+
 def test_create_reservation_201_returns_payload():
     slot = _iso_utc_in_future(240)
     email = _unique_email("reserve")
@@ -160,4 +226,133 @@ def test_admin_list_can_be_filtered_by_email():
     assert len(data_filtered["reservations"]) > 0, "Filtered search should have returned the reservation we just created."
     
     for res in data_filtered["reservations"]:
-        assert res["customer"]["email"] == unique_email, "Found a reservation with an incorrect email in the filtered list."
\ No newline at end of file
+        assert res["customer"]["email"] == unique_email, "Found a reservation with an incorrect email in the filtered list."
+
+def test_batch_reservations_returns_result_per_item():
+    slot = _iso_utc_in_future(540)
+    payload = [
+        {"time": slot, "guests": 2, "name": "Batch One", "email": _unique_email("batch")},
+        {"time": slot, "guests": 4, "name": "Batch Two", "email": _unique_email("batch")},
+        {"time": "not-a-time", "guests": 2, "name": "Broken", "email": _unique_email("batch")},
+    ]
+    r = requests.post(
+        f"{BASE_URL}/api/reservations/batch",
+        json=payload,
+        headers={"Authorization": f"Bearer {ADMIN_TOKEN}"},
+        timeout=15,
+    )
+    assert r.status_code == 200
+    body = r.json()
+    assert len(body["results"]) == 3
+    assert body["created"] == 2
+    first, second, broken = body["results"]
+    assert isinstance(first["reservationId"], int)
+    assert first["tableNumber"] != second["tableNumber"]
+    assert broken["code"] == "VALIDATION_ERROR"
+
+
+def test_admin_list_cursor_pagination_walks_all_rows():
+    slot = _iso_utc_in_future(600)
+    day = slot.split("T")[0]
+    for i in range(3):
+        create = requests.post(
+            f"{BASE_URL}/api/reservations",
+            json={"time": slot, "guests": 2, "name": "Cursor Tester", "email": _unique_email(f"cursor{i}")},
+            timeout=15,
+        )
+        assert create.status_code == 201
+
+    headers = {"Authorization": f"Bearer {ADMIN_TOKEN}"}
+    first = requests.get(
+        f"{BASE_URL}/api/reservations",
+        params={"date": day, "page_size": 100},
+        headers=headers,
+        timeout=15,
+    ).json()
+    expected = [row["id"] for row in first["reservations"]]
+
+    seen, cursor = [], None
+    while True:
+        params = {"date": day, "page_size": 2, "include_total": "false"}
+        if cursor:
+            params["cursor"] = cursor
+        r = requests.get(f"{BASE_URL}/api/reservations", params=params, headers=headers, timeout=15)
+        assert r.status_code == 200
+        body = r.json()
+        assert body["total"] is None
+        seen.extend(row["id"] for row in body["reservations"])
+        cursor = body["nextCursor"]
+        if not cursor:
+            break
+
+    assert seen[: len(expected)] == expected
+
+
+def test_admin_export_streams_ndjson_and_csv():
+    slot = _iso_utc_in_future(660)
+    email = _unique_email("export")
+    create = requests.post(
+        f"{BASE_URL}/api/reservations",
+        json={"time": slot, "guests": 2, "name": "Export Tester", "email": email},
+        timeout=15,
+    )
+    assert create.status_code == 201
+    day = create.json()["slot"].split("T")[0]
+    headers = {"Authorization": f"Bearer {ADMIN_TOKEN}"}
+
+    r = requests.get(
+        f"{BASE_URL}/api/reservations/export",
+        params={"from": day, "to": day},
+        headers=headers,
+        timeout=30,
+    )
+    assert r.status_code == 200
+    assert r.headers["Content-Type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in r.text.splitlines() if line]
+    assert email in [row["customer"]["email"] for row in rows]
+
+    r_csv = requests.get(
+        f"{BASE_URL}/api/reservations/export",
+        params={"from": day, "to": day, "format": "csv"},
+        headers=headers,
+        timeout=30,
+    )
+    assert r_csv.status_code == 200
+    lines = r_csv.text.splitlines()
+    assert lines[0].startswith("id,time,tableNumber")
+    assert any(email in line for line in lines[1:])
+
+
+def test_async_reservation_is_idempotent_per_key():
+    slot = _iso_utc_in_future(720)
+    body = {"time": slot, "guests": 2, "name": "Queue Tester", "email": _unique_email("async")}
+    key = uuid.uuid4().hex
+
+    missing = requests.post(f"{BASE_URL}/api/reservations/async", json=body, timeout=15)
+    assert missing.status_code == 400
+    assert missing.json()["code"] == "MISSING_IDEMPOTENCY_KEY"
+
+    first = requests.post(
+        f"{BASE_URL}/api/reservations/async", json=body, headers={"Idempotency-Key": key}, timeout=15
+    )
+    assert first.status_code in (200, 202)
+    assert first.json()["ticket"] == key
+
+    retry = requests.post(
+        f"{BASE_URL}/api/reservations/async", json=body, headers={"Idempotency-Key": key}, timeout=15
+    )
+    assert retry.status_code in (200, 202)
+    assert retry.json()["slot"] == first.json()["slot"]
+
+    reused = requests.post(
+        f"{BASE_URL}/api/reservations/async",
+        json={**body, "guests": 4},
+        headers={"Idempotency-Key": key},
+        timeout=15,
+    )
+    assert reused.status_code == 422
+    assert reused.json()["code"] == "IDEMPOTENCY_KEY_REUSED"
+
+    status = requests.get(f"{BASE_URL}/api/reservations/tickets/{key}", timeout=10)
+    assert status.status_code == 200
+    assert status.json()["status"] in ("pending", "done", "failed")
@@ -0,0 +1,194 @@
+import asyncio
+import io
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from api.asgi import _environ, async_database_url
+
+# Drives the ASGI app against a migrated Postgres; test rows use
+# asgi-check-* emails in 2098 and are deleted afterwards.
+DATABASE_URL = os.getenv("TEST_DATABASE_URL") or os.getenv("DATABASE_URL", "")
+
+needs_postgres = pytest.mark.skipif(
+    not DATABASE_URL.startswith("postgresql"),
+    reason="ASGI checks need TEST_DATABASE_URL pointing at a migrated Postgres database",
+)
+
+SLOT = "2098-01-06T18:00:00Z"  # a Monday
+
+
+def test_async_database_url_swaps_driver():
+    assert async_database_url("postgresql://u:p@db:5432/cafe") == "postgresql+asyncpg://u:p@db:5432/cafe"
+    assert async_database_url("postgresql+psycopg2://u@db/cafe") == "postgresql+asyncpg://u@db/cafe"
+    assert async_database_url("sqlite:///local.db") == "sqlite+aiosqlite:///local.db"
+    with pytest.raises(ValueError):
+        async_database_url("mysql://u@db/cafe")
+
+
+def test_environ_from_scope():
+    scope = {
+        "type": "http", "method": "POST", "path": "/api/newsletter", "query_string": b"a=1",
+        "http_version": "1.1", "client": ("10.0.0.1", 5000), "root_path": "",
+        "headers": [(b"content-type", b"application/json"), (b"x-forwarded-for", b"1.2.3.4")],
+    }
+    environ = _environ(scope, io.BytesIO(b"{}"))
+    assert environ["PATH_INFO"] == "/api/newsletter"
+    assert environ["QUERY_STRING"] == "a=1"
+    assert environ["CONTENT_TYPE"] == "application/json"
+    assert environ["CONTENT_LENGTH"] == "2"
+    assert environ["HTTP_X_FORWARDED_FOR"] == "1.2.3.4"
+    assert environ["REMOTE_ADDR"] == "10.0.0.1"
+
+
+async def _call(asgi, method, path, body=None):
+    path, _, query = path.partition("?")
+    raw = json.dumps(body).encode() if body is not None else b""
+    scope = {
+        "type": "http", "method": method, "path": path, "query_string": query.encode(),
+        "http_version": "1.1", "client": ("127.0.0.1", 1), "root_path": "",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(raw)).encode())],
+    }
+    messages = iter([{"type": "http.request", "body": raw, "more_body": False}])
+    response = {"body": b""}
+
+    async def receive():
+        return next(messages, {"type": "http.disconnect"})
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        else:
+            response["body"] += message.get("body", b"")
+
+    await asyncio.wait_for(asgi(scope, receive, send), timeout=10)
+    return response["status"], json.loads(response["body"])
+
+
+@pytest.fixture(scope="module")
+def loop():
+    # One loop for the module: pooled connections belong to the loop that opened them.
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="module")
+def asgi(loop):
+    pytest.importorskip("asyncpg")
+    pytest.importorskip("asgiref")
+    from api.app import create_app
+    from api.asgi import create_asgi_app
+
+    app = create_app()
+    app.config.update(ASYNC_DATABASE_URL=async_database_url(DATABASE_URL), RATELIMIT_ENABLED=False)
+    app.extensions["ratelimiter"].enabled = False
+    asgi = create_asgi_app(app)
+    yield asgi
+    loop.run_until_complete(asgi.engine.dispose())
+
+    engine = create_engine(DATABASE_URL)
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM customers WHERE email LIKE 'asgi-check-%'"))
+    engine.dispose()
+
+
+@needs_postgres
+def test_booking_updates_availability(asgi, loop):
+    async def scenario():
+        _, before = await _call(asgi, "GET", f"/api/reservations/availability?time={SLOT}")
+        status, created = await _call(asgi, "POST", "/api/reservations", {
+            "name": "ASGI", "email": "asgi-check-1@example.com", "time": SLOT, "guests": 2,
+        })
+        _, after = await _call(asgi, "GET", f"/api/reservations/availability?time={SLOT}")
+        return before, status, created, after
+
+    before, status, created, after = loop.run_until_complete(scenario())
+    assert status == 201
+    assert created["slot"] == SLOT
+    assert after["booked"] == before["booked"] + 1
+
+
+@needs_postgres
+def test_errors_match_the_wsgi_app(asgi, loop):
+    payload = {"name": "ASGI", "email": "asgi-check-2@example.com", "time": "2000-01-01T18:00:00Z", "guests": 2}
+    status, body = loop.run_until_complete(_call(asgi, "POST", "/api/reservations", payload))
+    expected = asgi.flask_app.test_client().post("/api/reservations", json=payload)
+    assert (status, body) == (expected.status_code, expected.get_json())
+    assert body["code"] == "VALIDATION_ERROR"
+
+
+@needs_postgres
+def test_concurrent_polls_share_the_pool(asgi, loop):
+    async def scenario():
+        return await asyncio.gather(*(
+            _call(asgi, "GET", f"/api/reservations/availability?time={SLOT}") for _ in range(50)
+        ))
+
+    results = loop.run_until_complete(scenario())
+    assert {status for status, _ in results} == {200}
+    assert len({json.dumps(body, sort_keys=True) for _, body in results}) == 1
+
+
+@needs_postgres
+def test_subscribe(asgi, loop):
+    status, body = loop.run_until_complete(_call(asgi, "POST", "/api/newsletter", {
+        "name": "ASGI", "email": "asgi-check-3@example.com",
+    }))
+    assert status == 200
+    assert body["customerId"] > 0
+
+
+def test_read_only_views_use_the_replica(replica_app):
+    pytest.importorskip("aiosqlite")
+    pytest.importorskip("asgiref")
+    from api.asgi import create_asgi_app
+
+    asgi = create_asgi_app(replica_app)
+
+    async def scenario():
+        try:
+            return await _call(asgi, "GET", f"/api/reservations/availability?time={SLOT}")
+        finally:
+            await asgi.engine.dispose()
+            await asgi.replica_engines["replica_0"].dispose()
+
+    status, body = asyncio.run(scenario())
+    assert (status, body["booked"]) == (200, 1)
+
+
+def test_concurrent_cold_polls_do_not_block_the_loop(make_app, monkeypatch):
+    pytest.importorskip("aiosqlite")
+    pytest.importorskip("asgiref")
+    from api.asgi import create_asgi_app
+    from api.occupancy import occupancy
+
+    asgi = create_asgi_app(make_app(OCCUPANCY_MAX_AGE_SECONDS=60))
+    loads = []
+    for name in ("warm", "_load_slot"):
+        original = getattr(occupancy, name)
+        monkeypatch.setattr(occupancy, name, lambda *a, _f=original, _n=name: loads.append(_n) or _f(*a))
+    # One slot inside the warm horizon and one beyond it, so both reload paths run.
+    soon = (datetime.now(timezone.utc) + timedelta(hours=2)).strftime("%Y-%m-%dT%H:00:00Z")
+
+    async def scenario():
+        try:
+            return await asyncio.gather(*(
+                _call(asgi, "GET", f"/api/reservations/availability?time={slot}")
+                for slot in (soon, SLOT) for _ in range(4)
+            ))
+        finally:
+            await asgi.engine.dispose()
+
+    # A blocked loop never reaches wait_for's timeout, so run it on a thread.
+    results = []
+    runner = threading.Thread(target=lambda: results.extend(asyncio.run(scenario())), daemon=True)
+    runner.start()
+    runner.join(timeout=10)
+    assert len(results) == 8, "concurrent polls blocked the event loop"
+    assert {(status, body["booked"]) for status, body in results} == {(200, 0)}
+    assert sorted(loads) == ["_load_slot", "warm"]  # still single-flight
@@ -0,0 +1,111 @@
+import os
+
+import pytest
+from flask import Flask
+
+from api import auth
+from api.auth import DEFAULT_TOKEN, AdminAuth, check_admin, parse_tokens
+
+
+@pytest.fixture
+def env_file(tmp_path, monkeypatch):
+    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+    monkeypatch.delenv("ADMIN_TOKENS", raising=False)
+    path = tmp_path / ".env"
+    path.write_text("ADMIN_TOKEN=root-token\nADMIN_TOKENS=viewer:read,exporter:read+export\n")
+    return path
+
+
+def _auth(env_file, check_interval=0.0) -> AdminAuth:
+    app = Flask(__name__)
+    app.config.update(AUTH_RELOAD_CHECK_SECONDS=check_interval, AUTH_CACHE_SIZE=2)
+    admin = AdminAuth(env_file)
+    admin.init_app(app)
+    return admin
+
+
+def test_parse_tokens():
+    assert parse_tokens(" a:read , b:read+export ") == {"a": {"read"}, "b": {"read", "export"}}
+    with pytest.raises(ValueError) as e:
+        parse_tokens("secret:superuser")
+    assert "secret" not in str(e.value)
+
+
+def test_scopes_from_env_file(env_file):
+    admin = _auth(env_file)
+    assert admin.scopes("root-token") == {"admin", "read", "export"}
+    assert admin.scopes("viewer") == {"read"}
+    assert admin.scopes("exporter") == {"read", "export"}
+    assert admin.scopes("nope") == frozenset()
+    assert admin.scopes(DEFAULT_TOKEN) == frozenset()
+
+
+def test_environment_wins_over_env_file(env_file, monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "from-env")
+    admin = _auth(env_file)
+    assert admin.scopes("from-env") == {"admin", "read", "export"}
+    assert admin.scopes("root-token") == frozenset()
+
+
+def test_default_token_without_configuration(tmp_path, monkeypatch):
+    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+    monkeypatch.delenv("ADMIN_TOKENS", raising=False)
+    admin = _auth(tmp_path / "missing.env")
+    assert "admin" in admin.scopes(DEFAULT_TOKEN)
+
+
+def test_scoped_tokens_alone_disable_the_default(tmp_path, monkeypatch):
+    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+    monkeypatch.setenv("ADMIN_TOKENS", "viewer:read")
+    admin = _auth(tmp_path / "missing.env")
+    assert admin.scopes("viewer") == {"read"}
+    assert admin.scopes(DEFAULT_TOKEN) == frozenset()
+
+
+def test_env_file_change_is_picked_up(env_file):
+    admin = _auth(env_file)
+    assert admin.scopes("viewer") == {"read"}
+    env_file.write_text("ADMIN_TOKEN=rotated\n")
+    os.utime(env_file, ns=(1, 1))
+    assert admin.scopes("viewer") == frozenset()
+    assert "admin" in admin.scopes("rotated")
+
+
+def test_no_file_io_between_checks(env_file, monkeypatch):
+    admin = _auth(env_file, check_interval=3600)
+    admin.scopes("viewer")
+    monkeypatch.setattr(auth, "dotenv_values", lambda path: pytest.fail("re-read .env"))
+    monkeypatch.setattr(admin, "_env_mtime", lambda: pytest.fail("stat .env"))
+    assert admin.scopes("viewer") == {"read"}
+    assert admin.scopes("exporter") == {"read", "export"}
+
+
+def test_sighup_flag_forces_reload(env_file):
+    admin = _auth(env_file, check_interval=3600)
+    env_file.write_text("ADMIN_TOKEN=rotated\n")
+    admin._reload_requested = True
+    assert "admin" in admin.scopes("rotated")
+
+
+def test_verified_cache_is_bounded(env_file):
+    admin = _auth(env_file)
+    for token in ("root-token", "viewer", "exporter", "nope"):
+        admin.scopes(token)
+    assert list(admin._verified) == ["viewer", "exporter"]
+
+
+def test_check_admin_scopes(env_file, monkeypatch):
+    admin = _auth(env_file)
+    monkeypatch.setattr(auth, "admin_auth", admin)
+    app = Flask(__name__)
+    for token, scope, allowed in [
+        ("root-token", "admin", True),
+        ("viewer", "read", True),
+        ("viewer", "export", False),
+        ("viewer", "admin", False),
+        ("exporter", "export", True),
+    ]:
+        with app.test_request_context(headers={"Authorization": f"Bearer {token}"}):
+            assert check_admin(scope) is allowed
+    with app.test_request_context(headers={"Authorization": "Basic root-token"}):
+        assert check_admin() is False
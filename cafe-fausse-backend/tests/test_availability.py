@@ -0,0 +1,25 @@
+import pytest
+
+
+@pytest.fixture
+def config():
+    return {"OCCUPANCY_MAX_AGE_SECONDS": 0}
+
+
+def test_range_lists_a_booking_made_in_an_offset(client):
+    booked = client.post("/api/reservations", json={
+        "name": "E", "email": "e@example.com", "time": "2030-01-07T19:00:00-04:00", "guests": 2,
+    })
+    assert booked.status_code == 201
+    assert booked.get_json()["slot"] == "2030-01-07T23:00:00Z"
+
+    single = client.get("/api/reservations/availability?time=2030-01-07T23:00:00Z").get_json()
+    assert single["booked"] == 1
+
+    grid = client.get(
+        "/api/reservations/availability/range?from=2030-01-07T12:00:00-04:00&to=2030-01-08T00:00:00-04:00"
+    ).get_json()
+    by_slot = {s["slot"]: s["booked"] for s in grid["slots"]}
+    assert by_slot["2030-01-07T23:00:00Z"] == 1
+    assert min(by_slot) == "2030-01-07T21:00:00Z"  # 17:00-04:00
+    assert max(by_slot) == "2030-01-08T02:30:00Z"  # 22:30-04:00
@@ -0,0 +1,36 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from api.utils import calendar
+
+ADMIN = {"Authorization": "Bearer t"}
+
+
+@pytest.fixture(autouse=True)
+def admin_token(monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "t")
+
+
+def _item(when, email):
+    return {"name": "B", "email": email, "time": when, "guests": 2}
+
+
+def test_batch_checks_hours_once_for_all_items(client, monkeypatch):
+    clock = []
+    monkeypatch.setattr(calendar, "time", SimpleNamespace(time=lambda: clock.append(1) or time.time()))
+    body = client.post("/api/reservations/batch", headers=ADMIN, json=[
+        _item("2098-01-06T19:00:00Z", "a@example.com"),
+        _item("2098-01-06T09:00:00Z", "b@example.com"),
+        _item("2000-01-06T19:00:00Z", "c@example.com"),
+        {"name": "B", "email": "not-an-email", "time": "2098-01-06T19:00:00Z", "guests": 2},
+    ]).get_json()
+    assert len(clock) == 1
+    assert (body["created"], body["failed"]) == (1, 3)
+    assert [r.get("code") for r in body["results"]] == [None] + ["VALIDATION_ERROR"] * 3
+
+    # Same details as the single booking endpoint gives.
+    single = client.post("/api/reservations", json=_item("2098-01-06T09:00:00Z", "b@example.com")).get_json()
+    assert body["results"][1]["details"] == single["details"]
+    assert body["results"][2]["details"][0]["msg"] == f"Value error, {calendar.PAST_TIME}"
@@ -0,0 +1,24 @@
+from benchmarks.loadtest import compare_to_baseline, percentile
+
+
+def _report(p95, p99, rps):
+    return {"scenarios": {"availability": {"p95_ms": p95, "p99_ms": p99, "throughput_rps": rps}}}
+
+
+def test_percentile_nearest_rank():
+    samples = list(range(1, 101))
+    assert percentile(samples, 50) == 50
+    assert percentile(samples, 95) == 95
+    assert percentile(samples, 99) == 99
+    assert percentile([], 95) == 0.0
+
+
+def test_compare_flags_latency_and_throughput_regressions():
+    baseline = _report(10.0, 20.0, 500.0)
+    assert compare_to_baseline(_report(11.0, 21.0, 480.0), baseline, tolerance=0.25) == []
+    regressions = compare_to_baseline(_report(15.0, 20.0, 300.0), baseline, tolerance=0.25)
+    assert regressions == ["availability p95_ms: 10.0 -> 15.0", "availability throughput_rps: 500.0 -> 300.0"]
+
+
+def test_compare_ignores_sub_millisecond_noise():
+    assert compare_to_baseline(_report(0.9, 0.9, 500.0), _report(0.5, 0.5, 500.0), tolerance=0.25) == []
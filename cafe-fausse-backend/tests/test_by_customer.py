@@ -0,0 +1,96 @@
+from datetime import datetime
+
+import pytest
+
+from api.auth import LOOKUP_TOKEN_HEADER, lookup_token
+from api.extensions import db
+from api.models import Customer, Reservation
+
+ADMIN = {"Authorization": "Bearer t"}
+
+
+@pytest.fixture(autouse=True)
+def admin_token(monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "t")
+
+
+@pytest.fixture
+def app(app):
+    with app.app_context():
+        db.session.add(Customer(id=1, name="C", email="c@example.com", phone=""))
+        db.session.add(Customer(id=2, name="O", email="o@example.com", phone=""))
+        # One past booking, three upcoming ones and another customer's.
+        for i, (year, hour) in enumerate([(2000, 18), (2098, 18), (2098, 19), (2099, 18)], start=1):
+            db.session.add(Reservation(customer_id=1, time_slot=datetime(year, 1, 6, hour), table_number=i))
+        db.session.add(Reservation(customer_id=2, time_slot=datetime(2098, 1, 6, 18), table_number=9))
+        db.session.commit()
+    return app
+
+
+def _times(body) -> list[str]:
+    return [r["time"] for r in body["reservations"]]
+
+
+def test_admin_pages_through_all_dates(client):
+    first = client.get("/api/reservations/by-customer?email=C@Example.com&page_size=3", headers=ADMIN).get_json()
+    assert _times(first) == ["2000-01-06T18:00:00Z", "2098-01-06T18:00:00Z", "2098-01-06T19:00:00Z"]
+    assert first["reservations"][0]["customer"]["email"] == "c@example.com"
+
+    rest = client.get(
+        f"/api/reservations/by-customer?email=c@example.com&page_size=3&cursor={first['nextCursor']}",
+        headers=ADMIN,
+    ).get_json()
+    assert _times(rest) == ["2099-01-06T18:00:00Z"]
+    assert rest["nextCursor"] is None
+
+
+def test_upcoming_only(app):
+    body = app.test_client().get(
+        "/api/reservations/by-customer?email=c@example.com&upcoming=true", headers=ADMIN
+    ).get_json()
+    assert _times(body) == ["2098-01-06T18:00:00Z", "2098-01-06T19:00:00Z", "2099-01-06T18:00:00Z"]
+
+
+def test_customer_uses_the_lookup_token_from_booking(client):
+    booked = client.post("/api/reservations", json={
+        "name": "N", "email": "New@Example.com", "time": "2098-02-03T19:00:00Z", "guests": 2,
+    }).get_json()
+    headers = {LOOKUP_TOKEN_HEADER: booked["lookupToken"]}
+
+    body = client.get("/api/reservations/by-customer?email=new@example.com", headers=headers).get_json()
+    assert [r["id"] for r in body["reservations"]] == [booked["reservationId"]]
+
+    other = client.get("/api/reservations/by-customer?email=c@example.com", headers=headers)
+    assert other.status_code == 401
+    in_query = client.get(f"/api/reservations/by-customer?email=new@example.com&token={booked['lookupToken']}")
+    assert in_query.status_code == 401
+
+
+def test_expired_lookup_token_is_refused(app):
+    with app.app_context():
+        stale = lookup_token("c@example.com", now=0)
+    response = app.test_client().get(
+        "/api/reservations/by-customer?email=c@example.com", headers={LOOKUP_TOKEN_HEADER: stale}
+    )
+    assert response.status_code == 401
+
+
+def test_default_secret_disables_lookup_tokens(make_app):
+    app = make_app(SECRET_KEY="dev-secret")
+    with app.app_context():
+        assert lookup_token("c@example.com") is None
+
+
+def test_lookups_are_rate_limited(make_app):
+    rules = {"customer_lookup": "2/minute"}
+    client = make_app(RATELIMIT_ENABLED=True, RATELIMIT_RULES=rules).test_client()
+    codes = [client.get("/api/reservations/by-customer?email=c@example.com").status_code for _ in range(3)]
+    assert codes == [401, 401, 429]
+
+
+def test_errors(client):
+    assert client.get("/api/reservations/by-customer", headers=ADMIN).get_json()["code"] == "MISSING_EMAIL"
+    bad = client.get("/api/reservations/by-customer?email=c@example.com&cursor=nope", headers=ADMIN)
+    assert bad.status_code == 422
+    unknown = client.get("/api/reservations/by-customer?email=x@example.com", headers=ADMIN).get_json()
+    assert unknown["reservations"] == []
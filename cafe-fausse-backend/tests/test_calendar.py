@@ -0,0 +1,91 @@
+from datetime import date, datetime, timedelta, timezone
+
+from api.utils.calendar import (
+    BUSINESS_HOURS, CLOSED_DAY, PAST_TIME, SlotCalendar, parse_closures, parse_overrides,
+)
+from api.utils.time import round_to_slot
+
+NOW = datetime(2030, 1, 1, tzinfo=timezone.utc).timestamp()
+
+
+def test_day_slots_follow_business_hours():
+    monday = date(2030, 1, 7)
+    slots = SlotCalendar().day_slots(monday)
+    open_hour, last_hour = BUSINESS_HOURS[0]
+    assert slots[0] == datetime(2030, 1, 7, open_hour, tzinfo=timezone.utc)
+    assert slots[-1] == datetime(2030, 1, 7, last_hour, 30, tzinfo=timezone.utc)
+    assert len(slots) == (last_hour - open_hour + 1) * 2
+
+
+def test_closures_and_overrides():
+    calendar = SlotCalendar(
+        closures=parse_closures("2030-12-25"),
+        overrides=parse_overrides("2030-12-24=17-18"),
+    )
+    assert calendar.day_slots(date(2030, 12, 25)) == ()
+    assert len(calendar.day_slots(date(2030, 12, 24))) == 4
+    assert calendar.check(datetime(2030, 12, 25, 18, tzinfo=timezone.utc), NOW) == CLOSED_DAY
+    assert "17:00 and 18:59" in calendar.check(datetime(2030, 12, 24, 20, tzinfo=timezone.utc), NOW)
+
+
+def test_business_timezone_shifts_slots():
+    calendar = SlotCalendar(tz="Europe/Paris")
+    slots = calendar.day_slots(date(2030, 1, 7))
+    assert slots[0] == datetime(2030, 1, 7, 16, tzinfo=timezone.utc)
+    assert calendar.check(datetime(2030, 1, 7, 16, tzinfo=timezone.utc), NOW) is None
+    assert calendar.check(datetime(2030, 1, 7, 22, tzinfo=timezone.utc), NOW) is not None
+
+
+def test_offset_input_default_and_explicit_zone():
+    eastern = timezone(timedelta(hours=-4))
+    evening = datetime(2030, 1, 7, 19, tzinfo=eastern)  # 23:00 UTC
+    late = datetime(2030, 1, 7, 23, 30, tzinfo=eastern)  # 03:30 UTC, 22:30 in New York
+    # Without BUSINESS_TIMEZONE, hours apply in the submitted offset.
+    assert SlotCalendar().check(evening, NOW) is None
+    assert SlotCalendar().check(late, NOW) is not None
+    assert SlotCalendar(tz="UTC").check(evening, NOW) is not None
+    assert SlotCalendar(tz="America/New_York").check(late, NOW) is None
+
+
+def test_slots_use_the_zone_check_uses():
+    eastern = timezone(timedelta(hours=-4))
+    start = datetime(2030, 1, 7, 12, tzinfo=eastern)
+    # Opening at 17:00-04:00, or at 17:00 in New York (-05:00 in January).
+    for calendar, first in ((SlotCalendar(), 17), (SlotCalendar(tz="America/New_York"), 18)):
+        slots = calendar.slots(start, start + timedelta(days=1))
+        assert slots[0].astimezone(eastern).hour == first
+        assert all(calendar.check(s.astimezone(eastern), NOW) is None for s in slots)
+    # 23:00 UTC: bookable at 19:00-04:00 and listed for a range given in that offset.
+    evening = datetime(2030, 1, 7, 23, tzinfo=timezone.utc)
+    assert evening in SlotCalendar().slots(start, start + timedelta(days=1))
+    assert evening not in SlotCalendar().slots(start.astimezone(timezone.utc), start + timedelta(days=1))
+
+
+def test_slots_spans_days():
+    calendar = SlotCalendar()
+    start = datetime(2030, 1, 7, 22, tzinfo=timezone.utc)
+    slots = calendar.slots(start, start + timedelta(days=1))
+    assert slots[:2] == [start, start + timedelta(minutes=30)]
+    assert slots[2] == datetime(2030, 1, 8, 17, tzinfo=timezone.utc)
+
+
+def test_round_matches_round_to_slot():
+    calendar = SlotCalendar(slot_minutes=15)
+    values = [
+        datetime(2030, 1, 7, 17, 44, 59, 999999, tzinfo=timezone.utc),
+        datetime(2030, 1, 7, 23, 59),
+        datetime(2030, 1, 7, 18, 0, tzinfo=timezone(timedelta(hours=5, minutes=30))),
+    ]
+    assert calendar.round_many(values) == [round_to_slot(v, 15).astimezone(timezone.utc) for v in values]
+
+
+def test_check_many_reports_each_value():
+    calendar = SlotCalendar()
+    errors = calendar.check_many([
+        datetime(2029, 6, 1, 18, tzinfo=timezone.utc),
+        datetime(2030, 1, 7, 18, tzinfo=timezone.utc),
+        datetime(2030, 1, 7, 9, tzinfo=timezone.utc),
+    ], NOW)
+    assert errors[0] == PAST_TIME
+    assert errors[1] is None
+    assert errors[2].startswith("Reservations are only accepted")
@@ -0,0 +1,63 @@
+import multiprocessing
+import os
+import runpy
+
+import pytest
+
+from api.config import _replica_binds
+from api.utils.pool import engine_options, pool_connections
+
+GUNICORN_CONF = os.path.join(os.path.dirname(os.path.dirname(__file__)), "gunicorn.conf.py")
+
+
+@pytest.fixture
+def pool_env(monkeypatch):
+    for key in ("DB_POOL_SIZE", "DB_MAX_OVERFLOW", "WEB_CONCURRENCY", "GUNICORN_WORKER_CLASS",
+                "DB_MAX_CONNECTIONS", "DB_RESERVED_CONNECTIONS"):
+        monkeypatch.delenv(key, raising=False)
+    # Set, so the config's setdefault cannot leak into other tests.
+    monkeypatch.setenv("EVENTS_BACKEND", "memory")
+    monkeypatch.setenv("DATABASE_URL", "postgresql://u@db/cafe")
+    monkeypatch.setattr(multiprocessing, "cpu_count", lambda: 8)
+    return monkeypatch
+
+
+def test_engine_options(monkeypatch):
+    assert engine_options("sqlite:///local.db") == {}
+    monkeypatch.setenv("DB_POOL_SIZE", "8")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+    options = engine_options("postgresql://u@db/cafe")
+    assert options["pool_size"] == 8
+    assert options["max_overflow"] == 5
+    assert options["pool_pre_ping"] is False
+    assert pool_connections("postgresql://u@db/cafe") == 13
+    assert pool_connections("sqlite:///local.db") == 0
+
+
+def test_replica_binds_carry_pool_options():
+    binds = _replica_binds(" postgresql://r1/cafe, ,postgresql://r2/cafe ")
+    assert list(binds) == ["replica_0", "replica_1"]
+    assert binds["replica_1"]["url"] == "postgresql://r2/cafe"
+    assert binds["replica_1"]["pool_size"] == 5
+
+
+def test_default_workers_fit_the_connection_budget(pool_env):
+    conf = runpy.run_path(GUNICORN_CONF)
+    # 17 workers (2 * 8 CPUs + 1) x 10 connections would pass 100; 90 allows 9.
+    assert conf["workers"] == 9
+    pool_env.setenv("GUNICORN_WORKER_CLASS", "uvicorn.workers.UvicornWorker")
+    assert runpy.run_path(GUNICORN_CONF)["workers"] == 4
+
+
+def test_explicit_workers_over_budget_are_logged(pool_env):
+    pool_env.setenv("WEB_CONCURRENCY", "17")
+    conf = runpy.run_path(GUNICORN_CONF)
+    warnings = []
+
+    class Server:
+        class log:
+            warning = staticmethod(lambda msg, *args: warnings.append(msg % args))
+
+    conf["on_starting"](Server)
+    assert conf["workers"] == 17
+    assert "17 workers x 10 pooled connections" in warnings[0]
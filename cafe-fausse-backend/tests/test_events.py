@@ -0,0 +1,104 @@
+import json
+import os
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from api.booking_queue import enqueue, process_next_batch
+from api.events import events
+from api.extensions import db
+
+DATABASE_URL = os.getenv("TEST_DATABASE_URL") or os.getenv("DATABASE_URL", "")
+SLOT = "2098-01-06T19:00:00Z"
+
+
+@pytest.fixture
+def config():
+    return {"EVENTS_BACKEND": "memory", "EVENTS_KEEPALIVE_SECONDS": 0.1, "EVENTS_MAX_SUBSCRIBERS": 1}
+
+
+def _book(client):
+    response = client.post("/api/reservations", json={
+        "name": "S", "email": "s@example.com", "time": SLOT, "guests": 2,
+    })
+    assert response.status_code == 201
+
+
+def test_stream_receives_booking(app):
+    client = app.test_client()
+    stream = client.get("/api/reservations/availability/stream", buffered=False)
+    chunks = stream.response
+    assert next(chunks).startswith(b"retry:")
+
+    _book(app.test_client())
+    chunk = next(chunks)
+    while chunk.startswith(b":"):
+        chunk = next(chunks)
+    event, data = chunk.decode().strip().split("\n")
+    assert event == "event: slot"
+    payload = json.loads(data.removeprefix("data: "))
+    assert payload["slot"] == SLOT and payload["booked"] == 1
+    stream.close()
+
+
+def test_subscriber_limit_returns_503(client):
+    first = client.get("/api/reservations/availability/stream", buffered=False)
+    next(first.response)
+
+    second = client.get("/api/reservations/availability/stream")
+    assert second.status_code == 503
+    assert second.get_json()["code"] == "STREAM_LIMIT"
+    assert second.headers["Retry-After"] == "1"
+
+    first.close()
+    again = client.get("/api/reservations/availability/stream", buffered=False)
+    assert again.status_code == 200
+    again.close()
+
+
+def _queue_booking(email):
+    enqueue(uuid.uuid4().hex, {"name": "Q", "email": email, "phone": None, "guests": 2}, datetime(2098, 1, 6, 19))
+    assert process_next_batch(10, 1) == 1
+
+
+def test_booking_worker_requires_postgres_events(app):
+    result = app.test_cli_runner().invoke(args=["booking-worker", "--once"])
+    assert result.exit_code == 1
+    assert "EVENTS_BACKEND=postgres" in result.output
+
+
+def test_worker_batches_publish_slot_events(app):
+    with app.app_context():
+        q = events.subscribe()
+        try:
+            _queue_booking("q@example.com")
+            assert q.get(timeout=1) == {"slot": SLOT, "booked": 1, "available": 29}
+        finally:
+            events.unsubscribe(q)
+
+
+@pytest.mark.skipif(
+    not DATABASE_URL.startswith("postgresql"),
+    reason="NOTIFY delivery needs TEST_DATABASE_URL pointing at a migrated Postgres database",
+)
+def test_worker_bookings_reach_other_processes_through_notify(make_app):
+    # The worker and the web process share a database, not a broadcaster.
+    app = make_app(SQLALCHEMY_DATABASE_URI=DATABASE_URL, EVENTS_BACKEND="postgres", EVENTS_MAX_SUBSCRIBERS=1)
+    with app.app_context():
+        q = events.subscribe()
+        try:
+            assert events.listener.ready.wait(5)
+            _queue_booking("queue-check@example.com")
+            payload = q.get(timeout=5)
+            assert payload["slot"] == SLOT and payload["booked"] >= 1
+        finally:
+            events.unsubscribe(q)
+            db.session.execute(text(
+                "DELETE FROM reservations WHERE customer_id IN "
+                "(SELECT id FROM customers WHERE email = 'queue-check@example.com')"
+            ))
+            db.session.execute(text("DELETE FROM booking_tickets WHERE payload->>'email' = 'queue-check@example.com'"))
+            db.session.execute(text("DELETE FROM customers WHERE email = 'queue-check@example.com'"))
+            db.session.commit()
@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import pytest
+
+from api.extensions import db
+from api.ledger import ledger
+from api.models import Customer, Reservation
+
+SLOT = datetime(2098, 1, 6, 19)
+LATER = datetime(2098, 1, 6, 20)
+
+
+@pytest.fixture
+def config():
+    return {"SLOT_LEDGER_ENABLED": True, "OCCUPANCY_MAX_AGE_SECONDS": 0, "TABLE_ALLOCATION_STRATEGY": "lowest"}
+
+
+@pytest.fixture
+def app(app):
+    with app.app_context():
+        db.session.add(Customer(id=1, name="O", email="o@example.com", phone=""))
+        db.session.commit()
+        yield app
+
+
+def _lowest(booked):
+    free = ~booked & ((1 << 30) - 1)
+    return (free & -free).bit_length() or None
+
+
+def _insert(slot, table):
+    # Outside the ledger, as a bulk load or a bug would write it.
+    db.session.add(Reservation(customer_id=1, time_slot=slot, table_number=table))
+    db.session.commit()
+
+
+def test_claim_takes_free_tables_in_turn(app):
+    assert ledger.claim(SLOT, _lowest) == (1, 0)
+    assert ledger.claim(SLOT, _lowest) == (2, 0b1)
+    assert ledger.mask(SLOT) == 0b11
+
+
+def test_claim_conflict_picks_again_from_the_fresh_bitmap(app):
+    ledger.claim(SLOT, _lowest)
+    picks = iter([1, 1, 1])
+    # A stale choice of a taken table matches no row, however often it is retried.
+    assert ledger.claim(SLOT, lambda booked: next(picks)) == (None, 0b1)
+
+    stale = iter([1])
+    assert ledger.claim(SLOT, lambda booked: next(stale, None) or _lowest(booked)) == (2, 0b1)
+
+
+def test_backfill_rebuilds_from_reservations(app):
+    _insert(SLOT, 3)
+    _insert(LATER, 1)
+    assert ledger.backfill(LATER, None) == 1
+    assert (ledger.mask(SLOT), ledger.mask(LATER)) == (0, 0b1)
+    assert ledger.backfill() == 2
+    assert ledger.mask(SLOT) == 0b100
+
+
+def test_out_of_sync_row_is_rebuilt_after_a_failed_booking(app, caplog):
+    _insert(SLOT, 1)
+    client = app.test_client()
+    body = {"name": "B", "email": "b@example.com", "time": "2098-01-06T19:00:00Z", "guests": 2}
+
+    first = client.post("/api/reservations", json=body)
+    assert first.get_json()["code"] == "RACE_LOST"
+    assert "slot_capacity" in caplog.text
+    assert ledger.mask(SLOT) == 0b1
+
+    second = client.post("/api/reservations", json=body)
+    assert second.status_code == 201
+    assert second.get_json()["tableNumber"] == 2
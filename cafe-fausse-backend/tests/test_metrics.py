@@ -0,0 +1,40 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from api.extensions import db
+
+
+@pytest.fixture
+def config():
+    return {"METRICS_ENABLED": True, "METRICS_N_PLUS_ONE_THRESHOLD": 3}
+
+
+@pytest.fixture
+def app(app):
+    def repeated():
+        # A failing statement first: its timing must not leak into later ones.
+        try:
+            db.session.execute(text("SELECT * FROM missing_table"))
+        except OperationalError:
+            db.session.rollback()
+        for _ in range(3):
+            db.session.execute(text("SELECT 1")).scalar()
+        return "ok"
+
+    app.add_url_rule("/repeated", "repeated", repeated)
+    return app
+
+
+def test_server_timing_counts_queries_and_logs_n_plus_one(app, caplog):
+    response = app.test_client().get("/repeated")
+    assert response.status_code == 200
+    assert 'desc="3 queries"' in response.headers["Server-Timing"]
+    assert "Possible N+1 in repeated" in caplog.text
+
+
+def test_metrics_endpoint_exposes_request_histograms(client):
+    client.get("/repeated")
+    body = client.get("/metrics").get_data(as_text=True)
+    assert 'http_request_duration_seconds_count{endpoint="repeated",method="GET",status="200"}' in body
+    assert 'db_queries_total{endpoint="repeated"}' in body
@@ -0,0 +1,98 @@
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from api.extensions import db
+from api.models import Customer, Reservation
+from api.occupancy import occupancy
+
+# Beyond the warm horizon, so bitmap() loads these slots one at a time.
+SLOT = datetime(2098, 1, 6, 19)
+OTHER = datetime(2098, 1, 6, 20)
+
+
+@pytest.fixture
+def config():
+    return {"OCCUPANCY_MAX_AGE_SECONDS": 60, "TABLE_ALLOCATION_STRATEGY": "lowest"}
+
+
+@pytest.fixture
+def app(app):
+    with app.app_context():
+        db.session.add(Customer(id=1, name="O", email="o@example.com", phone=""))
+        db.session.commit()
+        yield app
+
+
+def _insert(slot, table):
+    # Behind the index's back, as another worker's booking would be.
+    db.session.add(Reservation(customer_id=1, time_slot=slot, table_number=table))
+    db.session.commit()
+
+
+def _age(slot, seconds):
+    bits, loaded_at = occupancy._slots[slot]
+    occupancy._slots[slot] = (bits, loaded_at - seconds)
+
+
+def test_entries_are_served_until_stale(app):
+    assert occupancy.bitmap(SLOT) == 0
+    _insert(SLOT, 3)
+    assert occupancy.bitmap(SLOT) == 0
+    _age(SLOT, 61)
+    assert occupancy.bitmap(SLOT) == 0b100
+
+
+def test_invalidate_forces_a_reload(app):
+    occupancy.bitmap(SLOT)
+    _insert(SLOT, 1)
+    occupancy.invalidate(SLOT)
+    assert occupancy.bitmap(SLOT) == 0b1
+
+
+def test_mark_booked_updates_entry_and_version(app):
+    bits, version = occupancy.snapshot(SLOT)
+    occupancy.mark_booked(SLOT, 2)
+    assert occupancy.snapshot(SLOT) == (0b10, version + 1)
+
+
+def test_refresh_many_loads_and_bumps_changed_slots(app):
+    occupancy.bitmap(SLOT)
+    occupancy.bitmap(OTHER)
+    versions = occupancy.version(SLOT), occupancy.version(OTHER)
+    _insert(OTHER, 4)
+    assert occupancy.refresh_many([SLOT, OTHER]) == {SLOT: 0, OTHER: 0b1000}
+    assert (occupancy.version(SLOT), occupancy.version(OTHER)) == (versions[0], versions[1] + 1)
+
+
+def test_booking_commit_marks_and_rollback_invalidates(client, monkeypatch):
+    body = {"name": "B", "email": "b@example.com", "time": "2098-01-06T19:00:00Z", "guests": 2}
+    assert client.post("/api/reservations", json=body).status_code == 201
+    assert occupancy._slots[SLOT][0] == 0b1
+
+    # A stale bitmap sends the next booking to table 1, which is taken.
+    monkeypatch.setattr(occupancy, "refresh", lambda slot: 0)
+    response = client.post("/api/reservations", json={**body, "email": "c@example.com"})
+    assert response.get_json()["code"] == "RACE_LOST"
+    assert SLOT not in occupancy._slots
+
+
+def test_concurrent_misses_load_once(app, monkeypatch):
+    calls = []
+
+    def slow_load(slot):
+        calls.append(slot)
+        time.sleep(0.05)
+        return 0b1
+
+    monkeypatch.setattr(occupancy, "_load_slot", slow_load)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(occupancy.bitmap(SLOT))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls == [SLOT]
+    assert results == [0b1] * 8
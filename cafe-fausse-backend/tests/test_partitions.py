@@ -0,0 +1,102 @@
+import gzip
+import os
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from api import partitions
+from api.partitions import DEFAULT_PARTITION, archive_partitions, create_partitions, monthly_partitions
+
+# Partition management commits, so these checks work on months in 1990, far
+# before any real bookings, and drop what they created afterwards.
+DATABASE_URL = os.getenv("TEST_DATABASE_URL") or os.getenv("DATABASE_URL", "")
+
+pytestmark = pytest.mark.skipif(
+    not DATABASE_URL.startswith("postgresql"),
+    reason="Partition checks need TEST_DATABASE_URL pointing at a migrated Postgres database",
+)
+
+EMAIL = "partition-check@example.com"
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def app():
+    from api.app import create_app
+    from api.extensions import db
+
+    app = create_app({"SQLALCHEMY_DATABASE_URI": DATABASE_URL, "RATELIMIT_ENABLED": False})
+    with app.app_context():
+        customer_id = db.session.execute(text(
+            "INSERT INTO customers (name, email, phone, newsletter_opt_in) "
+            "VALUES ('Partition', :email, '', false) RETURNING id"
+        ), {"email": EMAIL}).scalar_one()
+        db.session.commit()
+        app.config["TEST_CUSTOMER_ID"] = customer_id
+        yield app
+        db.session.rollback()
+        db.session.execute(text("DELETE FROM reservations WHERE customer_id = :id"), {"id": customer_id})
+        db.session.execute(text("DELETE FROM customers WHERE id = :id"), {"id": customer_id})
+        for name in ("reservations_1990_01", "reservations_1990_02"):
+            db.session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+        db.session.commit()
+
+
+def _book(db, customer_id, slot):
+    db.session.execute(text(
+        "INSERT INTO reservations (customer_id, time_slot, table_number) VALUES (:c, :s, 1)"
+    ), {"c": customer_id, "s": slot})
+    db.session.commit()
+
+
+def _count(db, table):
+    return db.session.execute(text(
+        f"SELECT count(*) FROM {table} WHERE time_slot >= '1990-01-01' AND time_slot < '1990-03-01'"
+    )).scalar()
+
+
+def test_create_moves_rows_out_of_the_default_partition(app):
+    from api.extensions import db
+
+    _book(db, app.config["TEST_CUSTOMER_ID"], _utc(1990, 2, 6, 19))
+    assert _count(db, DEFAULT_PARTITION) == 1
+
+    assert create_partitions(0, now=_utc(1990, 2, 10)) == ["reservations_1990_02"]
+    assert _count(db, DEFAULT_PARTITION) == 0
+    assert _count(db, "reservations_1990_02") == 1
+    assert create_partitions(0, now=_utc(1990, 2, 10)) == []
+
+
+def test_archive_writes_then_drops(app, tmp_path):
+    from api.extensions import db
+
+    create_partitions(1, now=_utc(1990, 1, 10))
+    _book(db, app.config["TEST_CUSTOMER_ID"], _utc(1990, 1, 8, 19))
+
+    archived = archive_partitions(1, str(tmp_path), now=_utc(1990, 3, 10))
+    assert [(name, rows) for name, _, rows in archived] == [("reservations_1990_01", 1)]
+    with gzip.open(archived[0][1], "rt") as f:
+        assert len(f.read().splitlines()) == 2  # header and the booking
+    assert "reservations_1990_01" not in monthly_partitions()
+    assert db.session.execute(text("SELECT to_regclass('reservations_1990_01')")).scalar() is None
+
+
+def test_failed_archive_leaves_the_partition_attached(app, tmp_path, monkeypatch):
+    from api.extensions import db
+
+    create_partitions(0, now=_utc(1990, 1, 10))
+    _book(db, app.config["TEST_CUSTOMER_ID"], _utc(1990, 1, 8, 19))
+
+    def broken_open(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(partitions.gzip, "open", broken_open)
+    with pytest.raises(OSError):
+        archive_partitions(1, str(tmp_path), now=_utc(1990, 3, 10))
+    assert "reservations_1990_01" in monthly_partitions()
+    assert _count(db, "reservations_1990_01") == 1
+    assert os.listdir(tmp_path) == []
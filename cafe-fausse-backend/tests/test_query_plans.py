@@ -0,0 +1,132 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from api import queries
+
+# EXPLAIN checks of the statements the views run (api/queries.py); they need a
+# migrated Postgres database. Rows are inserted inside a transaction that is
+# rolled back, so any dev database will do.
+DATABASE_URL = os.getenv("TEST_DATABASE_URL") or os.getenv("DATABASE_URL", "")
+
+pytestmark = pytest.mark.skipif(
+    not DATABASE_URL.startswith("postgresql"),
+    reason="EXPLAIN checks need TEST_DATABASE_URL pointing at a migrated Postgres database",
+)
+
+# Far from any real bookings so the synthetic rows never hit the unique constraint.
+BASE_DAY = datetime(2099, 1, 1)
+DAYS = 90
+TABLES = 30
+CUSTOMERS = 5000
+
+
+@pytest.fixture(scope="module")
+def conn():
+    try:
+        engine = create_engine(DATABASE_URL)
+        connection = engine.connect()
+    except OperationalError as e:
+        pytest.skip(f"Postgres not reachable: {e}")
+    trans = connection.begin()
+    connection.execute(
+        text(
+            "INSERT INTO customers (name, email, phone, newsletter_opt_in) "
+            "SELECT 'Plan ' || i, 'plan-check-' || i || '@example.invalid', '', false "
+            "FROM generate_series(1, :n) AS i"
+        ),
+        {"n": CUSTOMERS},
+    )
+    # Every 30-minute slot from 11:00 to 23:30, every table, for DAYS days.
+    connection.execute(
+        text(
+            "INSERT INTO reservations (customer_id, time_slot, table_number) "
+            "SELECT c.id, s.slot, t.n "
+            "FROM generate_series(:start, :end, interval '30 minutes') AS s(slot) "
+            "CROSS JOIN generate_series(1, :tables) AS t(n) "
+            "JOIN customers c ON c.email = 'plan-check-' "
+            "  || (1 + (extract(epoch FROM s.slot)::bigint / 1800 * :tables + t.n) % :customers) "
+            "  || '@example.invalid' "
+            "WHERE extract(hour FROM s.slot) >= 11"
+        ),
+        {
+            "start": BASE_DAY,
+            "end": BASE_DAY + timedelta(days=DAYS) - timedelta(minutes=30),
+            "tables": TABLES,
+            "customers": CUSTOMERS,
+        },
+    )
+    connection.execute(text("ANALYZE customers"))
+    connection.execute(text("ANALYZE reservations"))
+    yield connection
+    trans.rollback()
+    connection.close()
+    engine.dispose()
+
+
+def _seq_scans(conn, stmt) -> list[str]:
+    """Tables the planner would read with a sequential scan."""
+    compiled = stmt.compile(dialect=conn.dialect)
+    plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    found = []
+    stack = [plan[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        if node["Node Type"] == "Seq Scan":
+            # Partitions (reservations_2025_09, reservations_default) count as reservations.
+            name = node["Relation Name"]
+            found.append("reservations" if name.startswith("reservations_") else name)
+        stack.extend(node.get("Plans", []))
+    return found
+
+
+def _slot(days: int = 30, hour: int = 19) -> datetime:
+    return BASE_DAY + timedelta(days=days, hours=hour)
+
+
+def test_availability_slot_lookup_uses_index(conn):
+    assert "reservations" not in _seq_scans(conn, queries.slot_tables(_slot()))
+
+
+def test_availability_range_uses_index(conn):
+    start = _slot(hour=11)
+    stmt = queries.range_counts(start, start + timedelta(hours=12))
+    assert "reservations" not in _seq_scans(conn, stmt)
+
+
+def test_create_reservation_lookups_use_indexes(conn):
+    customer = queries.customer_by_email("plan-check-42@example.invalid")
+    assert "customers" not in _seq_scans(conn, customer)
+
+    bitmap = queries.slots_tables([_slot(hour=19), _slot(hour=20)])
+    assert "reservations" not in _seq_scans(conn, bitmap)
+
+
+def test_list_reservations_page_uses_index(conn):
+    day = BASE_DAY + timedelta(days=30)
+    stmt = queries.admin_page(day, day + timedelta(days=1))
+    assert "reservations" not in _seq_scans(conn, stmt)
+
+
+def test_list_reservations_cursor_and_email_use_indexes(conn):
+    day = BASE_DAY + timedelta(days=30)
+    cursor = queries.admin_page(day, day + timedelta(days=1), after=(_slot(hour=18), 12))
+    assert "reservations" not in _seq_scans(conn, cursor)
+
+    by_email = queries.admin_page(day, day + timedelta(days=1), "plan-check-42@example.invalid")
+    assert _seq_scans(conn, by_email) == []
+    count = queries.admin_day_count(day, day + timedelta(days=1), "plan-check-42@example.invalid")
+    assert _seq_scans(conn, count) == []
+
+
+def test_reservations_by_customer_use_indexes(conn):
+    customer_id = conn.execute(queries.customer_by_email("plan-check-42@example.invalid")).one().id
+    stmt = queries.customer_page(customer_id, since=_slot(hour=0), after=(_slot(hour=18), 0))
+    assert "reservations" not in _seq_scans(conn, stmt)
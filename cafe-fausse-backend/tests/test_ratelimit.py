@@ -0,0 +1,101 @@
+import pytest
+
+from api.ratelimit import (
+    MemoryBackend,
+    RedisBackend,
+    SlidingWindow,
+    SQLiteBackend,
+    TokenBucket,
+    parse_rate,
+)
+
+
+class FakeRedis:
+    """Just enough of the redis-py pipeline/WATCH API for RedisBackend."""
+
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.pending = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def watch(self, key):
+        pass
+
+    def get(self, key):
+        return self.client.data.get(key)
+
+    def multi(self):
+        pass
+
+    def set(self, key, value, ex=None):
+        self.pending.append((key, value.encode()))
+
+    def execute(self):
+        for key, value in self.pending:
+            self.client.data[key] = value
+
+
+def _drive(backend, algorithm, n, now):
+    return [
+        backend.update("k", lambda state: algorithm(state, now), algorithm.ttl)[0]
+        for _ in range(n)
+    ]
+
+
+def test_parse_rate():
+    assert parse_rate("12/minute") == (12, 60)
+    assert parse_rate("5/30") == (5, 30)
+
+
+@pytest.mark.parametrize("algorithm_cls", [SlidingWindow, TokenBucket])
+def test_algorithms_block_after_limit(algorithm_cls):
+    results = _drive(MemoryBackend(), algorithm_cls(3, 60), 5, now=1_000_020.0)
+    assert results == [True, True, True, False, False]
+
+
+def test_sliding_window_weights_previous_window():
+    algorithm = SlidingWindow(4, 60)
+    backend = MemoryBackend()
+    _drive(backend, algorithm, 4, now=600.0)
+    # Halfway into the next window half of the previous 4 hits still count.
+    assert _drive(backend, algorithm, 3, now=690.0) == [True, True, False]
+
+
+def test_token_bucket_refills_over_time():
+    algorithm = TokenBucket(2, 60)
+    backend = MemoryBackend()
+    _drive(backend, algorithm, 3, now=0.0)
+    assert _drive(backend, algorithm, 2, now=30.0) == [True, False]
+
+
+def test_memory_backend_evicts_expired_keys():
+    backend = MemoryBackend(sweep_interval=0)
+    backend.update("old", lambda state: ("1", None), ttl=-1)
+    backend.update("new", lambda state: ("1", None), ttl=60)
+    assert len(backend) == 1
+
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "rl.sqlite3")
+    algorithm = SlidingWindow(3, 60)
+    first, second = SQLiteBackend(path), SQLiteBackend(path)
+    assert _drive(first, algorithm, 2, now=120.0) == [True, True]
+    assert _drive(second, algorithm, 2, now=120.0) == [True, False]
+
+
+def test_redis_backend_with_fake_client():
+    backend = RedisBackend(FakeRedis())
+    assert _drive(backend, TokenBucket(2, 60), 3, now=0.0) == [True, True, False]
@@ -0,0 +1,44 @@
+import pytest
+
+from api.replicas import PIN_COOKIE, replicas
+
+# Two SQLite files stand in for a primary and its replica (conftest.replica_app);
+# only the replica holds a booking at SLOT, so reads show which one answered.
+SLOT = "2098-01-06T18:00:00Z"
+
+
+@pytest.fixture(autouse=True)
+def admin_token(monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "t")
+
+
+@pytest.fixture
+def app(replica_app):
+    return replica_app
+
+
+def _booked(client) -> int:
+    return client.get(f"/api/reservations/availability?time={SLOT}").get_json()["booked"]
+
+
+def test_read_only_views_use_the_replica(client):
+    assert _booked(client) == 1
+    listed = client.get("/api/reservations?date=2098-01-06", headers={"Authorization": "Bearer t"}).get_json()
+    assert [r["tableNumber"] for r in listed["reservations"]] == [1]
+
+
+def test_booking_pins_the_client_to_the_primary(app):
+    client = app.test_client()
+    response = client.post("/api/reservations", json={
+        "name": "P", "email": "p@example.com", "time": "2098-01-06T19:00:00Z", "guests": 2,
+    })
+    assert response.status_code == 201
+    assert client.get_cookie(PIN_COOKIE) is not None
+    assert _booked(client) == 0
+    assert _booked(app.test_client()) == 1
+
+
+def test_lagging_replica_falls_back_to_the_primary(app, monkeypatch):
+    monkeypatch.setattr(replicas, "lag", lambda key: app.config["REPLICA_MAX_LAG_SECONDS"] + 1)
+    replicas._lag.clear()
+    assert _booked(app.test_client()) == 0
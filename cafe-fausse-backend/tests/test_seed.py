@@ -0,0 +1,31 @@
+import random
+from datetime import date
+
+from flask import Flask
+
+from api.seed import reservation_rows
+from api.utils.calendar import BUSINESS_HOURS, SlotCalendar
+
+
+def _app():
+    app = Flask(__name__)
+    app.config.update(SLOT_MINUTES=30, TOTAL_TABLES=30)
+    return app
+
+
+def test_reservation_rows_are_unique_and_deterministic():
+    with _app().app_context():
+        first = list(reservation_rows(list(range(1, 51)), date(2030, 1, 7), 14, 0.6, random.Random(7)))
+        second = list(reservation_rows(list(range(1, 51)), date(2030, 1, 7), 14, 0.6, random.Random(7)))
+
+    assert first == second
+    keys = [(r["time_slot"], r["table_number"]) for r in first]
+    assert len(keys) == len(set(keys))
+    assert all(1 <= r["table_number"] <= 30 for r in first)
+    assert all(BUSINESS_HOURS[r["time_slot"].weekday()][0] <= r["time_slot"].hour for r in first)
+
+
+def test_full_occupancy_books_every_table():
+    with _app().app_context():
+        rows = list(reservation_rows([1], date(2030, 1, 7), 1, 1.0, random.Random(1)))
+    assert len(rows) == len(SlotCalendar().day_slots(date(2030, 1, 7))) * 30
@@ -0,0 +1,50 @@
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+
+from api.schemas import ReservationRow
+from api.serialization import OrjsonProvider, StdlibJSONProvider, orjson
+from api.utils.time import api_iso_z, utc_iso_z
+
+
+def _row():
+    reservation = SimpleNamespace(id=7, time_slot=datetime(2030, 1, 5, 18, 30, 12, 999), table_number=4)
+    customer = SimpleNamespace(id=3, name="Ada", email="ada@example.com", phone="")
+    return ReservationRow.from_models(reservation, customer)
+
+
+def test_utc_iso_z_matches_api_iso_z():
+    values = [
+        datetime(2030, 1, 5, 18, 30, 12, 999),
+        datetime(2030, 1, 5, 18, 30, tzinfo=timezone.utc),
+        datetime(2030, 1, 5, 20, 30, tzinfo=timezone(timedelta(hours=2))),
+    ]
+    for value in values:
+        assert utc_iso_z(value) == api_iso_z(value)
+
+
+def test_stdlib_provider_encodes_rows_and_datetimes():
+    provider = StdlibJSONProvider(Flask(__name__))
+    body = json.loads(provider.dumps({"row": _row(), "at": datetime(2030, 1, 5, 18)}))
+    assert body["at"] == "2030-01-05T18:00:00Z"
+    assert body["row"] == {
+        "id": 7,
+        "time": "2030-01-05T18:30:12Z",
+        "tableNumber": 4,
+        "customer": {"id": 3, "name": "Ada", "email": "ada@example.com", "phone": ""},
+    }
+
+
+@pytest.mark.skipif(orjson is None, reason="orjson not installed")
+def test_orjson_provider_matches_stdlib():
+    app = Flask(__name__)
+    payload = {"rows": [_row(), _row()], "at": datetime(2030, 1, 5, 18)}
+    fast = OrjsonProvider(app)
+    assert json.loads(fast.dumps(payload)) == json.loads(StdlibJSONProvider(app).dumps(payload))
+    with app.app_context():
+        response = fast.response(payload)
+    assert response.mimetype == "application/json"
+    assert json.loads(response.get_data()) == json.loads(fast.dumps(payload))
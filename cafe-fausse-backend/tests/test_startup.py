@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+from benchmarks.startup import DEFAULT_BUDGET_MS, measure, parse_importtime
+
+# Needed only by CLI commands, migrations or the first request.
+DEFERRED = ("flask_migrate", "alembic", "email_validator", "api.seed", "api.partitions")
+
+
+def test_parse_importtime():
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |     json.decoder\n"
+        "import time:       300 |        420 |   json\n"
+        "import time:      1000 |       1420 | api.app\n"
+    )
+    assert parse_importtime(output) == [
+        ("json.decoder", 120, 120, 2),
+        ("json", 300, 420, 1),
+        ("api.app", 1000, 1420, 0),
+    ]
+
+
+@pytest.fixture(scope="module")
+def startup():
+    return measure({"DATABASE_URL": "sqlite://"})
+
+
+def test_cold_start_defers_cli_and_migration_imports(startup):
+    loaded = [name for name in startup["modules"] if name.split(".")[0] in DEFERRED or name in DEFERRED]
+    assert loaded == []
+
+
+def test_cold_start_within_budget(startup):
+    # STARTUP_BUDGET_MS overrides the default on slow CI machines.
+    budget = float(os.getenv("STARTUP_BUDGET_MS", DEFAULT_BUDGET_MS))
+    assert startup["total_ms"] <= budget, startup["slowest"]
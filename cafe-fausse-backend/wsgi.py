@@ -0,0 +1,6 @@
+from api.app import create_app
+from api.schemas import build_validators
+
+app = create_app()
+# Built before gunicorn forks, so workers share them instead of each building its own.
+build_validators()